@@ -55,6 +55,40 @@ class Config:
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     LOGS_DIR = os.path.join(BASE_DIR, "logs")
     DATA_DIR = os.path.join(BASE_DIR, "data_files")
+    CACHE_DIR = os.path.join(DATA_DIR, "cache")  # Parsed vehicle databases (rebuilt when sources change)
+    
+    # Car processor keeps only this many recent results/tickets in memory
+    RECENT_RESULTS_SIZE = 1000
+    
+    # Root seed for reproducible runs (None = fresh entropy, logged at startup)
+    RANDOM_SEED = None
+    
+    # Generate each sensor batch as a columnar VehicleBatch (vectorized path)
+    BULK_GENERATION = False
+    
+    # Registered-fleet model: draw sightings from N fixed vehicles (None = every vehicle new)
+    FLEET_SIZE = None
+    FLEET_ZIPF_EXPONENT = 1.1
+    
+    # Redraw plates until unused (PlateAllocator tracks issued plates either way)
+    UNIQUE_PLATES = False
+    
+    # Owner database memory tier: keep at most N owners in memory, spill older ones to SQLite
+    OWNER_CACHE_SIZE = None  # None = unbounded dict (no spilling)
+    OWNER_SPILL_FILE = None  # None = private temporary file
+    
+    # Owners persist across runs: loaded at start, saved incrementally while running and
+    # at stop (None = disabled; always off for seeded runs and trace replays)
+    OWNER_SNAPSHOT_FILE = os.path.join(DATA_DIR, "owners.snapshot")
+    OWNER_SNAPSHOT_EVERY = 10000  # Append a delta after this many new owners
+    
+    # Workload trace recording (set a path to capture every generated vehicle)
+    TRACE_RECORD_FILE = None
+    
+    # Graceful shutdown: seconds to keep draining queues before saving leftovers
+    SHUTDOWN_DRAIN_TIMEOUT = 5
+    PENDING_QUEUE_FILE = os.path.join(DATA_DIR, "pending_queue.trace.gz")
+    PENDING_BATCHES_FILE = os.path.join(DATA_DIR, "pending_batches.trace.gz")
     
     @classmethod
     def setup_directories(cls):
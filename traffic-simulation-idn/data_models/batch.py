@@ -0,0 +1,432 @@
+"""
+Columnar vehicle batches
+A VehicleBatch stores a whole batch as NumPy columns (one array per field)
+instead of one Vehicle object per car. Plate strings, owners and Vehicle
+objects are only built when a row is actually read, so generating a million
+vehicles does not create a million Python objects up front.
+
+Pipeline stages accept a VehicleBatch wherever they accept List[Vehicle]:
+iterating a batch yields VehicleView rows that read and write the columns
+in place, and the analyzer, statistics and storage work on whole columns.
+"""
+
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+
+from config import Config
+from data_models.models import Vehicle, Ticket
+
+# Category codes stored in the 'category' column
+CATEGORY_PRIBADI = 0
+CATEGORY_BARANG = 1
+CATEGORY_PEMERINTAH = 2
+CATEGORY_KEDUTAAN = 3
+
+# (vehicle_category, plate_type, plate_color) per category code
+CATEGORY_INFO = [
+    ('Pribadi', 'PRIBADI', 'BLACK'),
+    ('Barang', 'NIAGA/TRUK', 'YELLOW'),
+    ('PEMERINTAH', 'PEMERINTAH', 'RED'),
+    ('KEDUTAAN', 'DIPLOMATIK', 'WHITE'),
+]
+
+# Plate columns; 'kind' and 'route' are only meaningful for some categories:
+# kind = region index (Pribadi/Barang), agency index (Pemerintah), country index (Kedutaan)
+PLATE_COLUMNS = ('kind', 'number', 'num_digits', 'letters', 'letter_count',
+                 'truck_type', 'truck_class', 'route', 'consular')
+
+# Columns filled by later pipeline stages (added with defaults when missing):
+# owner = index into VehicleBatch.owners (-1 = not resolved yet)
+STATUS_COLUMNS = {
+    'owner': (np.int32, -1),
+    'stnk_active': (np.bool_, True),
+    'sim_active': (np.bool_, True),
+    'ticket_issued': (np.bool_, False),
+    'fine_amount': (np.float64, 0.0),
+}
+
+
+class BatchVocabulary:
+    """String tables that the integer codes in a VehicleBatch refer to"""
+
+    def __init__(self, makes: Sequence[str], models: Sequence[str], regions: Sequence[str],
+                 letters: str, truck_codes: Sequence[str], truck_class_codes: Sequence[str],
+                 truck_class_routed: Sequence[bool], route_codes: Sequence[str],
+                 agency_codes: Sequence[int], country_codes: Sequence[str]):
+        self.makes = list(makes)
+        self.models = list(models)
+        self.regions = list(regions)
+        self.letters = letters
+        self.truck_codes = list(truck_codes)
+        self.truck_class_codes = list(truck_class_codes)
+        self.truck_class_routed = list(truck_class_routed)
+        self.route_codes = list(route_codes)
+        self.agency_codes = list(agency_codes)
+        self.country_codes = list(country_codes)
+
+
+class VehicleBatch:
+    """
+    Struct-of-arrays batch of vehicles.
+    Columns are NumPy arrays of equal length; rows are materialized on demand.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], vocab: BatchVocabulary,
+                 timestamp: datetime = None, owner_db=None, owner_rng=None):
+        """
+        Args:
+            columns: 'category', 'model', 'speed' plus PLATE_COLUMNS
+            vocab: String tables for the coded columns
+            timestamp: Detection time shared by the whole batch
+            owner_db: OwnerDatabase used to resolve owners when rows are built
+            owner_rng: random.Random-compatible stream for owners created on resolve
+        """
+        self.columns = columns
+        self.vocab = vocab
+        self.timestamp = timestamp or datetime.now()
+        self.owner_db = owner_db
+        self.owner_rng = owner_rng
+        self.owners = []  # VehicleOwner records referenced by the 'owner' column
+        self._owner_lock = threading.Lock()  # Rows may be resolved lazily from worker threads
+        self._plates = None
+        
+        n = len(columns['speed'])
+        if 'timestamp' not in columns:
+            columns['timestamp'] = np.full(n, np.datetime64(self.timestamp, 'us'))
+        for name, (dtype, default) in STATUS_COLUMNS.items():
+            if name not in columns:
+                columns[name] = np.full(n, default, dtype=dtype)
+
+    def __len__(self) -> int:
+        return len(self.columns['speed'])
+
+    @property
+    def speeds(self) -> np.ndarray:
+        return self.columns['speed']
+
+    @property
+    def categories(self) -> np.ndarray:
+        return self.columns['category']
+
+    @property
+    def violations(self) -> np.ndarray:
+        """Boolean mask of rows with a ticket issued"""
+        return self.columns['ticket_issued']
+
+    @property
+    def fines(self) -> np.ndarray:
+        return self.columns['fine_amount']
+
+    def resolve_owners(self) -> None:
+        """Look up (or create) the owner of every unresolved row through owner_db"""
+        if self.owner_db is None:
+            return
+        with self._owner_lock:
+            rows = np.flatnonzero(self.columns['owner'] < 0)
+            if len(rows) == 0:
+                return
+            categories = [CATEGORY_INFO[code][0] for code in self.columns['category'][rows].tolist()]
+            owners = self.owner_db.get_or_create_owners([self.plate(int(i)) for i in rows], 'roda_empat',
+                                                        categories, rng=self.owner_rng)
+            self.columns['stnk_active'][rows] = [bool(owner.stnk_status) for owner in owners]
+            self.columns['sim_active'][rows] = [bool(owner.sim_status) for owner in owners]
+            self.owners.extend(owners)
+            self.columns['owner'][rows] = np.arange(len(self.owners) - len(rows), len(self.owners))
+
+    def _resolve_owner(self, i: int):
+        """Resolve the owner of row i and fill its status columns"""
+        with self._owner_lock:
+            index = self.columns['owner'][i]
+            if index >= 0:
+                return self.owners[index]  # Resolved by another thread meanwhile
+            vehicle_category = CATEGORY_INFO[self.columns['category'][i]][0]
+            owner = self.owner_db.get_or_create_owner(self.plate(i), 'roda_empat',
+                                                      vehicle_category=vehicle_category,
+                                                      rng=self.owner_rng)
+            self.columns['stnk_active'][i] = bool(owner.stnk_status)
+            self.columns['sim_active'][i] = bool(owner.sim_status)
+            self.owners.append(owner)
+            self.columns['owner'][i] = len(self.owners) - 1
+            return owner
+
+    def owner(self, i: int):
+        """Owner of row i (resolved on first use), or None without an owner_db"""
+        index = self.columns['owner'][i]
+        if index >= 0:
+            return self.owners[index]
+        if self.owner_db is None:
+            return None
+        return self._resolve_owner(i)
+
+    def apply_verdicts(self, speeding_tolerance: float = 0.0) -> np.ndarray:
+        """
+        Vectorized verdict for the whole batch: flags rows below MIN_SPEED_LIMIT
+        or above SPEED_LIMIT + speeding_tolerance and fills their fines using
+        the same rules as DataGenerator.calculate_fine.
+
+        Returns:
+            Boolean violation mask
+        """
+        speeds = self.speeds
+        violation = ((speeds > Config.SPEED_LIMIT + speeding_tolerance) |
+                     (speeds < Config.MIN_SPEED_LIMIT))
+        fines = base_fines(speeds) * self.penalty_multipliers()
+        self.columns['ticket_issued'][:] = violation
+        self.columns['fine_amount'][:] = np.where(violation, fines, 0.0)
+        return violation
+
+    def penalty_multipliers(self) -> np.ndarray:
+        """+20% each for non-active STNK and expired SIM (as in calculate_fine)"""
+        return 1.0 + 0.2 * ~self.columns['stnk_active'] + 0.2 * ~self.columns['sim_active']
+
+    def tickets(self, rng=None) -> List[Ticket]:
+        """Build Ticket objects for the rows flagged by apply_verdicts
+
+        Args:
+            rng: random.Random-compatible stream for ticket IDs (default: uuid4)
+        """
+        tickets = []
+        multipliers = self.penalty_multipliers()
+        for i in np.flatnonzero(self.violations):
+            view = self.view(int(i))
+            speed = view.speed
+            multiplier = float(multipliers[i])
+            ticket_id = str(uuid.UUID(int=rng.getrandbits(128), version=4)) if rng else str(uuid.uuid4())
+            tickets.append(Ticket(
+                ticket_id=ticket_id,
+                license_plate=view.license_plate,
+                vehicle_type=view.vehicle_type,
+                vehicle_make=view.vehicle_make,
+                vehicle_model=view.vehicle_model,
+                vehicle_category=view.vehicle_category,
+                plate_type=view.plate_type,
+                plate_color=view.plate_color,
+                speed=speed,
+                fine_amount=view.fine_amount,
+                violation_reason=fine_reason(speed),
+                timestamp=view.timestamp,
+                owner_id=view.owner_id,
+                owner_name=view.owner_name,
+                owner_region=view.owner_region,
+                stnk_status=view.stnk_status,
+                sim_status=view.sim_status,
+                base_fine=view.fine_amount / multiplier,
+                penalty_multiplier=multiplier,
+            ))
+        return tickets
+
+    def plate(self, i: int) -> str:
+        """Format the license plate of row i"""
+        if self._plates is not None:
+            return self._plates[i]
+        return self._format_plate(i)
+
+    @property
+    def plates(self) -> List[str]:
+        """Every license plate, formatted once and cached"""
+        if self._plates is None:
+            self._plates = [self._format_plate(i) for i in range(len(self))]
+        return self._plates
+
+    def _format_plate(self, i: int) -> str:
+        c = self.columns
+        vocab = self.vocab
+        category = c['category'][i]
+        number = f"{c['number'][i]:0{c['num_digits'][i]}d}"
+
+        if category == CATEGORY_PEMERINTAH:
+            return f"RI {vocab.agency_codes[c['kind'][i]]} {number}"
+        if category == CATEGORY_KEDUTAAN:
+            prefix = "CC" if c['consular'][i] else "CD"
+            return f"{prefix} {vocab.country_codes[c['kind'][i]]} {number}"
+
+        letters = self._letters(c['letters'][i], c['letter_count'][i])
+        plate = f"{vocab.regions[c['kind'][i]]} {number} "
+        if category != CATEGORY_BARANG:
+            return plate + letters
+
+        truck_class = c['truck_class'][i]
+        plate += f"{vocab.truck_codes[c['truck_type'][i]]}{letters} ({vocab.truck_class_codes[truck_class]})"
+        if vocab.truck_class_routed[truck_class]:
+            plate += f" - RUTE: {vocab.route_codes[c['route'][i]]}"
+        return plate
+
+    def _letters(self, code: int, count: int) -> str:
+        """Decode base-N letter code (N = len(vocab.letters)) into count letters"""
+        alphabet = self.vocab.letters
+        base = len(alphabet)
+        chars = []
+        for _ in range(count):
+            code, digit = divmod(int(code), base)
+            chars.append(alphabet[digit])
+        return ''.join(chars)
+
+    def view(self, i: int) -> 'VehicleView':
+        """Lightweight row view backed by the columns"""
+        return VehicleView(self, i)
+
+    def row(self, i: int) -> Vehicle:
+        """Materialize row i as a standalone Vehicle (owner resolved through owner_db)"""
+        view = self.view(i)
+        return Vehicle(**{name: getattr(view, name) for name in VehicleView.FIELDS})
+
+    def __getitem__(self, i: int) -> 'VehicleView':
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("VehicleBatch index out of range")
+        return self.view(i)
+
+    def __iter__(self) -> Iterator['VehicleView']:
+        for i in range(len(self)):
+            yield VehicleView(self, i)
+
+    def to_vehicles(self) -> List[Vehicle]:
+        """Materialize every row as a Vehicle"""
+        return [self.row(i) for i in range(len(self))]
+
+
+class VehicleView:
+    """
+    One row of a VehicleBatch with the same attributes as Vehicle.
+    Reads come from the batch columns; ticket_issued and fine_amount
+    write straight back to them, so verdict stages can use views as-is.
+    """
+
+    __slots__ = ('batch', 'index')
+
+    FIELDS = ('vehicle_id', 'license_plate', 'vehicle_type', 'speed', 'timestamp', 'location',
+              'ticket_issued', 'fine_amount', 'owner_id', 'owner_name', 'owner_region',
+              'stnk_status', 'sim_status', 'vehicle_make', 'vehicle_model',
+              'vehicle_category', 'plate_type', 'plate_color')
+
+    vehicle_type = 'roda_empat'
+    location = Vehicle.location
+
+    def __init__(self, batch: VehicleBatch, index: int):
+        self.batch = batch
+        self.index = index
+
+    def _column(self, name: str):
+        return self.batch.columns[name][self.index]
+
+    @property
+    def vehicle_id(self) -> str:
+        return f"{self.vehicle_make[:3].upper()}{self.index + 1:04d}"
+
+    @property
+    def license_plate(self) -> str:
+        return self.batch.plate(self.index)
+
+    @property
+    def speed(self) -> float:
+        return float(self._column('speed'))
+
+    @property
+    def timestamp(self) -> datetime:
+        return self._column('timestamp').astype(datetime)
+
+    @property
+    def ticket_issued(self) -> bool:
+        return bool(self._column('ticket_issued'))
+
+    @ticket_issued.setter
+    def ticket_issued(self, value: bool):
+        self.batch.columns['ticket_issued'][self.index] = value
+
+    @property
+    def fine_amount(self) -> float:
+        return float(self._column('fine_amount'))
+
+    @fine_amount.setter
+    def fine_amount(self, value: float):
+        self.batch.columns['fine_amount'][self.index] = value
+
+    @property
+    def owner_id(self) -> str:
+        owner = self.batch.owner(self.index)
+        return owner.owner_id if owner else ""
+
+    @property
+    def owner_name(self) -> str:
+        owner = self.batch.owner(self.index)
+        return owner.name if owner else ""
+
+    @property
+    def owner_region(self) -> str:
+        owner = self.batch.owner(self.index)
+        return owner.region if owner else ""
+
+    @property
+    def stnk_status(self) -> str:
+        if self.batch.owner(self.index) is None:
+            return ""
+        return 'Active' if self._column('stnk_active') else 'Non-Active'
+
+    @property
+    def sim_status(self) -> str:
+        if self.batch.owner(self.index) is None:
+            return ""
+        return 'Active' if self._column('sim_active') else 'Expired'
+
+    @property
+    def vehicle_make(self) -> str:
+        return self.batch.vocab.makes[self._column('model')]
+
+    @property
+    def vehicle_model(self) -> str:
+        return self.batch.vocab.models[self._column('model')]
+
+    @property
+    def vehicle_category(self) -> str:
+        return CATEGORY_INFO[self._column('category')][0]
+
+    @property
+    def plate_type(self) -> str:
+        return CATEGORY_INFO[self._column('category')][1]
+
+    @property
+    def plate_color(self) -> str:
+        return CATEGORY_INFO[self._column('category')][2]
+
+    def to_vehicle(self) -> Vehicle:
+        """Copy this row into a standalone Vehicle"""
+        return self.batch.row(self.index)
+
+
+def base_fines(speeds: np.ndarray) -> np.ndarray:
+    """Vectorized base fine per speed (DataGenerator.calculate_fine rules, before penalties)"""
+    fines = Config.FINES
+    base = np.zeros(len(speeds))
+
+    slow = speeds < Config.MIN_SPEED_LIMIT
+    base[slow] = np.where(speeds[slow] < 30, fines["SPEED_LOW_SEVERE"]["fine"],
+                          fines["SPEED_LOW_MILD"]["fine"])
+
+    # First matching SPEED_HIGH tier wins; speeds between tiers get the top tier
+    fast = speeds > Config.SPEED_LIMIT
+    unmatched = fast.copy()
+    for level, details in fines.items():
+        if "SPEED_HIGH" in level:
+            match = unmatched & (speeds >= details["min"]) & (speeds <= details["max"])
+            base[match] = details["fine"]
+            unmatched &= ~match
+    base[unmatched] = fines["SPEED_HIGH_LEVEL_3"]["fine"]
+
+    return np.minimum(base, Config.MAX_FINE_USD)
+
+
+def fine_reason(speed: float) -> str:
+    """Violation description for one speed (same tiers as base_fines)"""
+    fines = Config.FINES
+    if speed < Config.MIN_SPEED_LIMIT:
+        level = "SPEED_LOW_SEVERE" if speed < 30 else "SPEED_LOW_MILD"
+        return fines[level]["description"]
+    for level, details in fines.items():
+        if "SPEED_HIGH" in level and details["min"] <= speed <= details["max"]:
+            return details["description"]
+    return fines["SPEED_HIGH_LEVEL_3"]["description"]
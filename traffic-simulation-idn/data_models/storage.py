@@ -2,11 +2,142 @@ import json
 import csv
 import os
 from datetime import datetime
-from typing import List
+from typing import List, Union
 from data_models.models import Vehicle, Ticket, TrafficStats
+from data_models.batch import VehicleBatch, CATEGORY_INFO
 from config import Config
 from utils.logger import logger
 
+# Header of statistics.csv
+STATS_COLUMNS = ['timestamp', 'total_vehicles', 'speeding_count',
+                 'total_fines', 'avg_speed', 'max_speed']
+
+
+def vehicle_to_record(v: Vehicle) -> dict:
+    """Build one traffic_data.json record"""
+    return {
+        'vehicle_id': v.vehicle_id,
+        'license_plate': v.license_plate,
+        'vehicle_type': v.vehicle_type,
+        'vehicle_make': v.vehicle_make,
+        'vehicle_model': v.vehicle_model,
+        'vehicle_category': v.vehicle_category,
+        'speed': v.speed,
+        'timestamp': v.timestamp.isoformat(),
+        'location': v.location,
+        'ticket_issued': v.ticket_issued,
+        'fine_amount': v.fine_amount,
+        'owner': {
+            'id': v.owner_id,
+            'name': v.owner_name,
+            'region': v.owner_region
+        },
+        'registration': {
+            'stnk_status': v.stnk_status,
+            'sim_status': v.sim_status
+        }
+    }
+
+
+def batch_to_records(batch: VehicleBatch) -> List[dict]:
+    """Build traffic_data.json records straight from VehicleBatch columns"""
+    c = batch.columns
+    vocab = batch.vocab
+    plates = batch.plates
+    timestamps = [t.isoformat() for t in c['timestamp'].astype(datetime)]
+    records = []
+    for i, (model, category, speed, issued, fine, owner_index, stnk, sim) in enumerate(zip(
+            c['model'].tolist(), c['category'].tolist(), c['speed'].tolist(),
+            c['ticket_issued'].tolist(), c['fine_amount'].tolist(), c['owner'].tolist(),
+            c['stnk_active'].tolist(), c['sim_active'].tolist())):
+        owner = batch.owners[owner_index] if owner_index >= 0 else None
+        make = vocab.makes[model]
+        records.append({
+            'vehicle_id': f"{make[:3].upper()}{i + 1:04d}",
+            'license_plate': plates[i],
+            'vehicle_type': 'roda_empat',
+            'vehicle_make': make,
+            'vehicle_model': vocab.models[model],
+            'vehicle_category': CATEGORY_INFO[category][0],
+            'speed': speed,
+            'timestamp': timestamps[i],
+            'location': Vehicle.location,
+            'ticket_issued': issued,
+            'fine_amount': fine,
+            'owner': {
+                'id': owner.owner_id if owner else "",
+                'name': owner.name if owner else "",
+                'region': owner.region if owner else ""
+            },
+            'registration': {
+                'stnk_status': ('Active' if stnk else 'Non-Active') if owner else "",
+                'sim_status': ('Active' if sim else 'Expired') if owner else ""
+            }
+        })
+    return records
+
+
+def ticket_to_record(t: Ticket) -> dict:
+    """Build one tickets.json record"""
+    return {
+        'ticket_id': t.ticket_id,
+        'license_plate': t.license_plate,
+        'vehicle_type': t.vehicle_type,
+        'vehicle_make': t.vehicle_make,
+        'vehicle_model': t.vehicle_model,
+        'vehicle_category': t.vehicle_category,
+        'speed': t.speed,
+        'speed_limit': t.speed_limit,
+        'timestamp': t.timestamp.isoformat(),
+        'location': t.location,
+        'status': t.status,
+        'owner': {
+            'id': t.owner_id,
+            'name': t.owner_name,
+            'region': t.owner_region
+        },
+        'registration': {
+            'stnk_status': t.stnk_status,
+            'sim_status': t.sim_status
+        },
+        'fine': {
+            'base_fine': t.base_fine,
+            'penalty_multiplier': t.penalty_multiplier,
+            'total_fine': t.fine_amount
+        }
+    }
+
+
+class JsonArrayWriter:
+    """
+    Write a JSON array one record at a time (same file format as DataStorage,
+    one record per line) without holding the array in memory
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file.write('[')
+    
+    def write(self, records: List[dict]) -> None:
+        for record in records:
+            self._file.write(',\n' if self.count else '\n')
+            self._file.write(json.dumps(record, ensure_ascii=False))
+            self.count += 1
+    
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.write('\n]\n' if self.count else ']\n')
+            self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
 class DataStorage:
     """Handles data storage to files"""
     
@@ -32,40 +163,16 @@ class DataStorage:
         if not os.path.exists(self.stats_file):
             with open(self.stats_file, 'w', newline='') as f:
                 writer = csv.writer(f)
-                writer.writerow([
-                    'timestamp', 'total_vehicles', 'speeding_count',
-                    'total_fines', 'avg_speed', 'max_speed'
-                ])
+                writer.writerow(STATS_COLUMNS)
     
-    def save_vehicles(self, vehicles: List[Vehicle]):
+    def save_vehicles(self, vehicles: Union[List[Vehicle], VehicleBatch]):
         """Save vehicle data to JSON file"""
         try:
             # Convert vehicles to dictionary
-            vehicles_data = []
-            for v in vehicles:
-                vehicle_dict = {
-                    'vehicle_id': v.vehicle_id,
-                    'license_plate': v.license_plate,
-                    'vehicle_type': v.vehicle_type,
-                    'vehicle_make': v.vehicle_make,
-                    'vehicle_model': v.vehicle_model,
-                    'vehicle_category': v.vehicle_category,
-                    'speed': v.speed,
-                    'timestamp': v.timestamp.isoformat(),
-                    'location': v.location,
-                    'ticket_issued': v.ticket_issued,
-                    'fine_amount': v.fine_amount,
-                    'owner': {
-                        'id': v.owner_id,
-                        'name': v.owner_name,
-                        'region': v.owner_region
-                    },
-                    'registration': {
-                        'stnk_status': v.stnk_status,
-                        'sim_status': v.sim_status
-                    }
-                }
-                vehicles_data.append(vehicle_dict)
+            if isinstance(vehicles, VehicleBatch):
+                vehicles_data = batch_to_records(vehicles)
+            else:
+                vehicles_data = [vehicle_to_record(v) for v in vehicles]
             
             # Read existing data
             with open(self.traffic_file, 'r') as f:
@@ -86,36 +193,7 @@ class DataStorage:
     def save_tickets(self, tickets: List[Ticket]):
         """Save tickets to JSON file"""
         try:
-            tickets_data = []
-            for t in tickets:
-                ticket_dict = {
-                    'ticket_id': t.ticket_id,
-                    'license_plate': t.license_plate,
-                    'vehicle_type': t.vehicle_type,
-                    'vehicle_make': t.vehicle_make,
-                    'vehicle_model': t.vehicle_model,
-                    'vehicle_category': t.vehicle_category,
-                    'speed': t.speed,
-                    'speed_limit': t.speed_limit,
-                    'timestamp': t.timestamp.isoformat(),
-                    'location': t.location,
-                    'status': t.status,
-                    'owner': {
-                        'id': t.owner_id,
-                        'name': t.owner_name,
-                        'region': t.owner_region
-                    },
-                    'registration': {
-                        'stnk_status': t.stnk_status,
-                        'sim_status': t.sim_status
-                    },
-                    'fine': {
-                        'base_fine': t.base_fine,
-                        'penalty_multiplier': t.penalty_multiplier,
-                        'total_fine': t.fine_amount
-                    }
-                }
-                tickets_data.append(ticket_dict)
+            tickets_data = [ticket_to_record(t) for t in tickets]
             
             # Read existing data with error handling
             existing_data = []
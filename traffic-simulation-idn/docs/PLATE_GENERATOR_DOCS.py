@@ -392,6 +392,9 @@ print(f"Total plat digenerate: {gen.get_generated_plates_count()}")
 - Setiap plat dicatat dalam session
 - Dapat dicek dengan `is_plate_unique()`
 - Session dapat di-clear dengan `clear_session()`
+- Plat dicatat sebagai (kode wilayah, nomor, huruf) dalam `PlateAllocator` (bitset ala roaring, ~2 byte per plat)
+- `PlatGenerator(unique=True)` mengundi ulang sampai plat belum pernah terbit
+- Generasi paralel: `PlateAllocator.partition(n)` membagi ruang nomor per shard
 
 ### 7.3 Warna Plat (Per Spesifikasi)
 - **Hitam**: Kendaraan Pribadi
@@ -468,7 +471,7 @@ def save_generated_plates(generator):
 ## 10. PERFORMANCE & SCALABILITY
 
 - **Generation Speed**: < 1ms per plat
-- **Memory Usage**: O(n) untuk n plat yang digenerate
+- **Memory Usage**: ~2 byte per plat (maks. 8 KiB per 65536 kode plat)
 - **Session Capacity**: 1 juta+ plat per session
 - **Supported Regions**: 30+
 - **Supported Countries**: 20+
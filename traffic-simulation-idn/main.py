@@ -8,30 +8,86 @@ from pathlib import Path
 from simulation.sensor import TrafficSensor
 from simulation.queue_processor import QueuedCarProcessor
 from simulation.analyzer import SpeedAnalyzer
+from simulation.trace import TraceRecorder, TraceReplayer
+from simulation.events import (
+    EventBus, DROP_NEWEST,
+    EVENT_CAR_CHECKING, EVENT_CAR_CHECKED, EVENT_WORKER_STATUS, EVENT_BATCH_COMPLETE
+)
 from dashboard.display import Dashboard
 from utils.logger import logger
+from utils.rng import RNGContext
+from utils.fleet import Fleet
+from utils.indonesian_plates import owner_db, warm_admin_code_cache
 from config import Config
 
 class SpeedingTicketSimulator:
     """Main application controller"""
     
-    def __init__(self):
+    def __init__(self, record_trace: str = None, replay_trace: str = None,
+                 replay_speed: float = 1.0, seed: int = None):
+        """
+        Args:
+            record_trace: Optional path to record the generated workload to
+            replay_trace: Optional trace to replay instead of generating vehicles
+            replay_speed: Replay speed factor (1.0 = real time, 0 = max speed)
+            seed: Root seed for reproducible generation (default: Config.RANDOM_SEED)
+        """
         # Setup configuration
         Config.setup_directories()
         
+        # Root RNG stream; log its entropy so any run can be reproduced
+        self.rng = RNGContext(seed if seed is not None else Config.RANDOM_SEED)
+        logger.info(f"Random seed entropy: {self.rng.entropy}")
+        
+        # Resolve base.csv admin codes for every plate region before owners are created
+        warm_admin_code_cache()
+        
+        # Warm start: plates seen in earlier runs keep their owners. Seeded runs and
+        # replays must not depend on earlier runs, so they neither load nor save owners.
+        reproducible = seed is not None or Config.RANDOM_SEED is not None or bool(replay_trace)
+        self.owner_snapshot = None if reproducible else Config.OWNER_SNAPSHOT_FILE
+        if self.owner_snapshot:
+            try:
+                loaded = owner_db.load_snapshot(self.owner_snapshot)
+                if loaded:
+                    logger.info(f"Loaded {loaded} owners from {self.owner_snapshot}")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring owner snapshot {self.owner_snapshot}: {e}")
+            owner_db.autosave(self.owner_snapshot, Config.OWNER_SNAPSHOT_EVERY)
+        
         # Create data queue for communication
         self.data_queue = queue.Queue(maxsize=500)
         
+        # Pipeline events are delivered in batches off the processing thread
+        self.event_bus = EventBus()
+        
         # Create queue-based car processor (5 concurrent sensors)
-        self.car_processor = QueuedCarProcessor(num_workers=5)
+        # A trace replay neither restores nor leaves behind pending cars of live runs
+        self.car_processor = QueuedCarProcessor(num_workers=5, event_bus=self.event_bus,
+                                                persist_pending=not replay_trace)
         
-        # Initialize components
-        self.sensor = TrafficSensor(self.data_queue, Config.SIMULATION_INTERVAL, 
-                                    car_processor=self.car_processor)
-        self.analyzer = SpeedAnalyzer(self.data_queue)
+        # Initialize components (a trace replay stands in for the sensor)
+        record_trace = record_trace or Config.TRACE_RECORD_FILE
+        self.recorder = TraceRecorder(record_trace) if record_trace else None
+        if replay_trace:
+            self.sensor = TraceReplayer(replay_trace, self.data_queue,
+                                        car_processor=self.car_processor,
+                                        speed=replay_speed)
+        else:
+            sensor_rng, fleet_rng = self.rng.spawn(2)
+            fleet = None
+            if Config.FLEET_SIZE:
+                fleet = Fleet(Config.FLEET_SIZE, Config.FLEET_ZIPF_EXPONENT, rng=fleet_rng)
+                logger.info(f"Registered fleet: {len(fleet)} vehicles")
+            self.sensor = TrafficSensor(self.data_queue, Config.SIMULATION_INTERVAL, 
+                                        car_processor=self.car_processor,
+                                        recorder=self.recorder,
+                                        rng=sensor_rng, fleet=fleet)
+        self.analyzer = SpeedAnalyzer(self.data_queue, persist_pending=not replay_trace)
         self.dashboard = Dashboard(self.sensor, self.analyzer)
         
         self.is_running = False
+        self._stopped = False  # stop() may be reached from signal and timer
         
         # Register signal handlers for graceful shutdown
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -53,14 +109,15 @@ class SpeedingTicketSimulator:
         self.is_running = True
         
         try:
+            # Setup event subscribers for smooth visualization
+            self._setup_callbacks()
+            self.event_bus.start()
+            
             # Start components
             self.car_processor.start()
             self.sensor.start()
             self.analyzer.start()
             
-            # Setup callbacks for smooth visualization
-            self._setup_callbacks()
-            
             # Start dashboard in separate thread
             dashboard_thread = threading.Thread(
                 target=self.dashboard.run,
@@ -78,51 +135,47 @@ class SpeedingTicketSimulator:
             self.stop()
     
     def _setup_callbacks(self):
-        """Setup callbacks for smooth car-by-car processing"""
+        """Subscribe batched handlers for smooth car-by-car processing"""
         # Initialize worker status file
         worker_status_file = Path("data_files/worker_status.json")
         worker_status_file.parent.mkdir(parents=True, exist_ok=True)
-        initial_status = {str(i): None for i in range(5)}
+        statuses = {str(i): None for i in range(self.car_processor.num_workers)}
         with open(worker_status_file, 'w') as f:
-            json.dump(initial_status, f)
+            json.dump(statuses, f)
         
-        def on_car_checking(vehicle):
-            """Called when a car starts being checked"""
-            logger.info(f"[CHECK] Checking car: {vehicle.license_plate} (Speed: {vehicle.speed:.1f} km/h)")
+        def on_car_events(events):
+            """Log checking starts and verdicts"""
+            for event in events:
+                if event.kind == EVENT_CAR_CHECKING:
+                    vehicle, = event.payload
+                    logger.info(f"[CHECK] Checking car: {vehicle.license_plate} (Speed: {vehicle.speed:.1f} km/h)")
+                    continue
+                
+                result, = event.payload
+                status = "[SAFE]" if not result.is_violation else "[VIOLATION]"
+                if result.is_violation:
+                    logger.warning(
+                        f"{status}: {result.vehicle.license_plate} - "
+                        f"Owner: {result.vehicle.owner_name} - "
+                        f"Speed: {result.vehicle.speed:.1f} km/h - "
+                        f"Fine: ${result.ticket.fine_amount:.2f}"
+                    )
+                else:
+                    logger.info(f"{status}: {result.vehicle.license_plate}")
         
-        def on_car_checked(result):
-            """Called when a car verdict is ready"""
-            status = "[SAFE]" if not result.is_violation else "[VIOLATION]"
-            if result.is_violation:
-                logger.warning(
-                    f"{status}: {result.vehicle.license_plate} - "
-                    f"Owner: {result.vehicle.owner_name} - "
-                    f"Speed: {result.vehicle.speed:.1f} km/h - "
-                    f"Fine: ${result.ticket.fine_amount:.2f}"
+        def on_batch_events(events):
+            """Log completed batches"""
+            for event in events:
+                vehicles, violations = event.payload
+                logger.info(
+                    f"[COMPLETE] Batch done: {len(vehicles)} cars, "
+                    f"{len(violations)} violations"
                 )
-            else:
-                logger.info(f"{status}: {result.vehicle.license_plate}")
         
-        def on_batch_complete(vehicles, violations):
-            """Called when a batch is completely processed"""
-            logger.info(
-                f"[COMPLETE] Batch done: {len(vehicles)} cars, "
-                f"{len(violations)} violations"
-            )
-        
-        def on_worker_status(worker_id, vehicle, status):
-            """Called when worker status changes"""
-            try:
-                worker_status_file = Path("data_files/worker_status.json")
-                
-                # Read current status
-                if worker_status_file.exists():
-                    with open(worker_status_file, 'r') as f:
-                        statuses = json.load(f)
-                else:
-                    statuses = {}
-                
-                # Update this worker
+        def on_worker_status_events(events):
+            """Apply a batch of worker status changes, then write the file once"""
+            for event in events:
+                worker_id, vehicle, status = event.payload
                 if status in ['VIOLATION', 'SAFE']:
                     # Worker finished checking
                     statuses[str(worker_id)] = None
@@ -137,17 +190,20 @@ class SpeedingTicketSimulator:
                         },
                         'status': status
                     }
-                
-                # Write back
+            
+            try:
                 with open(worker_status_file, 'w') as f:
                     json.dump(statuses, f)
             except Exception as e:
                 logger.debug(f"Error updating worker status: {e}")
         
-        self.car_processor.on_car_checking = on_car_checking
-        self.car_processor.on_car_checked = on_car_checked
-        self.car_processor.on_batch_complete = on_batch_complete
-        self.car_processor.on_worker_status = on_worker_status
+        self.event_bus.subscribe('car-log', on_car_events,
+                                 kinds=[EVENT_CAR_CHECKING, EVENT_CAR_CHECKED],
+                                 drop_policy=DROP_NEWEST)
+        self.event_bus.subscribe('batch-log', on_batch_events,
+                                 kinds=[EVENT_BATCH_COMPLETE])
+        self.event_bus.subscribe('worker-status', on_worker_status_events,
+                                 kinds=[EVENT_WORKER_STATUS], max_delay=0.1)
     
     def _control_loop(self):
         """Handle user input"""
@@ -192,13 +248,27 @@ class SpeedingTicketSimulator:
     
     def stop(self):
         """Stop the simulation"""
+        if self._stopped:
+            return
+        self._stopped = True
         logger.info("Stopping simulation...")
         self.is_running = False
         
-        # Stop components
-        self.car_processor.stop()
+        # Stop components upstream first so each stage can drain what it has:
+        # intake -> checks -> analysis -> event delivery
         self.sensor.stop()
+        self.car_processor.stop()
         self.analyzer.stop()
+        self.event_bus.stop()
+        if self.recorder:
+            self.recorder.close()
+        if self.owner_snapshot:
+            owner_db.autosave(None, 0)
+            try:
+                saved = owner_db.save_snapshot(self.owner_snapshot)
+                logger.info(f"Saved {saved} owners to {self.owner_snapshot}")
+            except OSError as e:
+                logger.warning(f"Could not save owner snapshot: {e}")
         
         # Display final statistics
         self._display_final_stats()
@@ -224,6 +294,10 @@ class SpeedingTicketSimulator:
         print(f"Total Fines Issued: ${stats['total_fines']}")
         print(f"Average Speed: {stats['avg_speed']} km/h")
         print(f"Maximum Speed Recorded: {stats['max_speed']} km/h")
+        owner_stats = owner_db.get_stats()
+        if 'evictions' in owner_stats:
+            print(f"Owner Cache: {owner_stats['memory']} in memory, {owner_stats['disk']} spilled, "
+                  f"hit rate {owner_stats['hit_rate'] * 100:.1f}%, {owner_stats['evictions']} evictions")
         
         if analyzer_stats['total_processed'] > 0:
             violation_rate = (analyzer_stats['speeding_processed'] / 
@@ -1,44 +1,114 @@
 import threading
 import queue
+import time
 from datetime import datetime
-from typing import List
+from typing import List, Union
 from config import Config
 from data_models.models import Vehicle, Ticket, TrafficStats
+from data_models.batch import VehicleBatch
 from utils.generators import DataGenerator
 from utils.logger import logger
 from data_models.storage import DataStorage
+from simulation.stats import ShardedStats
+from simulation.trace import persist_batches, restore_batches
 
 class SpeedAnalyzer:
     """Analyzes vehicle speeds and issues tickets"""
     
-    def __init__(self, data_queue: queue.Queue):
+    SPEEDING_TOLERANCE = 0.9  # Allow 75.1-75.9 without penalty
+    
+    def __init__(self, data_queue: queue.Queue, pending_file: str = None,
+                 persist_pending: bool = True):
         """
         Args:
             data_queue: Queue to get vehicle data from sensor
+            pending_file: Where unanalyzed batches are saved on stop and restored
+                          from on start (default: Config.PENDING_BATCHES_FILE)
+            persist_pending: Save/restore unanalyzed batches at all (off for trace
+                             replays, which must not mix in batches of other runs)
         """
         self.data_queue = data_queue
+        self.pending_file = pending_file or Config.PENDING_BATCHES_FILE
+        self.persist_pending = persist_pending
         self.is_running = False
         self.thread = None
         self.storage = DataStorage()
-        self.stats = TrafficStats(
-            period_start=datetime.now(),
-            period_end=datetime.now()
+        self.period_start = datetime.now()
+        # Accumulators are written by the analyzer thread only and merged on read
+        self._stats = ShardedStats()
+    
+    @property
+    def stats(self) -> TrafficStats:
+        """Consistent TrafficStats snapshot for the current period"""
+        totals = self._stats.merged()
+        return TrafficStats(
+            period_start=self.period_start,
+            period_end=datetime.now(),
+            total_vehicles=totals.vehicles,
+            speeding_count=totals.violations,
+            total_fines=totals.total_fines,
+            avg_speed=totals.avg_speed,
+            max_speed=totals.max_speed
         )
-        self.total_processed = 0
-        self.speeding_processed = 0
+    
+    @property
+    def total_processed(self) -> int:
+        """Total vehicles analyzed"""
+        return self._stats.merged().vehicles
+    
+    @property
+    def speeding_processed(self) -> int:
+        """Total vehicles that received a ticket"""
+        return self._stats.merged().violations
     
     def start(self):
         """Start the analyzer"""
+        # Batches left unanalyzed by the previous run go first
+        restored = restore_batches(self.pending_file) if self.persist_pending else []
+        for vehicles in restored:
+            self.data_queue.put({
+                'timestamp': datetime.now(),
+                'vehicles': vehicles,
+                'batch_size': len(vehicles)
+            })
+        if restored:
+            logger.info(f"Restored {len(restored)} unanalyzed batches from {self.pending_file}")
+        
         self.is_running = True
         self.thread = threading.Thread(target=self._run, daemon=True)
         self.thread.start()
         logger.info("Speed analyzer started")
     
-    def stop(self):
-        """Stop the analyzer"""
+    def stop(self, drain_timeout: float = None):
+        """
+        Stop the analyzer after draining queued batches until the deadline.
+        Batches still queued afterwards are saved to pending_file.
+        
+        Args:
+            drain_timeout: Seconds to keep draining (default: Config.SHUTDOWN_DRAIN_TIMEOUT)
+        """
+        if drain_timeout is None:
+            drain_timeout = Config.SHUTDOWN_DRAIN_TIMEOUT
+        
+        deadline = time.monotonic() + drain_timeout
+        while (self.is_running and not self.data_queue.empty() and
+               time.monotonic() < deadline):
+            time.sleep(0.05)
+        
         self.is_running = False
         if self.thread:
             self.thread.join(timeout=2)
+        
+        undrained = []
+        while True:
+            try:
+                undrained.append(self.data_queue.get_nowait()['vehicles'])
+            except queue.Empty:
+                break
+        if undrained and self.persist_pending:
+            persist_batches(self.pending_file, undrained)
+            logger.info(f"Saved {len(undrained)} unanalyzed batches to {self.pending_file}")
+        
         logger.info("Speed analyzer stopped")
         
         # Save final statistics
@@ -67,24 +137,25 @@ class SpeedAnalyzer:
                     self.storage.save_tickets(batch_tickets)
                 
                 # Log results
-                speeding_count = len([v for v in vehicles if v.ticket_issued])
+                if isinstance(vehicles, VehicleBatch):
+                    speeding_count = int(vehicles.violations.sum())
+                else:
+                    speeding_count = len([v for v in vehicles if v.ticket_issued])
                 logger.info(f"Processed {len(vehicles)} vehicles, {speeding_count} speeding violations")
                 
-                self.total_processed += len(vehicles)
-                self.speeding_processed += speeding_count
-                
             except Exception as e:
                 logger.error(f"Error in speed analyzer: {e}")
     
-    def _process_batch(self, vehicles: List[Vehicle]) -> List[Ticket]:
+    def _process_batch(self, vehicles: Union[List[Vehicle], VehicleBatch]) -> List[Ticket]:
         """Process a batch of vehicles and issue tickets"""
-        tickets = []
-        SPEEDING_TOLERANCE = 0.9  # Allow 75.1-75.9 without penalty
+        if isinstance(vehicles, VehicleBatch):
+            return self._process_columnar(vehicles)
         
+        tickets = []
         for vehicle in vehicles:
             # Check if violating speed limits (both too fast and too slow)
             # Tolerance: speeds 75.1-75.9 are NOT flagged as violations (within tolerance)
-            is_speeding = vehicle.speed > (Config.SPEED_LIMIT + SPEEDING_TOLERANCE)
+            is_speeding = vehicle.speed > (Config.SPEED_LIMIT + self.SPEEDING_TOLERANCE)
             is_too_slow = vehicle.speed < Config.MIN_SPEED_LIMIT
             
             if is_speeding or is_too_slow:
@@ -140,47 +211,62 @@ class SpeedAnalyzer:
         
         return tickets
     
-    def _update_stats(self, tickets: List[Ticket] = None, vehicles: List[Vehicle] = None, final: bool = False):
+    def _process_columnar(self, batch: VehicleBatch) -> List[Ticket]:
+        """Issue tickets for a VehicleBatch with one vectorized verdict pass"""
+        violations = batch.apply_verdicts(self.SPEEDING_TOLERANCE)
+        if not violations.any():
+            return []
+        
+        tickets = batch.tickets()
+        speeds = batch.speeds[violations]
+        logger.warning(
+            f"{len(tickets)} VIOLATIONS in columnar batch: "
+            f"{int((speeds > Config.SPEED_LIMIT).sum())} speeding, "
+            f"{int((speeds < Config.MIN_SPEED_LIMIT).sum())} too slow, "
+            f"fines ${batch.fines[violations].sum():.2f}"
+        )
+        return tickets
+    
+    def _update_stats(self, tickets: List[Ticket] = None,
+                      vehicles: Union[List[Vehicle], VehicleBatch] = None, final: bool = False):
         """Update statistics"""
-        if vehicles:
-            # Calculate batch statistics
+        if isinstance(vehicles, VehicleBatch):
+            # Whole-column aggregates; fines come from the tickets as in the list path
+            if len(vehicles):
+                self._stats.record_batch(
+                    vehicles=len(vehicles),
+                    violations=int(vehicles.violations.sum()),
+                    total_fines=sum(t.fine_amount for t in tickets) if tickets else 0.0,
+                    speed_sum=float(vehicles.speeds.sum()),
+                    max_speed=float(vehicles.speeds.max())
+                )
+        elif vehicles:
+            # Aggregate the batch once, then publish it to this thread's shard
             speeds = [v.speed for v in vehicles]
-            self.stats.total_vehicles += len(vehicles)
-            self.stats.speeding_count += len([v for v in vehicles if v.ticket_issued])
-            self.stats.total_fines += sum(t.fine_amount for t in tickets) if tickets else 0
-            
-            # Update average speed (weighted)
-            if speeds:
-                batch_avg = sum(speeds) / len(speeds)
-                total_vehicles = self.stats.total_vehicles
-                if total_vehicles > 0:
-                    # Weighted average calculation
-                    self.stats.avg_speed = (
-                        (self.stats.avg_speed * (total_vehicles - len(vehicles)) + 
-                         batch_avg * len(vehicles)) / total_vehicles
-                    )
-                
-                # Update max speed
-                batch_max = max(speeds)
-                if batch_max > self.stats.max_speed:
-                    self.stats.max_speed = batch_max
+            self._stats.record_batch(
+                vehicles=len(vehicles),
+                violations=len([v for v in vehicles if v.ticket_issued]),
+                total_fines=sum(t.fine_amount for t in tickets) if tickets else 0.0,
+                speed_sum=sum(speeds),
+                max_speed=max(speeds)
+            )
         
-        if final or (self.stats.total_vehicles > 0 and 
-                    (datetime.now() - self.stats.period_start).seconds >= 60):  # Save every minute
-            self.stats.period_end = datetime.now()
+        if final or (self.total_processed > 0 and 
+                    (datetime.now() - self.period_start).seconds >= 60):  # Save every minute
             self.storage.save_statistics(self.stats)
-            self.stats.period_start = datetime.now()  # Reset for next period
+            self.period_start = datetime.now()  # Reset for next period
     
     def get_stats(self):
         """Get analyzer statistics"""
+        stats = self.stats  # One merged snapshot for every field below
         return {
-            'total_processed': self.total_processed,
-            'speeding_processed': self.speeding_processed,
+            'total_processed': stats.total_vehicles,
+            'speeding_processed': stats.speeding_count,
             'current_stats': {
-                'total_vehicles': self.stats.total_vehicles,
-                'speeding_count': self.stats.speeding_count,
-                'total_fines': self.stats.total_fines,
-                'avg_speed': round(self.stats.avg_speed, 2),
-                'max_speed': round(self.stats.max_speed, 2)
+                'total_vehicles': stats.total_vehicles,
+                'speeding_count': stats.speeding_count,
+                'total_fines': stats.total_fines,
+                'avg_speed': round(stats.avg_speed, 2),
+                'max_speed': round(stats.max_speed, 2)
             }
         }
@@ -0,0 +1,172 @@
+"""
+Parallel synthetic dataset builder
+Generates N vehicles (and their tickets) without running the real-time
+simulator. The work is split into fixed-size shards, each with its own child
+seed from one root SeedSequence, and the shards run in a process pool.
+Timestamps come from a synthetic clock (the manifest's epoch plus
+RECORD_INTERVAL per record) and ticket IDs from each shard's stream, so the
+shard files depend only on the seed, epoch, total and shard size, byte for
+byte, not on the number of workers or the wall clock.
+
+Each shard writes the project's storage formats:
+- vehicles-NNNNN.json  (traffic_data.json records)
+- tickets-NNNNN.json   (tickets.json records)
+and the builder adds statistics.csv (one row per shard) and manifest.json.
+"""
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+
+import utils.generators as generators
+from config import Config
+from data_models.storage import (
+    JsonArrayWriter, batch_to_records, ticket_to_record, STATS_COLUMNS
+)
+from simulation.analyzer import SpeedAnalyzer
+from utils.fleet import Fleet
+from utils.generators import DataGenerator
+from utils.indonesian_plates import OwnerDatabase, warm_admin_code_cache
+from utils.rng import RNGContext
+
+# Vehicles generated (and written) per chunk inside a shard
+CHUNK_SIZE = 10000
+# Synthetic clock: record k of the dataset is detected at epoch + k * RECORD_INTERVAL
+DEFAULT_EPOCH = datetime(2025, 1, 1)
+RECORD_INTERVAL = timedelta(milliseconds=100)
+
+
+def build_shard(shard_index: int, count: int, seed_sequence: np.random.SeedSequence,
+                output_dir: str, fleet_size: Optional[int] = None, owners: bool = True,
+                epoch: datetime = DEFAULT_EPOCH, offset: int = 0) -> Dict:
+    """
+    Generate one shard and write its vehicle and ticket files
+
+    Runs in a worker process; uses its own owner database so shards never
+    share state. The database lives for the whole shard, so a plate drawn
+    again in a later chunk keeps its owner (set Config.OWNER_CACHE_SIZE to
+    bound its memory). Without owners, owner fields stay empty and STNK/SIM
+    penalties are not applied (much faster). offset is the dataset index of
+    the shard's first record on the synthetic clock.
+    """
+    started = time.perf_counter()
+    if owners:
+        warm_admin_code_cache()
+    rng = RNGContext(seed_sequence=seed_sequence)
+    owner_db = OwnerDatabase(Config.OWNER_CACHE_SIZE)  # Private spill file per shard
+    original_db, generators.owner_db = generators.owner_db, owner_db
+    fleet_rng, ticket_rng = rng.spawn(2)
+    fleet = None
+    if fleet_size:
+        fleet = Fleet(fleet_size, Config.FLEET_ZIPF_EXPONENT, rng=fleet_rng, owner_db=owner_db)
+    clock = np.datetime64(epoch, 'us') + offset * np.timedelta64(RECORD_INTERVAL, 'us')
+
+    violations = 0
+    total_fines = speed_sum = max_speed = 0.0
+    try:
+        with JsonArrayWriter(os.path.join(output_dir, f"vehicles-{shard_index:05d}.json")) as vehicles_out, \
+                JsonArrayWriter(os.path.join(output_dir, f"tickets-{shard_index:05d}.json")) as tickets_out:
+            for start in range(0, count, CHUNK_SIZE):
+                size = min(CHUNK_SIZE, count - start)
+                if fleet is not None:
+                    batch = fleet.sighting_batch(size)
+                else:
+                    batch = DataGenerator.generate_vehicle_batch_bulk(size, rng)
+                timestamps = clock + np.arange(start, start + size) * np.timedelta64(RECORD_INTERVAL, 'us')
+                batch.columns['timestamp'] = timestamps
+                batch.timestamp = timestamps[0].astype(datetime)
+                if owners:
+                    batch.resolve_owners()
+                else:
+                    batch.owner_db = None
+                batch.apply_verdicts(SpeedAnalyzer.SPEEDING_TOLERANCE)
+                vehicles_out.write(batch_to_records(batch))
+                tickets_out.write([ticket_to_record(t) for t in batch.tickets(ticket_rng.random)])
+
+                violations += int(batch.violations.sum())
+                total_fines += float(batch.fines.sum())
+                speed_sum += float(batch.speeds.sum())
+                max_speed = max(max_speed, float(batch.speeds.max()))
+    finally:
+        generators.owner_db = original_db
+
+    return {
+        'shard': shard_index,
+        'started_at': clock.astype(datetime),
+        'vehicles': count,
+        'violations': violations,
+        'total_fines': total_fines,
+        'avg_speed': speed_sum / count if count else 0.0,
+        'max_speed': max_speed,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def build_dataset(total: int, output_dir: str, workers: int = None, seed: int = None,
+                  shard_size: int = 1_000_000, fleet_size: Optional[int] = None,
+                  owners: bool = True, epoch: datetime = DEFAULT_EPOCH) -> Dict:
+    """
+    Generate a dataset of `total` vehicles in parallel
+
+    Args:
+        total: Number of vehicles
+        output_dir: Directory for the shard files, statistics.csv and manifest.json
+        workers: Worker processes (default: CPU count)
+        seed: Root seed (None = fresh entropy, recorded in the manifest)
+        shard_size: Vehicles per shard
+        fleet_size: Draw sightings from a registered fleet of this size per shard
+        owners: Resolve vehicle owners (STNK/SIM status) for every record
+        epoch: Detection time of the first record (see RECORD_INTERVAL)
+
+    Returns:
+        Summary with totals, elapsed time and throughput
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    root = RNGContext(seed)
+    starts = list(range(0, total, shard_size))
+    counts = [min(shard_size, total - start) for start in starts]
+    seeds = root.seed_sequence.spawn(len(counts))
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(build_shard, i, count, seeds[i], output_dir, fleet_size, owners,
+                               epoch, starts[i])
+                   for i, count in enumerate(counts)]
+        shards = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    with open(os.path.join(output_dir, "statistics.csv"), 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(STATS_COLUMNS)
+        for shard in shards:
+            writer.writerow([
+                shard['started_at'].isoformat(), shard['vehicles'], shard['violations'],
+                shard['total_fines'], round(shard['avg_speed'], 2), round(shard['max_speed'], 2)
+            ])
+
+    summary = {
+        'vehicles': total,
+        'tickets': sum(s['violations'] for s in shards),
+        'total_fines': sum(s['total_fines'] for s in shards),
+        'shards': len(shards),
+        'seconds': elapsed,
+        'vehicles_per_second': total / elapsed if elapsed else 0.0,
+    }
+    with open(os.path.join(output_dir, "manifest.json"), 'w') as f:
+        json.dump({
+            'seed_entropy': root.entropy,
+            'epoch': epoch.isoformat(),
+            'record_interval_ms': RECORD_INTERVAL / timedelta(milliseconds=1),
+            'shard_size': shard_size,
+            'fleet_size': fleet_size,
+            'owners': owners,
+            'created_at': datetime.now().isoformat(),
+            **summary,
+        }, f, indent=2)
+    return summary
@@ -0,0 +1,188 @@
+"""
+Batched pipeline event bus
+Publishers (the car processor) only append events to per-subscriber queues.
+Each subscriber has its own dispatcher thread that delivers events in
+micro-batches (by count or time), so logging and file I/O never run on the
+processing thread and a slow consumer cannot throttle verdict throughput.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from utils.logger import logger
+
+# Event kinds emitted by QueuedCarProcessor
+EVENT_CAR_CHECKING = 'car_checking'      # payload: (vehicle,)
+EVENT_CAR_CHECKED = 'car_checked'        # payload: (result,)
+EVENT_WORKER_STATUS = 'worker_status'    # payload: (worker_id, vehicle, status)
+EVENT_BATCH_COMPLETE = 'batch_complete'  # payload: (vehicles, violations)
+
+# What to do when a subscriber queue is full
+DROP_OLDEST = 'drop_oldest'  # Discard the oldest queued event (keep latest state)
+DROP_NEWEST = 'drop_newest'  # Discard the incoming event (keep history prefix)
+
+
+class PipelineEvent(NamedTuple):
+    """Single event delivered to subscribers"""
+    kind: str
+    payload: tuple
+    timestamp: float
+
+
+class Subscription:
+    """Bounded event queue plus the dispatcher thread that drains it"""
+
+    def __init__(self, name: str, handler: Callable[[List[PipelineEvent]], None],
+                 kinds: Optional[Iterable[str]] = None, max_batch: int = 100,
+                 max_delay: float = 0.25, max_queue: int = 10000,
+                 drop_policy: str = DROP_OLDEST):
+        """
+        Args:
+            name: Subscriber name (used for logging and stats)
+            handler: Called with a list of events on the dispatcher thread
+            kinds: Event kinds to receive (None = all kinds)
+            max_batch: Deliver as soon as this many events are queued
+            max_delay: Deliver queued events at least this often (seconds)
+            max_queue: Queue capacity before the drop policy applies
+            drop_policy: DROP_OLDEST or DROP_NEWEST
+        """
+        if drop_policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Invalid drop policy: {drop_policy}")
+
+        self.name = name
+        self.handler = handler
+        self.kinds = frozenset(kinds) if kinds is not None else None
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self.drop_policy = drop_policy
+
+        self.events = deque()
+        self.condition = threading.Condition()
+        self.is_running = False
+        self.thread = None
+
+        self.delivered = 0
+        self.dropped = 0
+        self.batches = 0
+
+    def wants(self, kind: str) -> bool:
+        """Check if this subscriber receives the given event kind"""
+        return self.kinds is None or kind in self.kinds
+
+    def offer(self, event: PipelineEvent) -> None:
+        """Queue an event without blocking the publisher"""
+        with self.condition:
+            if len(self.events) >= self.max_queue:
+                self.dropped += 1
+                if self.drop_policy == DROP_NEWEST:
+                    return
+                self.events.popleft()
+            self.events.append(event)
+            if len(self.events) >= self.max_batch:
+                self.condition.notify()
+
+    def start(self):
+        """Start the dispatcher thread"""
+        self.is_running = True
+        self.thread = threading.Thread(target=self._run, name=f"events-{self.name}", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the dispatcher after delivering what is already queued"""
+        with self.condition:
+            self.is_running = False
+            self.condition.notify()
+        if self.thread:
+            self.thread.join(timeout=timeout)
+
+    def _take_batch(self) -> List[PipelineEvent]:
+        """Wait for a full batch or the delay to expire, then dequeue it"""
+        with self.condition:
+            deadline = time.monotonic() + self.max_delay
+            while self.is_running and len(self.events) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+
+            count = min(len(self.events), self.max_batch)
+            return [self.events.popleft() for _ in range(count)]
+
+    def _run(self):
+        """Dispatcher loop"""
+        while True:
+            batch = self._take_batch()
+            if batch:
+                self._deliver(batch)
+            elif not self.is_running:
+                break
+
+    def _deliver(self, batch: List[PipelineEvent]):
+        try:
+            self.handler(batch)
+        except Exception as e:
+            logger.error(f"Event subscriber '{self.name}' failed: {e}")
+        self.delivered += len(batch)
+        self.batches += 1
+
+    def get_stats(self) -> Dict:
+        """Get subscriber statistics"""
+        return {
+            'queued': len(self.events),
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'batches': self.batches
+        }
+
+
+class EventBus:
+    """Fan-out of pipeline events to batched, independently dispatched subscribers"""
+
+    def __init__(self):
+        self.subscriptions: List[Subscription] = []
+        self.is_running = False
+
+    def subscribe(self, name: str, handler: Callable[[List[PipelineEvent]], None],
+                  kinds: Optional[Iterable[str]] = None, **options) -> Subscription:
+        """
+        Register a batch handler
+
+        Args:
+            name: Subscriber name
+            handler: Called with a list of PipelineEvents
+            kinds: Event kinds to receive (None = all kinds)
+            **options: max_batch, max_delay, max_queue, drop_policy (see Subscription)
+        """
+        subscription = Subscription(name, handler, kinds, **options)
+        self.subscriptions.append(subscription)
+        if self.is_running:
+            subscription.start()
+        return subscription
+
+    def publish(self, kind: str, *payload) -> None:
+        """Publish an event to every interested subscriber (never blocks on handlers)"""
+        event = PipelineEvent(kind, payload, time.time())
+        for subscription in self.subscriptions:
+            if subscription.wants(kind):
+                subscription.offer(event)
+
+    def start(self):
+        """Start every subscriber's dispatcher thread"""
+        self.is_running = True
+        for subscription in self.subscriptions:
+            subscription.start()
+        logger.info(f"Event bus started with {len(self.subscriptions)} subscribers")
+
+    def stop(self, timeout: float = 2.0):
+        """Flush and stop every subscriber"""
+        self.is_running = False
+        for subscription in self.subscriptions:
+            subscription.stop(timeout)
+        logger.info("Event bus stopped")
+
+    def get_stats(self) -> Dict:
+        """Get per-subscriber statistics"""
+        return {s.name: s.get_stats() for s in self.subscriptions}
@@ -3,17 +3,25 @@ Queue-based car processor with concurrent sensor workers
 Processes cars sequentially with 5 concurrent sensors for efficiency
 """
 
+import itertools
 import threading
 import queue
 import time
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Callable
+from typing import List, Dict, Callable, Optional, Union
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from utils.logger import logger
 from data_models.models import Vehicle, Ticket
+from data_models.batch import VehicleBatch
 from utils.generators import DataGenerator
 from config import Config
+from simulation.stats import ShardedStats
+from simulation.events import (
+    EVENT_CAR_CHECKING, EVENT_CAR_CHECKED, EVENT_WORKER_STATUS, EVENT_BATCH_COMPLETE
+)
+from simulation.trace import persist_batches, restore_batches
 
 
 class CarCheckResult:
@@ -27,6 +35,15 @@ class CarCheckResult:
         self.check_timestamp = datetime.now()
 
 
+class BatchResults:
+    """Verdicts collected for one add_vehicles() batch"""
+    def __init__(self, batch_id: int, vehicles: Union[List[Vehicle], VehicleBatch]):
+        self.batch_id = batch_id
+        self.vehicles = vehicles
+        self.pending = len(vehicles)
+        self.violations = []
+
+
 class QueuedCarProcessor:
     """
     Processes cars from a queue using 5 concurrent sensor workers.
@@ -35,152 +52,247 @@ class QueuedCarProcessor:
     - Each car gets a verdict before moving to next
     """
     
-    def __init__(self, num_workers: int = 5):
+    def __init__(self, num_workers: int = 5, event_bus=None,
+                 recent_results_size: int = None, pending_file: str = None,
+                 persist_pending: bool = True):
         """
         Args:
             num_workers: Number of concurrent sensor workers (default: 5)
+            event_bus: Optional EventBus; events are published to it and
+                       delivered in batches on its dispatcher threads
+            recent_results_size: How many recent results/tickets to keep
+                                 (default: Config.RECENT_RESULTS_SIZE)
+            pending_file: Where undrained cars are saved on stop and restored
+                          from on start (default: Config.PENDING_QUEUE_FILE)
+            persist_pending: Save/restore undrained cars at all (off for trace
+                             replays, which must not mix in cars of other runs)
         """
         self.num_workers = num_workers
-        self.car_queue = queue.Queue()  # Queue of vehicles to process
+        self.event_bus = event_bus
+        self.pending_file = pending_file or Config.PENDING_QUEUE_FILE
+        self.persist_pending = persist_pending
+        self.car_queue = queue.Queue()  # Queue of (batch_id, vehicle) to process
         self.result_queue = queue.Queue()  # Queue of check results
         self.is_running = False
+        self.accepting = True  # Intake is closed while draining
         self.executor = None
+        self.main_thread = None
         self.worker_threads = []
+        self.in_flight = 0  # Checks submitted but not yet collected
+        self._stop_event = threading.Event()  # Cuts short in-flight sensor checks
         
-        # Callbacks
+        # Callbacks (run inline on the processing thread - prefer event_bus)
         self.on_car_checking = None  # Called when checking starts
         self.on_car_checked = None   # Called when verdict is ready
         self.on_batch_complete = None  # Called when batch is done
         self.on_worker_status = None  # Called when worker status changes
         
-        # Stats
-        self.total_processed = 0
-        self.total_violations = 0
-        self.violations_list = []
+        # Stats - sharded per worker thread, merged only in get_stats()
+        self.stats = ShardedStats()
         self.current_car = None
         
+        # Bounded history: memory stays flat however long the processor runs
+        if recent_results_size is None:
+            recent_results_size = Config.RECENT_RESULTS_SIZE
+        self.recent_results = deque(maxlen=recent_results_size)
+        self.violations_list = deque(maxlen=recent_results_size)
+        
+        # In-flight batches keyed by batch ID (removed once completed)
+        self.batches: Dict[int, BatchResults] = {}
+        self._batch_ids = itertools.count(1)
+        
         # Worker tracking - maps worker_id to (vehicle, start_time)
+        # Only the main loop writes these, so no lock is needed
         self.worker_status = {}
         for i in range(num_workers):
             self.worker_status[i] = None
-        
-        self.lock = threading.Lock()
+    
+    @property
+    def total_processed(self) -> int:
+        """Total cars checked (merged across worker shards)"""
+        return self.stats.merged().vehicles
+    
+    @property
+    def total_violations(self) -> int:
+        """Total violations found (merged across worker shards)"""
+        return self.stats.merged().violations
     
     def start(self):
         """Start the car processor with worker threads"""
+        self._stop_event.clear()
         self.is_running = True
+        self.accepting = True
         self.executor = ThreadPoolExecutor(max_workers=self.num_workers)
         
         # Start the main processing loop
-        main_thread = threading.Thread(target=self._main_loop, daemon=True)
-        main_thread.start()
+        self.main_thread = threading.Thread(target=self._main_loop, daemon=True)
+        self.main_thread.start()
         
         logger.info(f"Car queue processor started with {self.num_workers} concurrent sensors")
+        
+        # Pick up cars left undrained by the previous run
+        if self.persist_pending:
+            for vehicles in restore_batches(self.pending_file):
+                logger.info(f"Restored {len(vehicles)} undrained cars from {self.pending_file}")
+                self.add_vehicles(vehicles)
     
-    def stop(self):
-        """Stop the car processor"""
+    def stop(self, drain_timeout: float = None):
+        """
+        Stop the car processor with a deadline-bounded drain:
+        1. Stop intake (add_vehicles is refused)
+        2. Keep checking queued cars until the queue is empty or the deadline passes
+        3. Cut short in-flight checks and collect their verdicts
+        4. Save cars still queued to pending_file for the next run
+        
+        Args:
+            drain_timeout: Seconds to keep draining (default: Config.SHUTDOWN_DRAIN_TIMEOUT)
+        """
+        if drain_timeout is None:
+            drain_timeout = Config.SHUTDOWN_DRAIN_TIMEOUT
+        self.accepting = False
+        
+        deadline = time.monotonic() + drain_timeout
+        while (self.is_running and time.monotonic() < deadline and
+               (not self.car_queue.empty() or self.in_flight)):
+            time.sleep(0.05)
+        
+        # Deadline reached (or fully drained): stop pulling cars and end checks early
+        self._stop_event.set()
+        if self.main_thread:
+            self.main_thread.join(timeout=2)
         self.is_running = False
         
         if self.executor:
-            self.executor.shutdown(wait=True)
+            self.executor.shutdown(wait=True, cancel_futures=True)
+        
+        # Keep undrained cars grouped by the batch they arrived in
+        undrained = {}
+        while True:
+            try:
+                batch_id, vehicle = self.car_queue.get_nowait()
+            except queue.Empty:
+                break
+            undrained.setdefault(batch_id, []).append(vehicle)
+        if undrained and self.persist_pending:
+            persist_batches(self.pending_file, list(undrained.values()))
+            count = sum(len(vehicles) for vehicles in undrained.values())
+            logger.info(f"Saved {count} undrained cars in {len(undrained)} batches to {self.pending_file}")
         
         logger.info("Car queue processor stopped")
     
-    def add_vehicles(self, vehicles: List[Vehicle]):
-        """Add vehicles to the processing queue"""
+    def _emit(self, kind: str, callback: Callable, *args):
+        """Publish an event to the bus and/or call the legacy inline callback"""
+        if self.event_bus is not None:
+            self.event_bus.publish(kind, *args)
+        if callback:
+            callback(*args)
+    
+    def add_vehicles(self, vehicles: Union[List[Vehicle], VehicleBatch]) -> Optional[int]:
+        """
+        Add a batch of vehicles to the processing queue
+        (a VehicleBatch is queued as row views; verdicts write to its columns)
+        
+        Returns:
+            Batch ID reported back when the whole batch has been checked,
+            or None if intake is closed because the processor is stopping
+        """
+        if not self.accepting:
+            logger.warning(f"Processor is stopping, refused {len(vehicles)} vehicles")
+            return None
+        
+        batch_id = next(self._batch_ids)
+        if not vehicles:
+            return batch_id
+        
+        # Register the batch before its cars can complete
+        if not isinstance(vehicles, VehicleBatch):
+            vehicles = list(vehicles)
+        self.batches[batch_id] = BatchResults(batch_id, vehicles)
         for vehicle in vehicles:
-            self.car_queue.put(vehicle)
-        logger.info(f"Added {len(vehicles)} vehicles to check queue")
+            self.car_queue.put((batch_id, vehicle))
+        logger.info(f"Added {len(vehicles)} vehicles to check queue (batch {batch_id})")
+        return batch_id
+    
+    def _record_result(self, batch_id: int, result: Optional[CarCheckResult]):
+        """
+        Collect a verdict and emit batch completion once its batch is done
+        (result is None when the check itself failed)
+        """
+        is_violation = result is not None and result.is_violation
+        if result is not None:
+            self.recent_results.append(result)
+        if is_violation:
+            self.violations_list.append(result.ticket)
+        
+        batch = self.batches.get(batch_id)
+        if batch is None:
+            return
+        if is_violation:
+            batch.violations.append(result.ticket)
+        batch.pending -= 1
+        
+        if batch.pending <= 0:
+            del self.batches[batch_id]
+            self._emit(EVENT_BATCH_COMPLETE, self.on_batch_complete,
+                       batch.vehicles, batch.violations)
     
     def _main_loop(self):
         """Main processing loop that manages queue and callbacks"""
-        pending_futures = {}  # Maps future to (worker_id, vehicle)
-        batch_start_time = None
-        batch_vehicles = []
+        pending_futures = {}  # Maps future to (worker_id, vehicle, batch_id)
         worker_counter = 0
         
-        while self.is_running:
+        while True:
             try:
+                # Once stopping, only finish the checks already in flight
+                if self._stop_event.is_set() or not self.is_running:
+                    if not pending_futures:
+                        break
+                    self._collect_done(pending_futures)
+                    time.sleep(0.01)
+                    continue
+                
+                # Only pull a car when a sensor is free; the rest stay queued
+                # (and can be saved on shutdown)
+                if len(pending_futures) >= self.num_workers:
+                    self._collect_done(pending_futures)
+                    time.sleep(0.01)
+                    continue
+                
                 # Try to get next car from queue (non-blocking)
                 try:
-                    vehicle = self.car_queue.get(timeout=0.5)
-                    batch_vehicles.append(vehicle)
+                    batch_id, vehicle = self.car_queue.get(timeout=0.05 if pending_futures else 0.5)
                     
                     # Update current car
-                    with self.lock:
-                        self.current_car = vehicle
+                    self.current_car = vehicle
                     
-                    # Emit checking callback
-                    if self.on_car_checking:
-                        self.on_car_checking(vehicle)
+                    # Emit checking event
+                    self._emit(EVENT_CAR_CHECKING, self.on_car_checking, vehicle)
                     
                     # Submit to worker pool with worker ID tracking
                     worker_id = worker_counter % self.num_workers
                     worker_counter += 1
                     
                     future = self.executor.submit(self._check_car_with_worker, vehicle, worker_id)
-                    pending_futures[future] = (worker_id, vehicle)
+                    pending_futures[future] = (worker_id, vehicle, batch_id)
+                    self.in_flight = len(pending_futures)
                     
                     # Update worker status
-                    with self.lock:
-                        self.worker_status[worker_id] = {
-                            'vehicle': vehicle,
-                            'start_time': datetime.now(),
-                            'status': 'CHECKING'
-                        }
+                    self.worker_status[worker_id] = {
+                        'vehicle': vehicle,
+                        'start_time': datetime.now(),
+                        'status': 'CHECKING'
+                    }
                     
-                    # Emit worker status callback
-                    if self.on_worker_status:
-                        self.on_worker_status(worker_id, vehicle, 'CHECKING')
+                    # Emit worker status event
+                    self._emit(EVENT_WORKER_STATUS, self.on_worker_status,
+                               worker_id, vehicle, 'CHECKING')
                     
                 except queue.Empty:
                     # No more cars in queue right now
                     pass
                 
                 # Check for completed futures
-                if pending_futures:
-                    done_futures = [f for f in pending_futures if f.done()]
-                    
-                    for future in done_futures:
-                        try:
-                            result, worker_id = future.result()
-                            vehicle = pending_futures[future][1]
-                            
-                            # Update stats
-                            with self.lock:
-                                self.total_processed += 1
-                                if result.is_violation:
-                                    self.total_violations += 1
-                                    self.violations_list.append(result.ticket)
-                                
-                                # Clear worker status
-                                self.worker_status[worker_id] = None
-                            
-                            # Emit verdict callback
-                            if self.on_car_checked:
-                                self.on_car_checked(result)
-                            
-                            # Emit worker status callback
-                            if self.on_worker_status:
-                                verdict = 'VIOLATION' if result.is_violation else 'SAFE'
-                                self.on_worker_status(worker_id, vehicle, verdict)
-                            
-                            del pending_futures[future]
-                            
-                            logger.debug(f"Checked car {vehicle.license_plate}: "
-                                       f"{'VIOLATION' if result.is_violation else 'SAFE'}")
-                            
-                        except Exception as e:
-                            logger.error(f"Error processing future: {e}")
-                            if future in pending_futures:
-                                del pending_futures[future]
-                
-                # If queue is empty and no pending work, batch is complete
-                if self.car_queue.empty() and not pending_futures and batch_vehicles:
-                    if self.on_batch_complete:
-                        self.on_batch_complete(batch_vehicles, self.violations_list[-len(batch_vehicles):])
-                    batch_vehicles = []
-                    batch_start_time = None
+                self._collect_done(pending_futures)
                 
                 time.sleep(0.01)  # Small sleep to prevent busy waiting
                 
@@ -188,14 +300,51 @@ class QueuedCarProcessor:
                 logger.error(f"Error in main processing loop: {e}")
                 time.sleep(0.1)
     
+    def _collect_done(self, pending_futures: Dict):
+        """Collect verdicts for every finished check"""
+        done_futures = [f for f in pending_futures if f.done()]
+        
+        for future in done_futures:
+            try:
+                result, worker_id = future.result()
+                _, vehicle, batch_id = pending_futures[future]
+                
+                # Clear worker status
+                self.worker_status[worker_id] = None
+                
+                # Emit verdict event
+                self._emit(EVENT_CAR_CHECKED, self.on_car_checked, result)
+                
+                # Emit worker status event
+                verdict = 'VIOLATION' if result.is_violation else 'SAFE'
+                self._emit(EVENT_WORKER_STATUS, self.on_worker_status,
+                           worker_id, vehicle, verdict)
+                
+                del pending_futures[future]
+                
+                # Counters were already recorded on the worker's shard
+                self._record_result(batch_id, result)
+                
+                logger.debug(f"Checked car {vehicle.license_plate}: "
+                           f"{'VIOLATION' if result.is_violation else 'SAFE'}")
+                
+            except Exception as e:
+                logger.error(f"Error processing future: {e}")
+                if future in pending_futures:
+                    _, _, batch_id = pending_futures.pop(future)
+                    self._record_result(batch_id, None)
+        
+        self.in_flight = len(pending_futures)
+    
     def _check_car(self, vehicle: Vehicle) -> CarCheckResult:
         """
         Check a single car for violations (runs in worker thread)
         Simulates sensor checking time
         """
         # Simulate sensor checking time (quick - 100-200ms)
+        # (interrupted immediately once a stop deadline has passed)
         check_time = 0.1 + (hash(vehicle.license_plate) % 100) / 1000
-        time.sleep(check_time)
+        self._stop_event.wait(check_time)
         
         # Check if violating speed limits
         is_speeding = vehicle.speed > Config.SPEED_LIMIT
@@ -257,17 +406,21 @@ class QueuedCarProcessor:
         Returns (CarCheckResult, worker_id)
         """
         result = self._check_car(vehicle)
+        
+        # Record on this worker thread's own shard (no shared lock)
+        fine = result.ticket.fine_amount if result.ticket else 0.0
+        self.stats.record_vehicle(vehicle.speed, result.is_violation, fine)
         return result, worker_id
     
     def get_stats(self) -> Dict:
-        """Get current processor statistics"""
-        with self.lock:
-            return {
-                'total_processed': self.total_processed,
-                'total_violations': self.total_violations,
-                'violation_rate': (self.total_violations / self.total_processed * 100 
-                                 if self.total_processed > 0 else 0),
-                'current_car': self.current_car,
-                'queue_size': self.car_queue.qsize(),
-                'num_workers': self.num_workers
-            }
+        """Get current processor statistics (merged snapshot of all shards)"""
+        totals = self.stats.merged()
+        return {
+            'total_processed': totals.vehicles,
+            'total_violations': totals.violations,
+            'violation_rate': totals.violation_rate,
+            'total_fines': totals.total_fines,
+            'current_car': self.current_car,
+            'queue_size': self.car_queue.qsize(),
+            'num_workers': self.num_workers
+        }
@@ -6,29 +6,42 @@ from typing import Callable
 from utils.generators import DataGenerator
 from utils.logger import logger
 from data_models.models import Vehicle
+from config import Config
 
 class TrafficSensor:
     """Simulates traffic sensor generating vehicle data"""
     
     def __init__(self, data_queue: queue.Queue, interval: int = 10, 
-                 car_processor=None):
+                 car_processor=None, recorder=None, bulk: bool = None, rng=None,
+                 fleet=None):
         """
         Args:
             data_queue: Queue to put generated vehicle data
             interval: Seconds between data generation batches
             car_processor: Optional QueuedCarProcessor for sequential processing
+            recorder: Optional TraceRecorder that logs every generated batch
+            bulk: Generate columnar VehicleBatch batches (default: Config.BULK_GENERATION)
+            rng: Optional RNGContext for reproducible generation
+            fleet: Optional Fleet; batches are then sightings of its registered vehicles
         """
         self.data_queue = data_queue
         self.interval = interval
         self.car_processor = car_processor
+        self.recorder = recorder
+        self.bulk = Config.BULK_GENERATION if bulk is None else bulk
+        self.rng = rng
+        self.fleet = fleet
+        self._stream = None  # DataGenerator.iter_vehicles, created on first batch
         self.is_running = False
         self.thread = None
+        self._stop_event = threading.Event()  # Wakes the interval sleep on stop
         self.vehicles_generated = 0
         self.on_batch_generated = None  # Callback when batch is generated
     
     def start(self):
         """Start the sensor simulation"""
         self.is_running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._run, daemon=True)
         self.thread.start()
         logger.info(f"Traffic sensor started (interval: {self.interval}s)")
@@ -36,6 +49,7 @@ class TrafficSensor:
     def stop(self):
         """Stop the sensor simulation"""
         self.is_running = False
+        self._stop_event.set()
         if self.thread:
             self.thread.join(timeout=2)
         logger.info("Traffic sensor stopped")
@@ -45,9 +59,13 @@ class TrafficSensor:
         while self.is_running:
             try:
                 # Generate a batch of vehicles
-                vehicles = DataGenerator.generate_vehicle_batch()
+                vehicles = self._generate_batch()
                 self.vehicles_generated += len(vehicles)
                 
+                # Record the workload before any stage mutates the vehicles
+                if self.recorder:
+                    self.recorder.record_batch(vehicles)
+                
                 # If using queue processor, add to it for sequential checking
                 if self.car_processor:
                     self.car_processor.add_vehicles(vehicles)
@@ -65,17 +83,26 @@ class TrafficSensor:
                 
                 logger.info(f"Generated {len(vehicles)} vehicles. Total: {self.vehicles_generated}")
                 
-                # Wait for next interval
-                time.sleep(self.interval)
+                # Wait for next interval (returns at once when stopped)
+                self._stop_event.wait(self.interval)
                 
             except Exception as e:
                 logger.error(f"Error in traffic sensor: {e}")
-                time.sleep(1)  # Prevent tight loop on error
+                self._stop_event.wait(1)  # Prevent tight loop on error
+    
+    def _generate_batch(self):
+        """Take the next batch (List[Vehicle] or, in bulk/fleet mode, a VehicleBatch)"""
+        if self._stream is None:
+            self._stream = DataGenerator.iter_vehicles(rng=self.rng, bulk=self.bulk, fleet=self.fleet)
+        return next(self._stream)
     
     def get_stats(self):
         """Get sensor statistics"""
-        return {
+        stats = {
             'vehicles_generated': self.vehicles_generated,
             'interval': self.interval,
             'is_running': self.is_running
         }
+        if self.fleet is not None:
+            stats['fleet'] = self.fleet.get_stats()
+        return stats
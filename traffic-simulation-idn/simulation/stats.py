@@ -0,0 +1,94 @@
+"""
+Lock-free per-thread statistics with merge-on-read
+Each thread that records statistics owns a private shard, so the hot path
+never takes a shared lock. A shard publishes its totals as an immutable
+snapshot (a single reference swap), which lets readers on other threads
+merge all shards into a consistent view whenever get_stats() is called.
+"""
+
+import threading
+from typing import List, NamedTuple
+
+
+class StatsSnapshot(NamedTuple):
+    """Immutable accumulator totals for one shard (or the merge of several)"""
+    vehicles: int = 0
+    violations: int = 0
+    total_fines: float = 0.0
+    speed_sum: float = 0.0
+    max_speed: float = 0.0
+
+    @property
+    def avg_speed(self) -> float:
+        """Average speed over every recorded vehicle"""
+        return self.speed_sum / self.vehicles if self.vehicles else 0.0
+
+    @property
+    def violation_rate(self) -> float:
+        """Violations as a percentage of recorded vehicles"""
+        return self.violations / self.vehicles * 100 if self.vehicles else 0.0
+
+
+class StatsShard:
+    """Statistics owned and written by exactly one thread"""
+
+    __slots__ = ('snapshot',)
+
+    def __init__(self):
+        self.snapshot = StatsSnapshot()
+
+    def record(self, vehicles: int, violations: int, total_fines: float,
+               speed_sum: float, max_speed: float) -> None:
+        """Add a batch of observations and publish the new totals"""
+        current = self.snapshot
+        self.snapshot = StatsSnapshot(
+            current.vehicles + vehicles,
+            current.violations + violations,
+            current.total_fines + total_fines,
+            current.speed_sum + speed_sum,
+            max(current.max_speed, max_speed),
+        )
+
+
+class ShardedStats:
+    """
+    Collection of per-thread StatsShards.
+    Writers only touch their own shard; readers merge every shard on demand.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[StatsShard] = []
+        self._register_lock = threading.Lock()  # Only taken once per thread
+
+    def shard(self) -> StatsShard:
+        """Get (or create) the calling thread's shard"""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = StatsShard()
+            with self._register_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def record_vehicle(self, speed: float, is_violation: bool, fine: float = 0.0) -> None:
+        """Record a single checked vehicle on the calling thread's shard"""
+        self.shard().record(1, 1 if is_violation else 0, fine, speed, speed)
+
+    def record_batch(self, vehicles: int, violations: int, total_fines: float,
+                     speed_sum: float, max_speed: float) -> None:
+        """Record pre-aggregated batch totals on the calling thread's shard"""
+        self.shard().record(vehicles, violations, total_fines, speed_sum, max_speed)
+
+    def merged(self) -> StatsSnapshot:
+        """Merge every shard's latest snapshot into one consistent view"""
+        vehicles = violations = 0
+        total_fines = speed_sum = max_speed = 0.0
+        for shard in list(self._shards):
+            snapshot = shard.snapshot
+            vehicles += snapshot.vehicles
+            violations += snapshot.violations
+            total_fines += snapshot.total_fines
+            speed_sum += snapshot.speed_sum
+            max_speed = max(max_speed, snapshot.max_speed)
+        return StatsSnapshot(vehicles, violations, total_fines, speed_sum, max_speed)
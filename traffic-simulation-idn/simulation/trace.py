@@ -0,0 +1,337 @@
+"""
+Workload trace recording and replay
+Captures every generated vehicle with its arrival time so a run can be
+reproduced exactly, then feeds the trace back into the pipeline at 1x, Nx
+or maximum speed without touching DataGenerator.
+
+Trace format (gzip-compressed JSON Lines, written with a fixed gzip mtime so
+identical workloads produce identical files):
+- Line 1: header {"format": "vehicle-trace", "version": 1, "fields": [...]}
+- Other lines: [arrival_us, batch_seq, <vehicle field values in header order>]
+
+Timestamps are stored as integer microseconds so every value round-trips
+exactly and replayed runs are bit-for-bit comparable across code versions.
+"""
+
+import gzip
+import io
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import fields
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from data_models.models import Vehicle
+from utils.logger import logger
+
+TRACE_FORMAT = "vehicle-trace"
+TRACE_VERSION = 1
+
+# Naive epoch used for exact datetime <-> integer microsecond conversion
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Vehicle fields in declaration order (timestamp is encoded as microseconds)
+VEHICLE_FIELDS = [f.name for f in fields(Vehicle)]
+
+
+def _datetime_to_us(value: datetime) -> int:
+    """Convert a naive datetime to integer microseconds since the epoch"""
+    return (value - _EPOCH) // _ONE_MICROSECOND
+
+
+def _us_to_datetime(value: int) -> datetime:
+    """Convert integer microseconds since the epoch back to a naive datetime"""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def encode_vehicle(vehicle: Vehicle) -> list:
+    """Encode a vehicle as a list of field values in VEHICLE_FIELDS order"""
+    row = []
+    for name in VEHICLE_FIELDS:
+        value = getattr(vehicle, name)
+        if name == 'timestamp':
+            value = _datetime_to_us(value)
+        row.append(value)
+    return row
+
+
+def decode_vehicle(row: list, field_names: List[str]) -> Vehicle:
+    """Rebuild a Vehicle from an encoded row (unknown fields are ignored)"""
+    values = {}
+    for name, value in zip(field_names, row):
+        if name not in VEHICLE_FIELDS:
+            continue
+        if name == 'timestamp':
+            value = _us_to_datetime(value)
+        values[name] = value
+    return Vehicle(**values)
+
+
+class TraceRecorder:
+    """Records every generated vehicle and its arrival time to a trace file"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Output trace file (gzip-compressed JSON Lines)
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.batches_recorded = 0
+        self.vehicles_recorded = 0
+        self._start = time.monotonic()
+
+        self._handle = open(path, 'wb')
+        raw = gzip.GzipFile(filename='', fileobj=self._handle, mode='wb', mtime=0)
+        self._file = io.TextIOWrapper(raw, encoding='utf-8', newline='\n')
+        self._write({
+            'format': TRACE_FORMAT,
+            'version': TRACE_VERSION,
+            'fields': VEHICLE_FIELDS,
+        })
+        logger.info(f"Recording workload trace to {path}")
+
+    def _write(self, obj) -> None:
+        self._file.write(json.dumps(obj, separators=(',', ':'), ensure_ascii=False))
+        self._file.write('\n')
+
+    def record_batch(self, vehicles: List[Vehicle], arrival: Optional[float] = None) -> None:
+        """
+        Record a batch of vehicles arriving together
+
+        Args:
+            vehicles: Vehicles in the order they were generated
+            arrival: Arrival offset in seconds since recording started
+                     (defaults to the current time)
+        """
+        if arrival is None:
+            arrival = time.monotonic() - self._start
+        arrival_us = int(round(arrival * 1_000_000))
+
+        with self.lock:
+            if self._file is None:
+                return
+            for vehicle in vehicles:
+                self._write([arrival_us, self.batches_recorded] + encode_vehicle(vehicle))
+            self.batches_recorded += 1
+            self.vehicles_recorded += len(vehicles)
+
+    def close(self) -> None:
+        """Flush and close the trace file"""
+        with self.lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._handle.close()
+            self._file = None
+        logger.info(
+            f"Trace closed: {self.vehicles_recorded} vehicles in "
+            f"{self.batches_recorded} batches ({self.path})"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_trace_batches(path: str) -> Iterator[Tuple[float, List[Vehicle]]]:
+    """
+    Read a trace file batch by batch
+
+    Yields:
+        (arrival_seconds, vehicles) for each recorded batch, in order
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get('format') != TRACE_FORMAT:
+            raise ValueError(f"Not a vehicle trace file: {path}")
+        if header.get('version', 0) > TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {header.get('version')}: {path}")
+        field_names = header['fields']
+
+        current_seq = None
+        current_arrival = 0
+        batch = []
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            arrival_us, batch_seq, values = row[0], row[1], row[2:]
+            if batch_seq != current_seq and batch:
+                yield current_arrival / 1_000_000, batch
+                batch = []
+            current_seq = batch_seq
+            current_arrival = arrival_us
+            batch.append(decode_vehicle(values, field_names))
+
+        if batch:
+            yield current_arrival / 1_000_000, batch
+
+
+def record_stream(path: str, chunks: Iterable, limit: Optional[int] = None) -> int:
+    """
+    Build a trace dataset from a vehicle stream (e.g. DataGenerator.iter_vehicles)
+
+    Chunks are pulled one at a time and written as they arrive, so memory stays
+    bounded by one chunk regardless of the dataset size. With a limit the last
+    chunk is cut so exactly `limit` vehicles are recorded.
+
+    Returns:
+        Number of vehicles recorded
+    """
+    with TraceRecorder(path) as recorder:
+        for vehicles in chunks:
+            if limit is not None:
+                remaining = limit - recorder.vehicles_recorded
+                if remaining <= 0:
+                    break
+                if len(vehicles) > remaining:
+                    vehicles = list(islice(vehicles, remaining))
+            recorder.record_batch(vehicles)
+        return recorder.vehicles_recorded
+
+
+def load_trace(path: str) -> List[Tuple[float, List[Vehicle]]]:
+    """Load a whole trace into memory"""
+    return list(iter_trace_batches(path))
+
+
+def persist_batches(path: str, batches: List[List[Vehicle]]) -> None:
+    """Save undrained batches at shutdown so the next run can pick them up"""
+    with TraceRecorder(path) as recorder:
+        for vehicles in batches:
+            recorder.record_batch(vehicles, arrival=0.0)
+
+
+def restore_batches(path: str) -> List[List[Vehicle]]:
+    """Load batches saved by persist_batches and remove the file"""
+    if not os.path.exists(path):
+        return []
+    try:
+        batches = [vehicles for _, vehicles in iter_trace_batches(path)]
+    except (OSError, ValueError) as e:
+        logger.error(f"Error restoring pending batches from {path}: {e}")
+        return []
+    os.remove(path)
+    return batches
+
+
+class TraceReplayer:
+    """
+    Replays a recorded trace into the pipeline in place of TrafficSensor.
+    Batches go to the QueuedCarProcessor and/or the SpeedAnalyzer data queue
+    exactly as the sensor would deliver them, bypassing DataGenerator.
+    """
+
+    def __init__(self, trace_path: str, data_queue: queue.Queue = None,
+                 car_processor=None, speed: float = 1.0):
+        """
+        Args:
+            trace_path: Trace file written by TraceRecorder
+            data_queue: Optional SpeedAnalyzer queue to feed
+            car_processor: Optional QueuedCarProcessor to feed
+            speed: Replay speed factor (1.0 = real time, N = N times faster,
+                   0 or None = as fast as possible)
+        """
+        self.trace_path = trace_path
+        self.data_queue = data_queue
+        self.car_processor = car_processor
+        self.speed = speed
+        self.is_running = False
+        self.finished = threading.Event()
+        self.thread = None
+        self.vehicles_generated = 0
+        self.batches_replayed = 0
+        self.on_batch_generated = None  # Same callback as TrafficSensor
+        self.on_replay_complete = None  # Called once the trace is exhausted
+
+    def start(self):
+        """Start replaying in a background thread"""
+        self.is_running = True
+        self.finished.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        speed_note = "max speed" if not self.speed else f"{self.speed}x"
+        logger.info(f"Trace replay started ({self.trace_path}, {speed_note})")
+
+    def stop(self):
+        """Stop replaying"""
+        self.is_running = False
+        if self.thread:
+            self.thread.join(timeout=2)
+        logger.info("Trace replay stopped")
+
+    def run(self):
+        """Replay the whole trace synchronously in the calling thread"""
+        self.is_running = True
+        self.finished.clear()
+        self._run()
+
+    def _sleep_until(self, target: float):
+        """Sleep until the monotonic target time while staying stoppable"""
+        while self.is_running:
+            remaining = target - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 0.5))
+
+    def _run(self):
+        """Main replay loop"""
+        started = time.monotonic()
+        try:
+            for arrival, vehicles in iter_trace_batches(self.trace_path):
+                if not self.is_running:
+                    break
+
+                if self.speed:
+                    self._sleep_until(started + arrival / self.speed)
+                    if not self.is_running:
+                        break
+
+                self._deliver(vehicles)
+        except Exception as e:
+            logger.error(f"Error replaying trace: {e}")
+        finally:
+            self.is_running = False
+            self.finished.set()
+
+        logger.info(
+            f"Trace replay finished: {self.vehicles_generated} vehicles in "
+            f"{self.batches_replayed} batches"
+        )
+        if self.on_replay_complete:
+            self.on_replay_complete()
+
+    def _deliver(self, vehicles: List[Vehicle]):
+        """Hand one batch to the pipeline the same way TrafficSensor does"""
+        self.vehicles_generated += len(vehicles)
+        self.batches_replayed += 1
+
+        if self.car_processor:
+            self.car_processor.add_vehicles(vehicles)
+
+        if self.data_queue is not None:
+            self.data_queue.put({
+                'timestamp': datetime.now(),
+                'vehicles': vehicles,
+                'batch_size': len(vehicles)
+            })
+
+        if self.on_batch_generated:
+            self.on_batch_generated(vehicles)
+
+    def get_stats(self):
+        """Get replay statistics (same keys as TrafficSensor.get_stats)"""
+        return {
+            'vehicles_generated': self.vehicles_generated,
+            'batches_replayed': self.batches_replayed,
+            'interval': 0,
+            'is_running': self.is_running
+        }
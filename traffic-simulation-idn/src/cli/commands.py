@@ -1,9 +1,35 @@
 """Stub implementation for CLI commands"""
 
 import argparse
+import sys
+from pathlib import Path
 
 
-def main():
+def run_simulate(args):
+    """Build a synthetic dataset of args.vehicles vehicles in parallel"""
+    # Simulation modules live at the project root, next to src/
+    root = str(Path(__file__).resolve().parents[2])
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    from simulation.dataset import build_dataset
+    
+    summary = build_dataset(
+        args.vehicles,
+        args.output,
+        workers=args.workers,
+        seed=args.seed,
+        shard_size=args.shard_size,
+        fleet_size=args.fleet_size,
+        owners=not args.no_owners,
+    )
+    print(f"Generated {summary['vehicles']:,} vehicles and {summary['tickets']:,} tickets "
+          f"in {summary['shards']} shards -> {args.output}")
+    print(f"Elapsed: {summary['seconds']:.1f}s "
+          f"({summary['vehicles_per_second']:,.0f} vehicles/s)")
+    return summary
+
+
+def main(argv=None):
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
         description="Traffic Simulation Indonesia - CLI Interface"
@@ -12,19 +38,26 @@ def main():
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
     # Simulate command
-    simulate_parser = subparsers.add_parser("simulate", help="Run simulation")
-    simulate_parser.add_argument("--duration", type=int, help="Duration in seconds")
-    simulate_parser.add_argument("--vehicles", type=int, help="Number of vehicles")
+    simulate_parser = subparsers.add_parser("simulate", help="Generate a synthetic dataset")
+    simulate_parser.add_argument("--duration", type=int, help="Duration in seconds (unused)")
+    simulate_parser.add_argument("--vehicles", type=int, default=100000, help="Number of vehicles")
+    simulate_parser.add_argument("--output", default="dataset", help="Output directory")
+    simulate_parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    simulate_parser.add_argument("--seed", type=int, help="Root seed for a reproducible dataset")
+    simulate_parser.add_argument("--shard-size", type=int, default=1_000_000, help="Vehicles per shard")
+    simulate_parser.add_argument("--fleet-size", type=int, help="Draw sightings from a registered fleet")
+    simulate_parser.add_argument("--no-owners", action="store_true",
+                                 help="Skip owner generation (empty owner fields, no STNK/SIM penalties)")
     
     # Report command
     report_parser = subparsers.add_parser("report", help="Generate report")
     report_parser.add_argument("--type", help="Report type")
     report_parser.add_argument("--format", help="Export format")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     if args.command == "simulate":
-        print(f"Running simulation with {args.vehicles} vehicles for {args.duration} seconds")
+        run_simulate(args)
     elif args.command == "report":
         print(f"Generating {args.type} report in {args.format} format")
     else:
@@ -0,0 +1,55 @@
+"""
+Tests for memoized administrative code resolution
+"""
+
+import random
+
+from utils import indonesian_plates
+from utils.indonesian_plates import IndonesianPlateManager, VehicleOwner, warm_admin_code_cache
+
+
+class TestAdminCodeCache:
+    """PLATE_DATA regions resolve from a warmed, persisted table"""
+
+    def setup_method(self):
+        VehicleOwner._ADMIN_CODE_MEMO.clear()
+        IndonesianPlateManager._KABUPATEN_CODE_MEMO.clear()
+
+    def test_warm_fills_memos(self, tmp_path):
+        assert warm_admin_code_cache(cache_dir=tmp_path) > 500
+        assert VehicleOwner._ADMIN_CODE_MEMO[('Aceh', 'Aceh Selatan')] == \
+            VehicleOwner._resolve_admin_codes('Aceh', 'Aceh Selatan')
+        assert IndonesianPlateManager._KABUPATEN_CODE_MEMO['Jakarta Selatan'] == '31.74'
+        assert list(tmp_path.glob('admin-codes-*.pickle'))
+
+    def test_second_warm_loads_from_disk(self, tmp_path, monkeypatch):
+        warm_admin_code_cache(cache_dir=tmp_path)
+        expected = dict(VehicleOwner._ADMIN_CODE_MEMO)
+        self.setup_method()
+
+        def fail(*args):
+            raise AssertionError("resolved again")
+        monkeypatch.setattr(VehicleOwner, '_resolve_admin_codes', staticmethod(fail))
+        warm_admin_code_cache(cache_dir=tmp_path)
+        assert VehicleOwner._ADMIN_CODE_MEMO == expected
+
+        # Owner generation for a warmed region is a table lookup
+        owner = VehicleOwner.generate_random_owner('Aceh', 'Aceh Selatan', required_province_code='11',
+                                                   rng=random.Random(4))
+        district, subdistrict = expected[('Aceh', 'Aceh Selatan')]
+        assert owner.owner_id[:6] == '11' + district.split('.')[1] + subdistrict.split('.')[2]
+
+    def test_changed_regions_rebuild_in_place(self, tmp_path, monkeypatch):
+        warm_admin_code_cache(cache_dir=tmp_path)
+        monkeypatch.setattr(indonesian_plates, 'ADMIN_CODE_CACHE_VERSION', -1)
+        builds = []
+        resolve = VehicleOwner._resolve_admin_codes
+        monkeypatch.setattr(VehicleOwner, '_resolve_admin_codes',
+                            staticmethod(lambda *pair: builds.append(pair) or resolve(*pair)))
+        warm_admin_code_cache(cache_dir=tmp_path)
+        assert builds
+        assert len(list(tmp_path.glob('admin-codes-*.pickle'))) == 1
+
+    def test_unwarmed_regions_are_memoized_on_use(self):
+        VehicleOwner._extract_administrative_codes('Zzz', 'Qq', random.Random(1))
+        assert ('Zzz', 'Qq') in VehicleOwner._ADMIN_CODE_MEMO
@@ -0,0 +1,68 @@
+"""
+Tests for the base.csv administrative name index
+"""
+
+from utils.admin_index import AdminNameIndex, KabupatenIndex, strip_admin_prefixes
+from utils.indonesian_plates import IndonesianPlateManager, VehicleOwner
+
+
+def _first_containing(entries, text):
+    return next((i for i, (name, _) in enumerate(entries) if text in name), None)
+
+
+class TestAdminNameIndex:
+    """Indexed lookups return the same entry as a linear scan"""
+
+    ENTRIES = [('KAB. BANDUNG BARAT', '32.17'), ('KOTA BANDUNG', '32.73'),
+               ('KAB. BOGOR', '32.01'), ('BOGOR', '32.99'), ('KOTA ADM. JAKARTA SELATAN', '31.74')]
+
+    def test_matches_linear_scan(self):
+        index = AdminNameIndex(self.ENTRIES)
+        for text in ['BANDUNG', 'KOTA BANDUNG', 'BOGOR', 'JAKARTA', 'SELATAN', 'KOTA',
+                     'A', 'KA', '', 'SURABAYA', 'NDUNG BARAT']:
+            assert index.first_containing(text) == _first_containing(self.ENTRIES, text), text
+
+    def test_any_word_and_codes(self):
+        index = AdminNameIndex(self.ENTRIES)
+        assert index.code_containing_any(['SURABAYA', 'BOGOR']) == '32.01'
+        assert index.code_containing_any(['JAKARTA', 'BARAT']) == '32.17'
+        assert index.code_containing_any(['MEDAN']) is None
+        assert index.code_containing('MEDAN') is None
+
+    def test_owner_codes_from_base_csv(self):
+        districts, subdistricts = VehicleOwner._load_admin_indexes()
+        assert len(districts) > 500 and len(subdistricts) > 3000
+        district, subdistrict = VehicleOwner._resolve_admin_codes('DKI Jakarta', 'Jakarta Selatan')
+        assert district == districts.code_containing('JAKARTA SELATAN') == '31.74'
+        # No kecamatan in 31.74 is named anything like "Jakarta Selatan"
+        assert subdistrict is None
+
+
+class TestKabupatenIndex:
+    """Kabupaten/kota lookups for IndonesianPlateManager"""
+
+    ENTRIES = [('KAB. BANDUNG BARAT', '32.17'), ('KAB. BANDUNG', '32.04'), ('KOTA BANDUNG', '32.73'),
+               ('KOTA ADM. JAKARTA SELATAN', '31.74'), ('KAB. TANGERANG', '36.03')]
+
+    def test_prefix_stripping(self):
+        assert strip_admin_prefixes('KOTA ADM. JAKARTA SELATAN') == 'JAKARTA SELATAN'
+        assert strip_admin_prefixes('KABUPATEN TANGERANG') == 'TANGERANG'
+
+    def test_first_match_wins(self):
+        index = KabupatenIndex(self.ENTRIES)
+        assert index.lookup('Jakarta Selatan') == '31.74'
+        assert index.lookup('Kabupaten Tangerang') == '36.03'
+        # All words of "Bandung" already match the first BANDUNG entry
+        assert index.lookup('Kota Bandung') == '32.17'
+        assert index.lookup('Surabaya') is None
+
+    def test_region_codes_without_file_io(self, monkeypatch):
+        IndonesianPlateManager._load_kabupaten_index()
+
+        def no_file_io(*args, **kwargs):
+            raise AssertionError("file I/O")
+
+        monkeypatch.setattr('builtins.open', no_file_io)
+        codes = IndonesianPlateManager._get_csv_codes_for_region('Jakarta Selatan')
+        assert codes['city'] == '74' and codes['full'].startswith('31.74.')
+        assert IndonesianPlateManager._get_csv_codes_for_region('') is None
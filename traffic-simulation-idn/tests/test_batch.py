@@ -0,0 +1,98 @@
+"""
+Tests for bulk vehicle generation and columnar batches
+"""
+
+import numpy as np
+
+from utils.generators import DataGenerator
+from data_models.batch import CATEGORY_BARANG, CATEGORY_PEMERINTAH, CATEGORY_KEDUTAAN
+
+
+class TestBulkGenerator:
+    """generate_vehicle_batch_bulk keeps the per-vehicle distributions"""
+
+    def test_category_and_speed_distribution(self):
+        batch = DataGenerator.generate_vehicle_batch_bulk(200_000, rng=np.random.default_rng(7),
+                                                          resolve_owners=False)
+        shares = np.bincount(batch.categories, minlength=4) / len(batch)
+        assert np.allclose(shares, [0.75, 0.15, 0.05, 0.05], atol=0.01)
+
+        speeds = batch.speeds
+        assert speeds.min() >= 20 and speeds.max() <= 120
+        assert abs((speeds < 60).mean() - 0.16) < 0.02
+        assert np.array_equal(speeds, np.round(speeds, 1))
+
+    def test_rows_match_plate_formats(self):
+        batch = DataGenerator.generate_vehicle_batch_bulk(2000, rng=np.random.default_rng(1),
+                                                          resolve_owners=False)
+        for i, vehicle in enumerate(batch.to_vehicles()):
+            category = batch.categories[i]
+            if category == CATEGORY_PEMERINTAH:
+                assert vehicle.license_plate.startswith('RI ')
+                assert vehicle.plate_color == 'RED'
+            elif category == CATEGORY_KEDUTAAN:
+                assert vehicle.license_plate[:3] in ('CD ', 'CC ')
+            elif category == CATEGORY_BARANG:
+                assert '(TRUK-' in vehicle.license_plate
+                assert vehicle.plate_color == 'YELLOW'
+            assert vehicle.license_plate == batch.plates[i]
+            assert vehicle.timestamp == batch.timestamp
+
+    def test_same_seed_same_batch(self):
+        a = DataGenerator.generate_vehicle_batch_bulk(500, rng=np.random.default_rng(3), resolve_owners=False)
+        b = DataGenerator.generate_vehicle_batch_bulk(500, rng=np.random.default_rng(3), resolve_owners=False)
+        assert a.plates == b.plates
+        assert np.array_equal(a.speeds, b.speeds)
+
+
+class TestColumnarPipeline:
+    """VehicleBatch moves through verdict, stats and storage without Vehicle objects"""
+
+    def make_batch(self, n=3000, seed=5):
+        return DataGenerator.generate_vehicle_batch_bulk(n, rng=np.random.default_rng(seed),
+                                                         resolve_owners=False)
+
+    def test_vectorized_verdict_matches_calculate_fine(self):
+        batch = self.make_batch()
+        rng = np.random.default_rng(0)
+        batch.columns['stnk_active'][:] = rng.random(len(batch)) < 0.8
+        batch.columns['sim_active'][:] = rng.random(len(batch)) < 0.8
+        violations = batch.apply_verdicts()
+
+        for i in range(len(batch)):
+            speed = float(batch.speeds[i])
+            stnk = 'Active' if batch.columns['stnk_active'][i] else 'Non-Active'
+            sim = 'Active' if batch.columns['sim_active'][i] else 'Expired'
+            expected = speed > 100 or speed < 60
+            assert violations[i] == expected
+            if expected:
+                _, _, total, _ = DataGenerator.calculate_fine(speed, stnk, sim)
+                assert abs(batch.fines[i] - total) < 1e-9
+
+    def test_views_write_through(self):
+        batch = self.make_batch(10)
+        view = batch[2]
+        view.ticket_issued = True
+        view.fine_amount = 12.5
+        assert batch.violations[2] and batch.fines[2] == 12.5
+        assert batch.row(2).fine_amount == 12.5
+
+    def test_analyzer_and_storage_accept_batches(self, tmp_path):
+        import queue
+        from simulation.analyzer import SpeedAnalyzer
+
+        analyzer = SpeedAnalyzer(queue.Queue(), pending_file=str(tmp_path / "pending.trace.gz"))
+        analyzer.storage.traffic_file = str(tmp_path / "traffic.json")
+        (tmp_path / "traffic.json").write_text("[]")
+
+        batch = self.make_batch(500)
+        tickets = analyzer._process_batch(batch)
+        analyzer._update_stats(tickets, batch)
+        analyzer.storage.save_vehicles(batch)
+
+        stats = analyzer.get_stats()
+        assert stats['total_processed'] == 500
+        assert stats['speeding_processed'] == len(tickets) == int(batch.violations.sum())
+        saved = analyzer.storage.get_all_vehicles()
+        assert [v['license_plate'] for v in saved] == batch.plates
+        assert [v['ticket_issued'] for v in saved] == batch.violations.tolist()
@@ -0,0 +1,63 @@
+"""
+Tests for batch owner resolution
+"""
+
+import random
+import threading
+
+from utils.indonesian_plates import OwnerDatabase
+from utils.rng import RNGContext
+
+
+class TestBatchOwners:
+    """OwnerDatabase.get_or_create_owners resolves a whole batch at once"""
+
+    def test_duplicates_share_one_owner(self):
+        db = OwnerDatabase()
+        plates = ['B 1234 ABC', 'D 5678 XY', 'B 1234 ABC']
+        owners = db.get_or_create_owners(plates, 'roda_empat', rng=random.Random(1))
+        assert owners[0] is owners[2] and owners[0] is not owners[1]
+        assert len(db.owners) == 2
+
+    def test_existing_owners_reused(self):
+        db = OwnerDatabase()
+        existing = db.get_or_create_owner('B 1234 ABC', 'roda_empat', rng=random.Random(1))
+        owners = db.get_or_create_owners(['B 1234 ABC', 'AB 12 CD'], rng=RNGContext(3))
+        assert owners[0] is existing
+        assert db.get_owner('AB 12 CD') is owners[1]
+
+    def test_nik_follows_plate_region(self):
+        db = OwnerDatabase()
+        owners = db.get_or_create_owners(['B 1234 ABC', 'RI 1 00', 'CD 12 345'], rng=random.Random(2))
+        niks = [owner.owner_id for owner in owners]
+        assert niks[0].startswith('31')
+        assert niks[1].startswith('000000') and niks[2].startswith('990000')
+        assert all(len(nik) == 16 and nik.isdigit() for nik in niks)
+
+    def test_special_categories_independent(self):
+        db = OwnerDatabase()
+        owners = db.get_or_create_owners(['B 1111 AA', 'B 2222 BB'], 'roda_empat',
+                                         ['PEMERINTAH', 'KEDUTAAN'], rng=random.Random(4))
+        assert [owner.region for owner in owners] == ['Pemerintah Indonesia', 'Diplomatik']
+        assert all(1 <= int(owner.owner_id[:2]) <= 34 for owner in owners)
+
+    def test_reproducible_per_seed(self):
+        plates = [f"B {n} XYZ" for n in range(1, 50)]
+        first = OwnerDatabase().get_or_create_owners(plates, rng=RNGContext(9))
+        second = OwnerDatabase().get_or_create_owners(plates, rng=RNGContext(9))
+        assert [(o.owner_id, o.name) for o in first] == [(o.owner_id, o.name) for o in second]
+
+    def test_lazy_resolution_thread_safe(self, monkeypatch):
+        from utils import generators
+        db = OwnerDatabase()
+        monkeypatch.setattr(generators, 'owner_db', db)
+        batch = generators.DataGenerator.generate_vehicle_batch_bulk(400, RNGContext(5))
+        rows = list(range(len(batch)))
+        threads = [threading.Thread(target=lambda: [batch.owner(i) for i in rows]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for i in rows:
+            assert batch.owner(i) is db.get_owner(batch.plate(i))
+        assert len(batch.owners) == len(rows)
@@ -0,0 +1,48 @@
+"""
+Tests for vectorized bulk owner generation
+"""
+
+from datetime import datetime
+
+from utils.indonesian_plates import VehicleOwner
+from utils.rng import RNGContext
+
+
+class TestBulkOwners:
+    """VehicleOwner.generate_owners_bulk builds valid owners in one pass"""
+
+    def test_nik_format_and_codes(self):
+        specs = [('DKI Jakarta', 'Jakarta Selatan', '31', '74', '05'),
+                 ('Diplomatik', 'Diplomatik', '99', '00', '00'),
+                 ('Pemerintah Indonesia', 'Pemerintah Indonesia', None, None, None)] * 200
+        owners = VehicleOwner.generate_owners_bulk(specs, 'roda_empat', rng=RNGContext(5))
+        assert len(owners) == len(specs)
+        for spec, owner in zip(specs, owners):
+            nik = owner.owner_id
+            assert len(nik) == 16 and nik.isdigit()
+            assert 1 <= int(nik[6:8]) <= 28 or 41 <= int(nik[6:8]) <= 68
+            assert 1 <= int(nik[8:10]) <= 12 and 50 <= int(nik[10:12]) <= 99
+            assert int(nik[12:]) >= 1
+            if spec[2] is None:
+                assert 1 <= int(nik[:2]) <= 34
+            else:
+                assert nik[:6] == spec[2] + spec[3] + spec[4]
+            assert owner.region == spec[0] and owner.vehicle_type == 'roda_empat'
+
+    def test_dates_follow_status(self):
+        now = datetime(2026, 1, 1)
+        owners = VehicleOwner.generate_owners_bulk([('Bali', 'Denpasar', '51', None, None)] * 500,
+                                                   rng=RNGContext(2), now=now)
+        for owner in owners:
+            assert (owner.stnk_expiry > now) == owner.stnk_status
+            assert (owner.sim_expiry > now) == owner.sim_status
+            assert owner.registration_date < now
+        active = sum(owner.stnk_status for owner in owners) / len(owners)
+        assert 0.6 < active < 0.8
+
+    def test_reproducible(self):
+        specs = [('Jawa Barat', 'Bandung', '32', '73', None)] * 20
+        first = VehicleOwner.generate_owners_bulk(specs, rng=RNGContext(9))
+        second = VehicleOwner.generate_owners_bulk(specs, rng=RNGContext(9))
+        assert [o.owner_id for o in first] == [o.owner_id for o in second]
+        assert [o.name for o in first] == [o.name for o in second]
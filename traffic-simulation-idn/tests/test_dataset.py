@@ -0,0 +1,78 @@
+"""
+Tests for the parallel synthetic dataset builder
+"""
+
+import json
+from datetime import datetime
+
+from simulation import dataset
+from simulation.dataset import build_dataset
+from utils.generators import DataGenerator
+from utils.rng import RNGContext
+
+
+def _plates(output_dir, shards):
+    plates = []
+    for shard in range(shards):
+        with open(output_dir / f"vehicles-{shard:05d}.json") as f:
+            plates.extend(record['license_plate'] for record in json.load(f))
+    return plates
+
+
+class TestDatasetBuilder:
+    """Sharded, seeded dataset generation"""
+
+    def test_builds_sharded_files(self, tmp_path):
+        summary = build_dataset(250, str(tmp_path), workers=2, seed=3, shard_size=100, owners=False)
+        assert summary['vehicles'] == 250 and summary['shards'] == 3
+        assert len(_plates(tmp_path, 3)) == 250
+
+        tickets = 0
+        for shard in range(3):
+            with open(tmp_path / f"tickets-{shard:05d}.json") as f:
+                tickets += len(json.load(f))
+        assert tickets == summary['tickets']
+
+        with open(tmp_path / "manifest.json") as f:
+            assert json.load(f)['seed_entropy'] == 3
+        with open(tmp_path / "statistics.csv") as f:
+            assert len(f.read().splitlines()) == 4
+
+    def test_output_independent_of_worker_count(self, tmp_path):
+        build_dataset(120, str(tmp_path / "one"), workers=1, seed=8, shard_size=50)
+        build_dataset(120, str(tmp_path / "two"), workers=2, seed=8, shard_size=50)
+        names = [f"{kind}-{shard:05d}.json" for kind in ('vehicles', 'tickets') for shard in range(3)]
+        for name in names + ["statistics.csv"]:
+            assert (tmp_path / "one" / name).read_bytes() == (tmp_path / "two" / name).read_bytes(), name
+
+    def test_synthetic_clock(self, tmp_path):
+        build_dataset(30, str(tmp_path), workers=1, seed=2, shard_size=20, owners=False,
+                      epoch=datetime(2024, 6, 1))
+        with open(tmp_path / "vehicles-00001.json") as f:
+            assert json.load(f)[0]['timestamp'] == '2024-06-01T00:00:02'
+        with open(tmp_path / "manifest.json") as f:
+            assert json.load(f)['epoch'] == '2024-06-01T00:00:00'
+
+    def test_owner_records_resolved(self, tmp_path):
+        build_dataset(10, str(tmp_path), workers=1, seed=1, shard_size=10)
+        with open(tmp_path / "vehicles-00000.json") as f:
+            assert all(record['owner']['id'] for record in json.load(f))
+
+    def test_plate_keeps_owner_across_chunks(self, tmp_path, monkeypatch):
+        # Every chunk draws the same plates; their owners must not be recreated
+        original = DataGenerator.generate_vehicle_batch_bulk
+
+        def same_plates(size, rng=None):
+            batch = original(size, RNGContext(4))
+            batch.owner_rng = rng.random  # New owners still come from the shard's stream
+            return batch
+
+        monkeypatch.setattr(dataset, 'CHUNK_SIZE', 5)
+        monkeypatch.setattr(DataGenerator, 'generate_vehicle_batch_bulk', staticmethod(same_plates))
+        build_dataset(15, str(tmp_path), workers=1, seed=1, shard_size=15)
+        with open(tmp_path / "vehicles-00000.json") as f:
+            records = json.load(f)
+        owners = {}
+        for record in records:
+            owners.setdefault(record['license_plate'], set()).add(record['owner']['id'])
+        assert len(owners) <= 5 and all(len(ids) == 1 for ids in owners.values())
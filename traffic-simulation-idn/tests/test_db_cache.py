@@ -0,0 +1,50 @@
+"""
+Tests for lazy, cached vehicle database loading
+"""
+
+import os
+
+from utils.car_database import CarDatabase
+from utils.db_cache import LazyDatabase, load_cached
+
+
+class TestDatabaseCache:
+    """Parsed databases are reused until the source changes"""
+
+    def test_cache_hit_and_invalidation(self, tmp_path):
+        source = tmp_path / "models.csv"
+        source.write_text("1,CB150R\n")
+        builds = []
+
+        def build():
+            builds.append(1)
+            return source.read_text().splitlines()
+
+        assert load_cached(source, 'test', build, cache_dir=tmp_path) == ['1,CB150R']
+        assert load_cached(source, 'test', build, cache_dir=tmp_path) == ['1,CB150R']
+        assert len(builds) == 1
+
+        # Touched but identical content still hits (hash check)
+        os.utime(source, ns=(0, 0))
+        assert load_cached(source, 'test', build, cache_dir=tmp_path) == ['1,CB150R']
+        assert len(builds) == 1
+
+        source.write_text("1,CB150R\n3,NMAX\n")
+        assert load_cached(source, 'test', build, cache_dir=tmp_path) == ['1,CB150R', '3,NMAX']
+        assert len(builds) == 2
+
+    def test_cached_cars_match_fresh_parse(self):
+        fresh = CarDatabase("CARS.md", use_cache=False)
+        cached = CarDatabase("CARS.md")
+        assert cached.vehicles == fresh.vehicles
+        assert cached.manufacturers == fresh.manufacturers
+
+    def test_lazy_database_builds_once_on_access(self):
+        calls = []
+
+        class Holder:
+            db = LazyDatabase(lambda: calls.append(1) or object())
+
+        assert calls == []
+        assert Holder.db is Holder.db
+        assert calls == [1]
@@ -0,0 +1,72 @@
+"""
+Tests for the batched pipeline event bus
+"""
+
+import threading
+import time
+
+from simulation.events import EventBus, DROP_NEWEST, DROP_OLDEST, Subscription, PipelineEvent
+
+
+class TestEventBus:
+    """Events are delivered in batches on dispatcher threads"""
+
+    def test_batches_by_count_and_filters_kinds(self):
+        bus = EventBus()
+        received = []
+        threads = set()
+
+        def handler(events):
+            threads.add(threading.get_ident())
+            received.append([e.payload[0] for e in events])
+
+        bus.subscribe('counter', handler, kinds=['tick'], max_batch=5, max_delay=5.0)
+        bus.start()
+        for i in range(10):
+            bus.publish('tick', i)
+            bus.publish('ignored', i)
+        time.sleep(0.2)
+        bus.stop()
+
+        assert received == [[0, 1, 2, 3, 4], [5, 6, 7, 8, 9]]
+        assert threading.get_ident() not in threads
+
+    def test_flushes_partial_batch_after_delay(self):
+        bus = EventBus()
+        received = []
+        bus.subscribe('slow', lambda events: received.extend(events), max_batch=100, max_delay=0.05)
+        bus.start()
+        bus.publish('tick', 1)
+        time.sleep(0.3)
+        assert len(received) == 1
+        bus.stop()
+
+    def test_stop_delivers_remaining_events(self):
+        bus = EventBus()
+        received = []
+        bus.subscribe('late', lambda events: received.extend(events), max_batch=1000, max_delay=60)
+        bus.start()
+        for i in range(3):
+            bus.publish('tick', i)
+        bus.stop()
+        assert len(received) == 3
+
+
+class TestDropPolicy:
+    """Full subscriber queues drop events instead of blocking publishers"""
+
+    def _fill(self, policy):
+        sub = Subscription('full', lambda events: None, max_queue=3, drop_policy=policy)
+        for i in range(5):
+            sub.offer(PipelineEvent('tick', (i,), 0.0))
+        return sub
+
+    def test_drop_oldest_keeps_latest(self):
+        sub = self._fill(DROP_OLDEST)
+        assert [e.payload[0] for e in sub.events] == [2, 3, 4]
+        assert sub.dropped == 2
+
+    def test_drop_newest_keeps_earliest(self):
+        sub = self._fill(DROP_NEWEST)
+        assert [e.payload[0] for e in sub.events] == [0, 1, 2]
+        assert sub.dropped == 2
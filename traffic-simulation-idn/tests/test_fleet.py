@@ -0,0 +1,41 @@
+"""
+Tests for the registered-fleet population model
+"""
+
+import numpy as np
+
+from utils.fleet import Fleet
+from utils.indonesian_plates import OwnerDatabase
+from utils.rng import RNGContext
+
+
+class TestFleet:
+    """Sightings come from a fixed population with skewed popularity"""
+
+    def test_sightings_repeat_and_bound_owner_db(self):
+        owners = OwnerDatabase()
+        fleet = Fleet(200, rng=RNGContext(5), owner_db=owners)
+        population = set(fleet.population.plates)
+
+        for _ in range(10):
+            batch = fleet.sighting_batch(100)
+            batch.resolve_owners()
+            assert set(batch.plates) <= population
+
+        stats = fleet.get_stats()
+        assert stats['sightings'] == 1000
+        assert stats['distinct_seen'] <= 200
+        assert stats['repeat_rate'] > 75
+        assert len(owners.owners) <= 200
+
+    def test_popularity_is_zipf_like(self):
+        fleet = Fleet(1000, zipf_exponent=1.1, rng=np.random.default_rng(1))
+        counts = np.bincount(fleet.sample(100000), minlength=1000)
+        assert counts[0] > counts[9] > counts[99] > counts[999]
+        assert counts[:10].sum() > counts[500:].sum()
+
+    def test_same_seed_same_fleet(self):
+        first = Fleet(50, rng=RNGContext(9), owner_db=OwnerDatabase())
+        second = Fleet(50, rng=RNGContext(9), owner_db=OwnerDatabase())
+        assert first.population.plates == second.population.plates
+        assert first.sighting_batch(20).plates == second.sighting_batch(20).plates
@@ -0,0 +1,55 @@
+"""
+Tests for concurrent owner creation
+"""
+
+import random
+import threading
+import time
+
+from utils.indonesian_plates import OwnerDatabase
+
+PLATES = [f"B {i} XY" for i in range(40)]
+
+
+def _run_workers(db, workers=8):
+    seen = [dict() for _ in range(workers)]
+
+    def work(index):
+        rng = random.Random(index)
+        for plate in PLATES:
+            seen[index][plate] = db.get_or_create_owner(plate, 'roda_empat', rng=rng)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return seen
+
+
+class TestConcurrentOwnerDatabase:
+    """Racing workers agree on one owner per plate"""
+
+    def _slow_creation(self, db, monkeypatch):
+        create = db._create_owner
+
+        def slow(*args):
+            time.sleep(0.001)  # Widen the check-then-insert window
+            return create(*args)
+        monkeypatch.setattr(db, '_create_owner', slow)
+
+    def test_one_owner_per_plate(self, monkeypatch):
+        db = OwnerDatabase()
+        self._slow_creation(db, monkeypatch)
+        seen = _run_workers(db)
+        for plate in PLATES:
+            assert len({id(worker[plate]) for worker in seen}) == 1
+        assert len(db.owners) == len(PLATES)
+
+    def test_bounded_store_under_threads(self, monkeypatch):
+        db = OwnerDatabase(max_memory_owners=8)
+        self._slow_creation(db, monkeypatch)
+        seen = _run_workers(db)
+        for plate in PLATES:
+            assert len({worker[plate].owner_id for worker in seen}) == 1
+        assert len(db.owners) == len(PLATES)
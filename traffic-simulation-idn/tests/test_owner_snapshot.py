@@ -0,0 +1,115 @@
+"""
+Tests for binary owner snapshots and the JSON round trip
+"""
+
+import random
+
+from utils import owner_snapshot
+from utils.indonesian_plates import OwnerDatabase
+from utils.owner_snapshot import delta_count
+from utils.rng import RNGContext
+
+
+def _plates(start, count):
+    return [f"B {n} XYZ" for n in range(start, start + count)]
+
+
+class TestOwnerSnapshot:
+    """save_snapshot / load_snapshot keep every owner exactly"""
+
+    def test_full_round_trip(self, tmp_path):
+        path = str(tmp_path / "owners.snapshot")
+        db = OwnerDatabase()
+        db.get_or_create_owners(_plates(1, 200), 'roda_empat', rng=RNGContext(1))
+        db.get_or_create_owner('RI 1 00', rng=random.Random(2))
+        assert db.save_snapshot(path) == 201
+
+        loaded = OwnerDatabase()
+        assert loaded.load_snapshot(path) == 201
+        assert {plate: owner.to_row() for plate, owner in loaded.owners.items()} == \
+            {plate: owner.to_row() for plate, owner in db.owners.items()}
+
+    def test_incremental_saves_append_deltas(self, tmp_path):
+        path = str(tmp_path / "owners.snapshot")
+        db = OwnerDatabase()
+        db.get_or_create_owners(_plates(1, 100), rng=RNGContext(3))
+        db.save_snapshot(path)
+        db.get_or_create_owners(_plates(101, 10), rng=RNGContext(4))
+        assert db.save_snapshot(path) == 10
+        assert delta_count(path) == 1
+
+        loaded = OwnerDatabase()
+        assert loaded.load_snapshot(path) == 110
+        assert loaded.get_owner('B 105 XYZ').to_row() == db.get_owner('B 105 XYZ').to_row()
+
+        # Warm-started database only appends what it creates itself
+        loaded.get_or_create_owner('D 1 AB', rng=random.Random(5))
+        assert loaded.save_snapshot(path) == 1
+        assert delta_count(path) == 2
+        assert loaded.save_snapshot(path, full=True) == 111
+        assert delta_count(path) == 0
+
+    def test_truncated_delta_ignored(self, tmp_path):
+        path = tmp_path / "owners.snapshot"
+        db = OwnerDatabase()
+        db.get_or_create_owners(_plates(1, 50), rng=RNGContext(6))
+        db.save_snapshot(str(path))
+        size = path.stat().st_size
+        db.get_or_create_owners(_plates(51, 50), rng=RNGContext(7))
+        db.save_snapshot(str(path))
+        with open(path, 'r+b') as f:
+            f.truncate(size + 40)
+
+        assert OwnerDatabase().load_snapshot(str(path)) == 50
+        db.get_or_create_owner('D 1 AB', rng=random.Random(8))
+        db.save_snapshot(str(path))
+        assert OwnerDatabase().load_snapshot(str(path)) == 51
+
+    def test_spilled_owners_saved(self, tmp_path):
+        path = str(tmp_path / "owners.snapshot")
+        db = OwnerDatabase(max_memory_owners=10)
+        db.get_or_create_owners(_plates(1, 60), rng=RNGContext(9))
+        assert db.save_snapshot(path) == 60
+        assert db.get_stats()['disk'] == 50  # Saving does not promote spilled owners
+        assert OwnerDatabase().load_snapshot(path) == 60
+
+    def test_full_save_streams_segments(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(owner_snapshot, 'SEGMENT_ROWS', 16)
+        path = str(tmp_path / "owners.snapshot")
+        db = OwnerDatabase(max_memory_owners=10)
+        db.get_or_create_owners(_plates(1, 40), rng=RNGContext(11))
+        assert db.save_snapshot(path) == 40
+        assert delta_count(path) == 0
+        loaded = OwnerDatabase()
+        assert loaded.load_snapshot(path) == 40
+        assert loaded.get_owner('B 3 XYZ').to_row() == db.get_owner('B 3 XYZ').to_row()
+
+    def test_autosave_bounds_unsaved_owners(self, tmp_path):
+        path = str(tmp_path / "owners.snapshot")
+        db = OwnerDatabase()
+        db.autosave(path, 25)
+        rng = random.Random(12)
+        for plate in _plates(1, 60):
+            db.get_or_create_owner(plate, rng=rng)
+            assert len(db._dirty) < 25
+        # Two saves so far (full, then a delta); the last 10 owners are still pending
+        assert delta_count(path) == 1
+        assert OwnerDatabase().load_snapshot(path) == 50
+
+    def test_untracked_without_snapshot(self):
+        db = OwnerDatabase()
+        db.get_or_create_owners(_plates(1, 30), rng=RNGContext(13))
+        assert not db._dirty
+
+    def test_missing_file(self, tmp_path):
+        assert OwnerDatabase().load_snapshot(str(tmp_path / "none.snapshot")) == 0
+
+    def test_json_keeps_dates(self, tmp_path):
+        path = str(tmp_path / "owners.json")
+        db = OwnerDatabase()
+        db.get_or_create_owners(_plates(1, 20), rng=RNGContext(10))
+        db.save_to_file(path)
+        loaded = OwnerDatabase()
+        loaded.load_from_file(path)
+        for plate, owner in db.owners.items():
+            assert loaded.get_owner(plate).to_dict() == owner.to_dict()
@@ -0,0 +1,57 @@
+"""
+Tests for the bounded, disk-backed owner store
+"""
+
+import random
+
+from utils.indonesian_plates import OwnerDatabase, VehicleOwner
+from utils.owner_store import TieredOwnerStore
+
+
+def _store(tmp_path, capacity=3):
+    return TieredOwnerStore(capacity, VehicleOwner.to_row, VehicleOwner.from_row,
+                            str(tmp_path / "owners.sqlite"))
+
+
+def _owner(i):
+    return VehicleOwner.generate_independent_nik('Diplomatik', 'Diplomatik', rng=random.Random(i))
+
+
+class TestTieredOwnerStore:
+    """LRU memory tier with SQLite spill and promotion"""
+
+    def test_eviction_and_promotion(self, tmp_path):
+        store = _store(tmp_path)
+        owners = {f"B {i} AA": _owner(i) for i in range(5)}
+        for plate, owner in owners.items():
+            store[plate] = owner
+        assert len(store) == 5
+        assert store.get_stats()['memory'] == 3 and store.get_stats()['disk'] == 2
+
+        # Spilled owners come back with every field intact, and move to memory
+        promoted = store["B 0 AA"]
+        assert promoted.to_row() == owners["B 0 AA"].to_row()
+        assert promoted.stnk_expiry == owners["B 0 AA"].stnk_expiry
+        stats = store.get_stats()
+        assert stats['disk_hits'] == 1 and stats['evictions'] == 3 and stats['disk'] == 2
+        assert "B 1 AA" in store and "B 9 AA" not in store
+        assert store.get("B 9 AA") is None and store.get_stats()['misses'] == 1
+        assert sorted(store) == sorted(owners)
+
+        del store["B 1 AA"]
+        store.clear()
+        assert len(store) == 0
+
+    def test_spill_file_survives_reopen(self, tmp_path):
+        store = _store(tmp_path, capacity=1)
+        store["B 1 AA"], store["B 2 AA"] = _owner(1), _owner(2)
+        store.close()
+        reopened = _store(tmp_path, capacity=1)
+        assert reopened["B 1 AA"].owner_id == _owner(1).owner_id
+
+    def test_bounded_owner_database_stays_consistent(self):
+        db = OwnerDatabase(max_memory_owners=10)
+        rng = random.Random(3)
+        first = {f"B {i} XY": db.get_or_create_owner(f"B {i} XY", rng=rng).owner_id for i in range(50)}
+        assert db.get_stats()['memory'] == 10 and db.get_stats()['owners'] == 50
+        assert all(db.get_or_create_owner(plate).owner_id == nik for plate, nik in first.items())
@@ -0,0 +1,74 @@
+"""
+Tests for the compact unique-plate allocator
+"""
+
+import random
+
+from utils.plate_allocator import (
+    PlateAllocator, encode_plate, parse_plate, LETTER_CODES, NUMBER_CODES
+)
+from utils.plate_generator import PlatGenerator, PlateCharacterValidator, TruckClass, TruckSubType
+
+
+class TestPlateAllocator:
+    """Encoding, reservation and sharding"""
+
+    def test_encoding_is_distinct_and_fits_32_bits(self):
+        assert encode_plate('7', 'A') != encode_plate('07', 'A')
+        assert encode_plate('12', 'AB') != encode_plate('12', 'BA')
+        assert encode_plate('9999', 'ZZZZ') == NUMBER_CODES * LETTER_CODES - 1 < 2 ** 32
+
+    def test_allocate_rejects_duplicates(self):
+        allocator = PlateAllocator()
+        assert allocator.allocate('B', '1234', 'ABC')
+        assert not allocator.allocate('B', '1234', 'ABC')
+        assert allocator.allocate('D', '1234', 'ABC')
+        assert allocator.contains('B', '1234', 'ABC')
+        assert not allocator.contains('B', '1234', 'ABD')
+        assert len(allocator) == 2
+
+    def test_dense_container_switches_to_bitmap(self):
+        allocator = PlateAllocator()
+        letters = PlateCharacterValidator.VALID_LETTERS
+        for a in letters:
+            for b in letters:
+                for c in letters:
+                    allocator.allocate('B', '12', a + b + c)
+        assert len(allocator) == 23 ** 3
+        assert any(isinstance(c, bytearray) for c in allocator.containers.values())
+        assert allocator.contains('B', '12', 'KLM')
+        assert not allocator.allocate('B', '12', 'KLM')
+        assert allocator.memory_bytes() <= 2 * 8192
+
+    def test_parse_plate_ignores_suffixes(self):
+        assert parse_plate("B 1234 TAX (TRUK-16T) - RUTE: LN") == ('B', '1234', 'TAX')
+        assert parse_plate("RI 1 1234") == ('RI 1', '1234', '')
+        assert parse_plate("CD 71 123") == ('CD 71', '123', '')
+
+
+class TestPlatGeneratorAllocation:
+    """PlatGenerator records and (optionally) enforces unique plates"""
+
+    def test_unique_mode_never_repeats(self):
+        gen = PlatGenerator(rng=random.Random(3), unique=True)
+        plates = [gen.generate_government_plate()['plate'] for _ in range(2000)]
+        assert len(set(plates)) == len(plates)
+
+    def test_suffixes_do_not_hide_duplicates(self):
+        gen = PlatGenerator()
+        plate = gen.generate_truck_plate(TruckSubType.TANKER, TruckClass.HEAVY, region_code='B')['plate']
+        assert not gen.is_plate_unique(plate.split(' (')[0])
+
+    def test_shards_issue_disjoint_numbers(self):
+        seen = set()
+        for shard, allocator in enumerate(PlateAllocator.partition(4)):
+            gen = PlatGenerator(rng=random.Random(shard), allocator=allocator)
+            for _ in range(200):
+                number = gen.generate_private_plate('B')['number']
+                assert int(number) % 4 == shard
+                seen.add(int(number) % 4)
+        assert seen == {0, 1, 2, 3}
+
+    def test_allocator_alphabet_matches_validator(self):
+        from utils import plate_allocator
+        assert plate_allocator.VALID_LETTERS == PlateCharacterValidator.VALID_LETTERS
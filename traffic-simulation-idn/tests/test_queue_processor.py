@@ -0,0 +1,136 @@
+"""
+Tests for QueuedCarProcessor result tracking
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from data_models.models import Vehicle
+from simulation.queue_processor import QueuedCarProcessor, CarCheckResult
+from simulation.trace import persist_batches, restore_batches
+from data_models.models import Ticket
+
+
+def make_vehicle(plate, speed):
+    return Vehicle(vehicle_id='', license_plate=plate, vehicle_type='roda_empat',
+                   speed=speed, timestamp=datetime.now(),
+                   stnk_status='Active', sim_status='Active')
+
+
+class FastProcessor(QueuedCarProcessor):
+    """Processor without the simulated sensor delay"""
+
+    def _check_car(self, vehicle):
+        is_violation = vehicle.speed > 100
+        ticket = Ticket(license_plate=vehicle.license_plate, speed=vehicle.speed) if is_violation else None
+        return CarCheckResult(vehicle, is_violation, ticket=ticket)
+
+
+class TestBatchResults:
+    """Batch completion reports exactly that batch's violations"""
+
+    def test_batches_report_their_own_violations(self, tmp_path):
+        processor = FastProcessor(num_workers=3, pending_file=str(tmp_path / "pending.trace.gz"))
+        done = {}
+        finished = threading.Event()
+
+        def on_batch_complete(vehicles, violations):
+            done[vehicles[0].license_plate[0]] = sorted(t.license_plate for t in violations)
+            if len(done) == 2:
+                finished.set()
+
+        processor.on_batch_complete = on_batch_complete
+        processor.start()
+        try:
+            first = processor.add_vehicles([make_vehicle('A 1 X', 120), make_vehicle('A 2 X', 80)])
+            second = processor.add_vehicles([make_vehicle('B 1 X', 80), make_vehicle('B 2 X', 80),
+                                             make_vehicle('B 3 X', 110)])
+            assert first != second
+            assert finished.wait(5)
+        finally:
+            processor.stop()
+
+        assert done == {'A': ['A 1 X'], 'B': ['B 3 X']}
+        assert processor.batches == {}
+
+    def test_recent_results_are_bounded(self, tmp_path):
+        processor = FastProcessor(num_workers=2, recent_results_size=5,
+                                  pending_file=str(tmp_path / "pending.trace.gz"))
+        processor.start()
+        try:
+            processor.add_vehicles([make_vehicle(f'B {i} X', 120) for i in range(20)])
+            deadline = time.time() + 5
+            while processor.get_stats()['total_processed'] < 20 and time.time() < deadline:
+                time.sleep(0.05)
+            time.sleep(0.1)
+        finally:
+            processor.stop()
+
+        assert processor.get_stats()['total_violations'] == 20
+        assert len(processor.recent_results) == 5
+        assert len(processor.violations_list) == 5
+
+
+class TestGracefulShutdown:
+    """Stop drains until the deadline and saves what is left for the next run"""
+
+    def test_undrained_cars_are_saved_and_restored(self, tmp_path):
+        pending = str(tmp_path / "pending.trace.gz")
+        processor = QueuedCarProcessor(num_workers=1, pending_file=pending)
+        processor.start()
+        processor.add_vehicles([make_vehicle(f'B {i} X', 80) for i in range(30)])
+
+        started = time.monotonic()
+        processor.stop(drain_timeout=0.3)
+        assert time.monotonic() - started < 2
+        assert processor.add_vehicles([make_vehicle('B 99 X', 80)]) is None
+
+        checked = processor.get_stats()['total_processed']
+        assert 0 < checked < 30
+
+        resumed = FastProcessor(num_workers=2, pending_file=pending)
+        resumed.start()
+        try:
+            deadline = time.time() + 5
+            while resumed.get_stats()['total_processed'] < 30 - checked and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            resumed.stop()
+
+        assert resumed.get_stats()['total_processed'] == 30 - checked
+        assert not (tmp_path / "pending.trace.gz").exists()
+
+    def test_undrained_cars_keep_their_batches(self, tmp_path):
+        pending = str(tmp_path / "pending.trace.gz")
+        groups = [[f'B {b}{i} X' for i in range(size)] for b, size in enumerate([3, 1, 4], 1)]
+        processor = QueuedCarProcessor(num_workers=1, pending_file=pending)
+        for plates in groups:
+            processor.add_vehicles([make_vehicle(plate, 80) for plate in plates])
+        processor.stop(drain_timeout=0)
+
+        resumed = FastProcessor(num_workers=2, pending_file=pending)
+        completed = []
+        resumed.on_batch_complete = lambda vehicles, violations: completed.append(
+            sorted(v.license_plate for v in vehicles))
+        resumed.start()
+        try:
+            deadline = time.time() + 5
+            while len(completed) < len(groups) and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            resumed.stop()
+
+        assert sorted(completed) == sorted(sorted(plates) for plates in groups)
+
+    def test_replay_mode_ignores_pending_files(self, tmp_path):
+        pending = str(tmp_path / "pending.trace.gz")
+        persist_batches(pending, [[make_vehicle('B 1 X', 80)]])
+
+        processor = QueuedCarProcessor(num_workers=1, pending_file=pending, persist_pending=False)
+        processor.start()
+        processor.add_vehicles([make_vehicle(f'B {i} X', 80) for i in range(2, 30)])
+        processor.stop(drain_timeout=0)
+
+        # Leftovers of the other run were neither restored nor overwritten
+        assert [[v.license_plate for v in vehicles] for vehicles in restore_batches(pending)] == [['B 1 X']]
@@ -0,0 +1,55 @@
+"""
+Tests for the hierarchical indexes of IndonesianRegions
+"""
+
+import threading
+
+import pytest
+
+from utils.indonesian_regions import IndonesianRegions
+
+
+class TestRegionIndexes:
+    """Children lookups, read-only views and lazy village loading"""
+
+    def setup_method(self):
+        self.regions = IndonesianRegions()
+
+    def test_children_match_full_scan(self):
+        kabupatens = self.regions.get_all_kabupatens()
+        expected = {code: data['name'] for code, data in kabupatens.items() if data['province_code'] == '32'}
+        by_province = self.regions.get_kabupatens_by_province('32')
+        assert by_province == expected
+        assert list(by_province) == sorted(by_province)
+        assert set(self.regions.get_kecamatan_by_kabupaten('32.73')) == \
+            {code for code in self.regions.get_sorted_codes('kecamatan') if code.startswith('32.73.')}
+        assert self.regions.get_kabupatens_by_province('00') == {}
+
+    def test_views_are_read_only(self):
+        provinces = self.regions.get_all_provinces()
+        assert provinces['31'] == 'DKI JAKARTA'
+        with pytest.raises(TypeError):
+            provinces['99'] = 'Diplomatik'
+
+    def test_villages_loaded_on_demand(self):
+        desa = self.regions.get_desa_by_kecamatan('32.73.01')
+        assert desa and all(code.startswith('32.73.01.') for code in desa)
+        code = next(iter(desa))
+        assert self.regions.get_desa(code)['kabupaten_code'] == '32.73'
+        assert self.regions.get_desa('99.99.99.9999') is None
+
+    def test_concurrent_village_load_has_no_duplicates(self):
+        self.regions._data['desa'] = None  # Force a fresh load from several threads at once
+        barrier = threading.Barrier(4)
+
+        def load():
+            barrier.wait()
+            self.regions.get_desa_by_kecamatan('32.73.01')
+
+        threads = [threading.Thread(target=load) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        codes = self.regions._data['children']['32.73.01']
+        assert codes and codes == sorted(set(codes))
@@ -0,0 +1,49 @@
+"""
+Tests for ranked region-name matching
+"""
+
+from utils.indonesian_plates import IndonesianPlateManager
+from utils.region_matcher import RegionNameMatcher, get_region_matcher, normalize_region_name
+
+ENTRIES = [('32.04', 'KAB. BANDUNG'), ('32.17', 'KAB. BANDUNG BARAT'), ('32.73', 'KOTA BANDUNG'),
+           ('31.74', 'KOTA ADM. JAKARTA SELATAN'), ('11.01', 'KAB. ACEH SELATAN'),
+           ('11.71', 'KOTA BANDA ACEH')]
+
+
+class TestRegionNameMatcher:
+    """Normalization, ranking and batch resolution"""
+
+    def test_normalization(self):
+        assert normalize_region_name('Kota Adm. Jakarta Selatan') == ('JAKARTA SELATAN', 'KOTA')
+        assert normalize_region_name('Kabupaten  Aceh-Selatan') == ('ACEH SELATAN', 'KAB')
+        assert normalize_region_name('Sleman') == ('SLEMAN', None)
+
+    def test_best_match_beats_first_match(self):
+        matcher = RegionNameMatcher(ENTRIES)
+        # "SELATAN" appears in the first Jakarta entry, but Aceh Selatan is the exact match
+        assert matcher.best('Aceh Selatan').code == '11.01'
+        assert matcher.best('Kota Bandung').code == '32.73'
+        assert matcher.best('Kabupaten Bandung').code == '32.04'
+        assert matcher.best('Bandung Barat').code == '32.17'
+        assert matcher.best('Surabaya') is None
+        assert [m.code for m in matcher.top('Bandung', 3)][:2] == ['32.04', '32.73']
+
+    def test_prefix_and_batch(self):
+        matcher = RegionNameMatcher(ENTRIES)
+        assert matcher.best('Bandung', prefix='32.7').code == '32.73'
+        matches = matcher.best_many(['Banda Aceh', 'Jakarta Selatan', 'Banda Aceh', 'Papua'])
+        assert [m and m.code for m in matches] == ['11.71', '31.74', '11.71', None]
+
+    def test_prefix_applies_before_candidate_cut(self):
+        # The token match outside the prefix must not hide the trigram match inside it
+        matcher = RegionNameMatcher([('11.01.01', 'KAMPUNG BARU SELATAN'), ('32.73.01', 'SELATANA')])
+        match = matcher.best('Selatan', prefix='32.73.', min_score=0.3)
+        assert match.code == '32.73.01' and match.score > 0.8
+
+    def test_plate_sub_regions_resolve(self):
+        matcher = get_region_matcher(1)
+        names = [name for data in IndonesianPlateManager.PLATE_DATA.values()
+                 for name in data.get('sub_codes', {}).values()]
+        matches = matcher.best_many(names)
+        assert sum(match is not None for match in matches) / len(matches) > 0.95
+        assert matcher.best('Jakarta Selatan').code == '31.74'
@@ -0,0 +1,56 @@
+"""
+Tests for the compiled base.csv snapshot
+"""
+
+from utils.indonesian_regions import IndonesianRegions
+from utils.region_snapshot import load_snapshot
+
+CSV = """32,JAWA BARAT
+32.73,KOTA BANDUNG
+32.73.01,Sukasari
+11,ACEH
+32.73.02,Coblong
+32.73.02.1001,"Lebak Siliwangi I,II"
+32.01,KAB. BOGOR
+"""
+
+
+class TestRegionSnapshot:
+    """base.csv is compiled once and memory-mapped"""
+
+    def test_codes_names_and_hierarchy(self, tmp_path):
+        source = tmp_path / "base.csv"
+        source.write_text(CSV)
+        snapshot = load_snapshot(source, cache_dir=tmp_path / "cache")
+
+        assert len(snapshot) == 7
+        assert snapshot.codes[:2] == ['32', '32.73']
+        assert snapshot.names[5] == 'Lebak Siliwangi I,II'
+        assert snapshot.levels.tolist() == [0, 1, 2, 0, 2, 3, 1]
+
+        bandung = snapshot.find('32.73')
+        assert snapshot.parents[bandung] == snapshot.find('32')
+        assert [snapshot.codes[i] for i in snapshot.children(bandung)] == ['32.73.01', '32.73.02']
+        assert [snapshot.codes[i] for i in snapshot.children(snapshot.find('32'))] == ['32.73', '32.01']
+        assert snapshot.find('32.99') is None
+        assert list(snapshot.entries(level=1)) == [('32.73', 'KOTA BANDUNG'), ('32.01', 'KAB. BOGOR')]
+
+    def test_recompiled_when_source_changes(self, tmp_path):
+        source = tmp_path / "base.csv"
+        source.write_text(CSV)
+        first = load_snapshot(source, cache_dir=tmp_path / "cache")
+        assert load_snapshot(source, cache_dir=tmp_path / "cache") is first
+
+        source.write_text(CSV + "36,BANTEN\n")
+        # A new process (empty registry) picks up the change
+        from utils import region_snapshot
+        region_snapshot._SNAPSHOTS.clear()
+        second = load_snapshot(source, cache_dir=tmp_path / "cache")
+        assert second.path == first.path and len(second) == 8
+
+    def test_regions_loaded_from_snapshot(self):
+        regions = IndonesianRegions()
+        assert regions.get_province('32') == 'JAWA BARAT'
+        assert regions.get_kabupaten('32.73')['province_name'] == 'JAWA BARAT'
+        assert regions.get_kecamatan('32.73.01')['kabupaten_name'] == 'KOTA BANDUNG'
+        assert len(load_snapshot()) > 90000
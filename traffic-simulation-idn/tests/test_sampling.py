@@ -0,0 +1,37 @@
+"""
+Tests for alias-method samplers
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from utils.sampling import AliasSampler
+
+
+class TestAliasSampler:
+    """Single and vectorized draws follow the configured weights"""
+
+    WEIGHTS = [0.75, 0.15, 0.05, 0.05]
+
+    def test_single_draws_match_weights(self):
+        sampler = AliasSampler(['a', 'b', 'c', 'd'], self.WEIGHTS)
+        rng = random.Random(1)
+        draws = [sampler.sample(rng) for _ in range(40000)]
+        for item, weight in zip('abcd', self.WEIGHTS):
+            assert draws.count(item) / len(draws) == pytest.approx(weight, abs=0.01)
+
+    def test_block_draws_match_weights(self):
+        sampler = AliasSampler(['a', 'b', 'c', 'd'], self.WEIGHTS)
+        indices = sampler.sample_indices(200000, np.random.default_rng(1))
+        freq = np.bincount(indices, minlength=4) / len(indices)
+        assert freq == pytest.approx(self.WEIGHTS, abs=0.005)
+
+    def test_uniform_and_zero_weights(self):
+        assert AliasSampler(['x']).sample() == 'x'
+        sampler = AliasSampler(['a', 'b', 'c'], [0, 1, 0])
+        assert set(sampler.sample_indices(1000, np.random.default_rng(0)).tolist()) == {1}
+        assert {sampler.sample(random.Random(seed)) for seed in range(100)} == {'b'}
+        with pytest.raises(ValueError):
+            AliasSampler(['a', 'b'], [0, 0])
@@ -0,0 +1,53 @@
+"""
+Tests for sharded per-thread statistics
+"""
+
+import threading
+
+from simulation.stats import ShardedStats
+
+
+class TestShardedStats:
+    """Per-thread shards merged on read"""
+
+    def test_merge_across_threads(self):
+        stats = ShardedStats()
+
+        def worker(speed):
+            for _ in range(1000):
+                stats.record_vehicle(speed, is_violation=speed > 100, fine=21.0 if speed > 100 else 0.0)
+
+        threads = [threading.Thread(target=worker, args=(speed,)) for speed in (80.0, 90.0, 110.0, 120.0)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        merged = stats.merged()
+        assert merged.vehicles == 4000
+        assert merged.violations == 2000
+        assert merged.total_fines == 2000 * 21.0
+        assert merged.max_speed == 120.0
+        assert merged.avg_speed == 100.0
+        assert merged.violation_rate == 50.0
+
+    def test_each_thread_gets_its_own_shard(self):
+        stats = ShardedStats()
+        main_shard = stats.shard()
+        other = []
+        t = threading.Thread(target=lambda: other.append(stats.shard()))
+        t.start()
+        t.join()
+
+        assert stats.shard() is main_shard
+        assert other[0] is not main_shard
+
+    def test_batch_record(self):
+        stats = ShardedStats()
+        stats.record_batch(vehicles=10, violations=3, total_fines=63.0, speed_sum=900.0, max_speed=118.5)
+        stats.record_batch(vehicles=5, violations=1, total_fines=20.0, speed_sum=400.0, max_speed=99.0)
+
+        merged = stats.merged()
+        assert (merged.vehicles, merged.violations) == (15, 4)
+        assert merged.max_speed == 118.5
+        assert abs(merged.avg_speed - 1300.0 / 15) < 1e-9
@@ -0,0 +1,53 @@
+"""
+Tests for the streaming vehicle generator API
+"""
+
+import asyncio
+import time
+
+import utils.generators as generators
+from simulation.trace import iter_trace_batches, record_stream
+from utils.generators import DataGenerator
+from utils.indonesian_plates import OwnerDatabase
+from utils.rng import RNGContext
+
+
+class TestVehicleStream:
+    """iter_vehicles / aiter_vehicles yield bounded chunks on demand"""
+
+    def setup_method(self):
+        self._owner_db = generators.owner_db
+        generators.owner_db = OwnerDatabase()
+
+    def teardown_method(self):
+        generators.owner_db = self._owner_db
+
+    def test_chunks_and_limit(self):
+        chunks = list(DataGenerator.iter_vehicles(chunk=4, limit=10))
+        assert [len(c) for c in chunks] == [4, 4, 2]
+
+        batches = list(DataGenerator.iter_vehicles(chunk=8, bulk=True, limit=8))
+        assert len(batches) == 1 and len(batches[0]) == 8
+
+    def test_stream_matches_batch_generation(self):
+        streamed = next(DataGenerator.iter_vehicles(rng=RNGContext(11)))
+        generators.owner_db = OwnerDatabase()
+        direct = DataGenerator.generate_vehicle_batch(RNGContext(11))
+        assert [v.license_plate for v in streamed] == [v.license_plate for v in direct]
+
+    def test_rate_paces_chunks(self):
+        start = time.monotonic()
+        list(DataGenerator.iter_vehicles(rate=100, chunk=5, limit=20))
+        # Last chunk is due after 15 vehicles at 100/s
+        assert time.monotonic() - start >= 0.14
+
+    def test_async_stream(self):
+        async def collect():
+            return [len(c) async for c in DataGenerator.aiter_vehicles(chunk=3, limit=7)]
+        assert asyncio.run(collect()) == [3, 3, 1]
+
+    def test_record_stream_builds_trace(self, tmp_path):
+        path = str(tmp_path / "dataset.trace.gz")
+        recorded = record_stream(path, DataGenerator.iter_vehicles(chunk=5), limit=12)
+        assert recorded == 12
+        assert [len(v) for _, v in iter_trace_batches(path)] == [5, 5, 2]
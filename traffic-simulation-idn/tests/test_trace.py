@@ -0,0 +1,88 @@
+"""
+Tests for workload trace recording and replay
+"""
+
+import queue
+from datetime import datetime
+
+import pytest
+from data_models.models import Vehicle
+from simulation.trace import TraceRecorder, TraceReplayer, load_trace
+
+
+def make_vehicles(count, offset=0):
+    """Build deterministic vehicles for a trace"""
+    return [
+        Vehicle(
+            vehicle_id=f"TOY{offset + i:04d}",
+            license_plate=f"B {1000 + offset + i} ABC",
+            vehicle_type='roda_empat',
+            speed=59.9 + i * 0.1,
+            timestamp=datetime(2026, 2, 1, 8, 30, 15, 123456 + i),
+            owner_name='Budi Santoso',
+            vehicle_category='KEDUTAAN',
+            plate_color='WHITE',
+        )
+        for i in range(count)
+    ]
+
+
+class TestTraceRoundTrip:
+    """Recording then loading a trace must reproduce the workload exactly"""
+
+    def test_round_trip_preserves_vehicles(self, tmp_path):
+        path = tmp_path / "run.trace.gz"
+        batches = [make_vehicles(3), make_vehicles(2, offset=10)]
+
+        with TraceRecorder(str(path)) as recorder:
+            recorder.record_batch(batches[0], arrival=0.0)
+            recorder.record_batch(batches[1], arrival=3.0)
+
+        loaded = load_trace(str(path))
+        assert [arrival for arrival, _ in loaded] == [0.0, 3.0]
+        assert [vehicles for _, vehicles in loaded] == batches
+
+    def test_identical_workloads_give_identical_files(self, tmp_path):
+        paths = [tmp_path / "a.trace.gz", tmp_path / "b.trace.gz"]
+        for path in paths:
+            with TraceRecorder(str(path)) as recorder:
+                recorder.record_batch(make_vehicles(5), arrival=1.5)
+
+        assert paths[0].read_bytes() == paths[1].read_bytes()
+
+    def test_rejects_foreign_file(self, tmp_path):
+        import gzip
+        path = tmp_path / "other.gz"
+        with gzip.open(path, 'wt') as f:
+            f.write('{"format": "something-else"}\n')
+
+        with pytest.raises(ValueError):
+            load_trace(str(path))
+
+
+class TestTraceReplayer:
+    """Replay feeds recorded batches into the pipeline"""
+
+    def test_max_speed_replay_feeds_queue_and_processor(self, tmp_path):
+        path = tmp_path / "run.trace.gz"
+        with TraceRecorder(str(path)) as recorder:
+            recorder.record_batch(make_vehicles(4), arrival=0.0)
+            recorder.record_batch(make_vehicles(4, offset=4), arrival=3600.0)
+
+        class FakeProcessor:
+            def __init__(self):
+                self.received = []
+
+            def add_vehicles(self, vehicles):
+                self.received.extend(vehicles)
+
+        data_queue = queue.Queue()
+        processor = FakeProcessor()
+        replayer = TraceReplayer(str(path), data_queue, car_processor=processor, speed=0)
+        replayer.run()
+
+        assert replayer.get_stats()['vehicles_generated'] == 8
+        assert data_queue.qsize() == 2
+        assert [v.vehicle_id for v in processor.received] == [
+            v.vehicle_id for v in make_vehicles(4) + make_vehicles(4, offset=4)
+        ]
@@ -0,0 +1,136 @@
+"""
+Substring index over base.csv administrative names
+Owner generation looks up region names with "first entry whose name
+contains X" scans over the ~91k base.csv entries. AdminNameIndex keeps the
+entries of one administrative level (kabupaten or kecamatan) in file order
+together with an exact-name dict and a trigram inverted index, so such a
+lookup only verifies the entries sharing the query's rarest trigram. The
+result is always the same entry a linear scan would return.
+
+KabupatenIndex builds on it for the kabupaten/kota matching used by
+IndonesianPlateManager (prefix-stripped exact names, then substring and
+all-words matches).
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Trigram index; shorter queries fall back to scanning the level's entries
+GRAM = 3
+
+
+def admin_level(code: str) -> int:
+    """Administrative level of a base.csv code (0 = province, 1 = kabupaten, 2 = kecamatan, 3 = desa)"""
+    return code.count('.')
+
+
+class AdminNameIndex:
+    """Names and codes of one administrative level, in base.csv order"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        """
+        Args:
+            entries: (name, code) pairs in lookup order (names already normalized)
+        """
+        self.names: List[str] = []
+        self.codes: List[str] = []
+        self.exact: Dict[str, int] = {}
+        self.grams: Dict[str, List[int]] = {}
+
+        for name, code in entries:
+            position = len(self.names)
+            self.names.append(name)
+            self.codes.append(code)
+            self.exact.setdefault(name, position)
+            for gram in {name[i:i + GRAM] for i in range(len(name) - GRAM + 1)}:
+                self.grams.setdefault(gram, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _candidates(self, texts: Iterable[str]):
+        """Positions that may contain every text, ascending (the rarest posting list)"""
+        postings = range(len(self.names))
+        for text in texts:
+            for i in range(len(text) - GRAM + 1):
+                candidates = self.grams.get(text[i:i + GRAM], ())
+                if len(candidates) < len(postings):
+                    postings = candidates
+        return postings
+
+    def first_containing(self, text: str) -> Optional[int]:
+        """Position of the first entry whose name contains text (None if no entry does)"""
+        limit = self.exact.get(text)
+        for position in self._candidates([text]):
+            if limit is not None and position >= limit:
+                break
+            if text in self.names[position]:
+                return position
+        return limit
+
+    def first_containing_all(self, words: Iterable[str]) -> Optional[int]:
+        """Position of the first entry whose name contains all of the words"""
+        words = list(words)
+        for position in self._candidates(words):
+            name = self.names[position]
+            if all(word in name for word in words):
+                return position
+        return None
+
+    def first_containing_any(self, words: Iterable[str]) -> Optional[int]:
+        """Position of the first entry whose name contains any of the words"""
+        positions = [p for p in map(self.first_containing, words) if p is not None]
+        return min(positions) if positions else None
+
+    def code_containing(self, text: str) -> Optional[str]:
+        """Code of the first entry whose name contains text"""
+        position = self.first_containing(text)
+        return None if position is None else self.codes[position]
+
+    def code_containing_any(self, words: Iterable[str]) -> Optional[str]:
+        """Code of the first entry whose name contains any of the words"""
+        position = self.first_containing_any(words)
+        return None if position is None else self.codes[position]
+
+
+# Removed once each, in this order (same as the original matching code)
+ADMIN_PREFIXES = ('KOTA ', 'KAB. ', 'KABUPATEN ', 'ADM. ', 'KOTA ADM. ')
+
+
+def strip_admin_prefixes(name: str) -> str:
+    """Drop the first occurrence of each KOTA/KAB./ADM. prefix from an uppercase name"""
+    for prefix in ADMIN_PREFIXES:
+        name = name.replace(prefix, '', 1)
+    return name
+
+
+class KabupatenIndex:
+    """Kabupaten/kota entries of base.csv keyed by full and prefix-stripped name"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        """
+        Args:
+            entries: (uppercase name, XX.YY code) pairs in base.csv order
+        """
+        self.names = AdminNameIndex(entries)
+        self.stripped: Dict[str, int] = {}
+        for position, name in enumerate(self.names.names):
+            self.stripped.setdefault(strip_admin_prefixes(name).strip(), position)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def lookup(self, sub_region: str) -> Optional[str]:
+        """
+        Code of the first entry matching a region name
+
+        An entry matches when its prefix-stripped name equals the stripped
+        query, when it contains the whole query, or when it contains every
+        query word longer than two characters.
+        """
+        query = sub_region.upper().strip()
+        stripped = strip_admin_prefixes(query)
+        words = [w for w in stripped.split() if len(w) > 2]
+        positions = [p for p in (self.stripped.get(stripped),
+                                 self.names.first_containing(query),
+                                 self.names.first_containing_all(words)) if p is not None]
+        return self.names.codes[min(positions)] if positions else None
@@ -4,19 +4,43 @@ Vehicle Database Parser - Extracts vehicle data from CARS.md
 """
 
 import json
+import re
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+# Weight keywords matched against the model name (heavy is checked first)
+HEAVY_KEYWORDS = ['truck', 'pickup', 'f-150', 'silverado', 'ram', 'sierra', 'tundra',
+                  'highlander', 'sequoia', 'expedition', 'explorer', 'tahoe', 'suburban']
+CAR_KEYWORDS = ['civic', 'accord', 'camry', 'corolla', 'prius', 'elantra', 'sonata',
+                'altima', 'maxima', 'jetta', 'passat', 'golf', 'a3', 'a4', 'a6']
+_HEAVY_RE = re.compile('|'.join(map(re.escape, HEAVY_KEYWORDS)))
+_CAR_RE = re.compile('|'.join(map(re.escape, CAR_KEYWORDS)))
+
+
 class CarDatabase:
     """Parse and manage vehicle data from CARS.md"""
     
-    def __init__(self, cars_md_path: str = "CARS.md"):
+    def __init__(self, cars_md_path: str = "CARS.md", use_cache: bool = True):
+        """
+        Args:
+            cars_md_path: Path to CARS.md
+            use_cache: Reuse the parsed table from the binary cache while CARS.md is unchanged
+        """
         self.cars_md_path = Path(cars_md_path)
         self.vehicles = []
         self.manufacturers = set()
         
         if self.cars_md_path.exists():
-            self.parse_cars_md()
+            if use_cache:
+                from .db_cache import load_cached
+                self.vehicles = load_cached(self.cars_md_path, 'cars', self._parse_vehicles)
+                self.manufacturers = {v['make'] for v in self.vehicles}
+            else:
+                self.parse_cars_md()
+    
+    def _parse_vehicles(self) -> List[Dict]:
+        self.parse_cars_md()
+        return self.vehicles
     
     def parse_cars_md(self):
         """Parse CARS.md and extract vehicle information"""
@@ -83,36 +107,25 @@ class CarDatabase:
     
     def _get_vehicle_weight(self, make: str, model: str) -> str:
         """Assign weight category based on make and model"""
-        # Trucks and large vehicles
-        heavy = ['truck', 'pickup', 'f-150', 'silverado', 'ram', 'sierra', 'tundra', 
-                'highlander', 'sequoia', 'expedition', 'explorer', 'tahoe', 'suburban']
-        
-        # Cars
-        cars = ['civic', 'accord', 'camry', 'corolla', 'prius', 'elantra', 'sonata', 
-               'altima', 'maxima', 'jetta', 'passat', 'golf', 'a3', 'a4', 'a6']
-        
-        # Motorcycles (not in CARS.md but for reference)
-        # motorcycles = []
-        
+        # Trucks and large vehicles first, then cars (one precompiled scan each)
         model_lower = model.lower()
         
-        for vehicle in heavy:
-            if vehicle in model_lower:
-                return 'truck'
+        if _HEAVY_RE.search(model_lower):
+            return 'truck'
         
-        for vehicle in cars:
-            if vehicle in model_lower:
-                return 'car'
+        if _CAR_RE.search(model_lower):
+            return 'car'
         
         # Default to SUV/crossover for most models
         return 'suv'
     
-    def get_random_vehicle(self) -> Dict:
-        """Get a random vehicle from database"""
+    def get_random_vehicle(self, rng=None) -> Dict:
+        """Get a random vehicle from database (rng: optional random.Random-compatible stream)"""
         import random
+        rng = rng or random
         if not self.vehicles:
             return None
-        return random.choice(self.vehicles)
+        return rng.choice(self.vehicles)
     
     def get_vehicles_by_make(self, make: str) -> List[Dict]:
         """Get all vehicles by manufacturer"""
@@ -165,7 +178,7 @@ class CarDatabase:
 
 if __name__ == "__main__":
     # Test the database
-    db = CarDatabase("CARS.md")
+    db = CarDatabase("CARS.md", use_cache=False)
     
     print("\n[*] Vehicle Database Statistics")
     print("=" * 60)
@@ -0,0 +1,104 @@
+"""
+Binary cache for parsed vehicle databases
+Parsing CARS.md or model.csv on every start is wasted work, so the parsed
+records are pickled next to the data directory and reused as long as the
+source file is unchanged. A cache entry stores the source's mtime, size and
+SHA-256: a matching stat is trusted as is, a changed stat falls back to the
+hash (so a touched but identical file still hits), and anything else
+rebuilds the cache.
+"""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from config import Config
+from utils.logger import logger
+
+# Bump when the shape of cached records changes
+CACHE_VERSION = 1
+
+
+class LazyDatabase:
+    """Class-attribute descriptor that builds a database on first access"""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self.instance = None
+
+    def __get__(self, obj, owner):
+        if self.instance is None:
+            self.instance = self.factory()
+        return self.instance
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path_for(source: Path, name: str, cache_dir: Optional[str] = None,
+                   suffix: str = '.pickle') -> Path:
+    """Cache file for a source (keyed by its absolute path)"""
+    key = hashlib.sha1(str(source.resolve()).encode('utf-8')).hexdigest()[:12]
+    return Path(cache_dir or Config.CACHE_DIR) / f"{name}-{key}{suffix}"
+
+
+def load_cached(source, name: str, build: Callable[[], Any], cache_dir: Optional[str] = None,
+                key: Optional[str] = None) -> Any:
+    """
+    Return build() for a source file, reusing a pickled result when the source is unchanged
+
+    Args:
+        source: Path of the file build() parses
+        name: Cache file prefix
+        build: Parses the source and returns picklable data
+        cache_dir: Cache directory (default: Config.CACHE_DIR)
+        key: Fingerprint of other build() inputs; a different key rebuilds
+            the entry in place
+    """
+    source = Path(source)
+    cache_file = cache_path_for(source, name, cache_dir)
+    stat = source.stat()
+
+    entry = None
+    try:
+        with open(cache_file, 'rb') as f:
+            entry = pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache {cache_file}: {e}")
+
+    if entry and entry.get('version') == CACHE_VERSION and entry.get('key') == key:
+        if (entry['mtime_ns'], entry['size']) == (stat.st_mtime_ns, stat.st_size):
+            return entry['data']
+        source_hash = file_hash(source)
+        if entry['sha256'] == source_hash:
+            _write_entry(cache_file, entry, stat, source_hash)  # Refresh the stat
+            return entry['data']
+    else:
+        source_hash = file_hash(source)
+
+    data = build()
+    _write_entry(cache_file, {'version': CACHE_VERSION, 'key': key, 'data': data}, stat, source_hash)
+    return data
+
+
+def _write_entry(cache_file: Path, entry: dict, stat: os.stat_result, source_hash: str):
+    """Atomically write a cache entry (a failed write only costs the next start)"""
+    entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size, sha256=source_hash)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning(f"Could not write cache {cache_file}: {e}")
@@ -0,0 +1,88 @@
+"""
+Registered-fleet population model
+Instead of inventing a new vehicle (and owner) for every detection, a Fleet
+generates a fixed population of N registered vehicles up front with the bulk
+generator and draws sightings from it with a Zipf-like frequency: a few
+vehicles pass the sensors all the time, most only rarely. Repeat sightings
+hit the owner database, so it never grows beyond N entries, and N can be
+sized to millions for scale tests.
+"""
+
+from datetime import datetime
+from typing import Dict
+
+import numpy as np
+
+from data_models.batch import VehicleBatch, PLATE_COLUMNS
+from .generators import DataGenerator
+from .indonesian_plates import owner_db as default_owner_db
+from .rng import RNGContext
+
+
+class Fleet:
+    """Fixed population of registered vehicles seen with Zipf-like frequency"""
+
+    def __init__(self, size: int, zipf_exponent: float = 1.1, rng=None, owner_db=None):
+        """
+        Args:
+            size: Number of registered vehicles (and at most that many owners)
+            zipf_exponent: Popularity skew; the vehicle of rank r is seen with
+                           weight 1 / r ** zipf_exponent (0 = uniform)
+            rng: RNGContext or NumPy Generator (default: fresh unseeded generator)
+            owner_db: OwnerDatabase that sightings resolve owners through
+        """
+        if size < 1:
+            raise ValueError("Fleet size must be at least 1")
+        self.owner_rng = None
+        if isinstance(rng, RNGContext):
+            self.owner_rng = rng.random
+            rng = rng.numpy
+        self.rng = rng or np.random.default_rng()
+        self.owner_db = owner_db if owner_db is not None else default_owner_db
+        self.zipf_exponent = zipf_exponent
+
+        # Rows are drawn independently, so row order is already a random ranking
+        self.population = DataGenerator.generate_vehicle_batch_bulk(size, self.rng,
+                                                                    resolve_owners=False)
+        weights = 1.0 / np.arange(1, size + 1, dtype=np.float64) ** zipf_exponent
+        self._cdf = np.cumsum(weights)
+        self._cdf /= self._cdf[-1]
+
+        self.sightings = 0
+        self._seen = np.zeros(size, dtype=np.bool_)
+
+    def __len__(self) -> int:
+        return len(self.population)
+
+    def sample(self, n: int) -> np.ndarray:
+        """Draw n population indices by popularity"""
+        indices = np.searchsorted(self._cdf, self.rng.random(n), side='right')
+        return np.minimum(indices, len(self) - 1)
+
+    def sighting_batch(self, n: int) -> VehicleBatch:
+        """
+        Draw n sightings as a VehicleBatch
+
+        Identity columns (category, make/model, plate) come from the sampled
+        fleet vehicles; speeds and the timestamp are fresh for every sighting.
+        """
+        indices = self.sample(n)
+        self.sightings += n
+        self._seen[indices] = True
+
+        source = self.population.columns
+        columns = {name: source[name][indices] for name in ('category', 'model') + PLATE_COLUMNS}
+        _, _, _, truck_profile = DataGenerator._get_bulk_tables()
+        columns['speed'] = DataGenerator.generate_speeds_bulk(truck_profile[columns['model']], self.rng)
+        return VehicleBatch(columns, self.population.vocab, timestamp=datetime.now(),
+                            owner_db=self.owner_db, owner_rng=self.owner_rng)
+
+    def get_stats(self) -> Dict:
+        """Population size, sightings and the share of sightings that were repeats"""
+        distinct = int(self._seen.sum())
+        return {
+            'size': len(self),
+            'sightings': self.sightings,
+            'distinct_seen': distinct,
+            'repeat_rate': (1 - distinct / self.sightings) * 100 if self.sightings else 0.0
+        }
@@ -1,27 +1,69 @@
+import asyncio
+import os
 import random
 import string
+import time
 from datetime import datetime
+from typing import AsyncIterator, Iterator, List, Union
+import numpy as np
 from config import Config
 from data_models.models import Vehicle
+from data_models.batch import (
+    VehicleBatch, BatchVocabulary,
+    CATEGORY_PRIBADI, CATEGORY_BARANG, CATEGORY_PEMERINTAH, CATEGORY_KEDUTAAN
+)
 from .car_database import CarDatabase
 from .motorcycle_database import MotorcycleDatabase
 from .truck_database import TruckDatabase
+from .db_cache import LazyDatabase
 from .indonesian_plates import IndonesianPlateManager, owner_db, VehicleOwner, VehicleType, VehicleCategory
+from .rng import RNGContext
+from .sampling import AliasSampler
 from .plate_generator import (
-    get_plate_generator, TruckSubType, TruckClass,
-    GovernmentAgency, DiplomaticCountry
+    get_plate_generator, TruckSubType, TruckClass, TourRoute,
+    GovernmentAgency, DiplomaticCountry, PlateCharacterValidator
 )
 
 class DataGenerator:
     """Generates random vehicle data using real car, motorcycle, and truck databases"""
     
-    # Load databases once
-    car_db = CarDatabase("CARS.md")
-    motorcycle_db = MotorcycleDatabase("model.csv")
-    truck_db = TruckDatabase()
+    # Databases are loaded on first use (parsed tables come from the binary cache)
+    car_db = LazyDatabase(lambda: CarDatabase(os.path.join(Config.BASE_DIR, "CARS.md")))
+    motorcycle_db = LazyDatabase(lambda: MotorcycleDatabase(os.path.join(Config.BASE_DIR, "model.csv")))
+    truck_db = LazyDatabase(TruckDatabase)
+    
+    # Choices used by generate_vehicle_batch / generate_vehicle_batch_bulk
+    PRIVATE_REGIONS = ['B', 'D', 'F', 'H', 'L', 'AB', 'AG', 'AA', 'BL', 'BP', 'KB', 'KT', 'DK']
+    TRUCK_REGIONS = ['B', 'D', 'F', 'H', 'L', 'AB', 'BL']
+    TRUCK_TYPES = [TruckSubType.GENERAL, TruckSubType.CONTAINER, TruckSubType.TANKER,
+                   TruckSubType.DUMP, TruckSubType.FLATBED]
+    TRUCK_CLASSES = [TruckClass.LIGHT, TruckClass.MEDIUM, TruckClass.HEAVY]
+    AGENCIES = [GovernmentAgency.POLICE, GovernmentAgency.ARMY_LAND, GovernmentAgency.ARMY_NAVY,
+                GovernmentAgency.ARMY_AIR, GovernmentAgency.PRESIDENCY, GovernmentAgency.PARLIAMENT]
+    COUNTRIES = [DiplomaticCountry.USA, DiplomaticCountry.CHINA, DiplomaticCountry.JAPAN,
+                 DiplomaticCountry.SOUTH_KOREA, DiplomaticCountry.SINGAPORE, DiplomaticCountry.MALAYSIA,
+                 DiplomaticCountry.THAILAND, DiplomaticCountry.VIETNAM, DiplomaticCountry.PHILIPPINES,
+                 DiplomaticCountry.INDIA]
+    
+    # Precompiled O(1) samplers shared by the per-vehicle and bulk generators
+    # Category: 75% Pribadi, 15% Barang, 5% Pemerintah, 5% Kedutaan
+    CATEGORY_SAMPLER = AliasSampler(
+        [CATEGORY_PRIBADI, CATEGORY_BARANG, CATEGORY_PEMERINTAH, CATEGORY_KEDUTAAN],
+        [0.75, 0.15, 0.05, 0.05]
+    )
+    PRIVATE_REGION_SAMPLER = AliasSampler(PRIVATE_REGIONS)
+    TRUCK_REGION_SAMPLER = AliasSampler(TRUCK_REGIONS)
+    TRUCK_TYPE_SAMPLER = AliasSampler(TRUCK_TYPES)
+    TRUCK_CLASS_SAMPLER = AliasSampler(TRUCK_CLASSES)
+    AGENCY_SAMPLER = AliasSampler(AGENCIES)
+    COUNTRY_SAMPLER = AliasSampler(COUNTRIES)
+    
+    # Built on first use from the loaded databases
+    _vehicle_type_sampler = None
+    _bulk_tables = None
     
     @staticmethod
-    def generate_license_plate(vehicle_type: str = 'car'):
+    def generate_license_plate(vehicle_type: str = 'car', rng=None):
         """Generate random license plate following Indonesian nomenclature
         Format: [Region Code] [4-digit number] [Sub Code] [Owner letters]
         Examples:
@@ -30,18 +72,19 @@ class DataGenerator:
         
         Args:
             vehicle_type: 'motorcycle' or 'car'
+            rng: random.Random-compatible stream (default: random module)
         
         Returns:
             plate string (e.g., "B 1234 U AB")
         """
         vehicle_enum = VehicleType.RODA_DUA if vehicle_type == 'motorcycle' else VehicleType.RODA_EMPAT_LEBIH
-        plate, region_name, sub_region, vehicle_display = IndonesianPlateManager.generate_plate(vehicle_enum)
+        plate, region_name, sub_region, vehicle_display = IndonesianPlateManager.generate_plate(vehicle_enum, rng=rng)
         return plate
     
     @staticmethod
-    def generate_vehicle_from_cars_db():
+    def generate_vehicle_from_cars_db(rng=None):
         """Generate vehicle using real car database"""
-        vehicle = DataGenerator.car_db.get_random_vehicle()
+        vehicle = DataGenerator.car_db.get_random_vehicle(rng)
         
         if not vehicle:
             return {
@@ -60,9 +103,9 @@ class DataGenerator:
         }
     
     @staticmethod
-    def generate_motorcycle_from_db():
+    def generate_motorcycle_from_db(rng=None):
         """Generate motorcycle using real motorcycle database"""
-        motorcycle = DataGenerator.motorcycle_db.get_random_motorcycle()
+        motorcycle = DataGenerator.motorcycle_db.get_random_motorcycle(rng)
         
         return {
             'make': motorcycle['make'],
@@ -72,9 +115,9 @@ class DataGenerator:
         }
     
     @staticmethod
-    def generate_truck_from_db():
+    def generate_truck_from_db(rng=None):
         """Generate truck using real truck database"""
-        truck = DataGenerator.truck_db.get_random_truck()
+        truck = DataGenerator.truck_db.get_random_truck(rng)
         
         return {
             'make': truck['make'],
@@ -85,24 +128,26 @@ class DataGenerator:
         }
     
     @staticmethod
-    def generate_vehicle_type():
+    def generate_vehicle_type(rng=None):
         """Generate random vehicle type based on real database distribution"""
-        # Get statistics from database
-        stats = DataGenerator.car_db.get_statistics()
-        type_dist = stats['by_vehicle_type']
-        
-        types = list(type_dist.keys())
-        weights = list(type_dist.values())
+        # Weights come from one pass over the database, compiled once
+        if DataGenerator._vehicle_type_sampler is None:
+            stats = DataGenerator.car_db.get_statistics()
+            type_dist = stats['by_vehicle_type']
+            DataGenerator._vehicle_type_sampler = AliasSampler(
+                list(type_dist.keys()), list(type_dist.values())
+            )
         
-        return random.choices(types, weights=weights, k=1)[0]
+        return DataGenerator._vehicle_type_sampler.sample(rng)
     
     @staticmethod
-    def generate_speed(vehicle_type="car"):
+    def generate_speed(vehicle_type="car", rng=None):
         """Generate random speed based on vehicle type (Toll Road - PP 43/1993)
         Kendaraan Ringan (Cars): 60-100 km/h (violations: <60 or >100)
         Kendaraan Berat (Trucks/Buses): 60-80 km/h (violations: <60 or >80, but allow 10-20km over)
         Increased violation generation for realistic enforcement data
         """
+        rng = rng or random
         # Adjust mean speed based on vehicle type
         if vehicle_type == "truck":
             mean = 70  # Trucks on toll: mean 70, max 80 km/h
@@ -115,26 +160,26 @@ class DataGenerator:
         # 15% chance of slow violation (below 60 km minimum)
         # 20% chance of speeding violation (above limit + 10-20km buffer)
         # 65% chance of normal/legal speeds
-        random_val = random.random()
+        random_val = rng.random()
         
         if random_val < 0.15:
             # Generate too-slow violation vehicle (below 60 km minimum)
             if vehicle_type == "truck":
-                speed = random.uniform(20, 59)  # Below truck minimum of 60
+                speed = rng.uniform(20, 59)  # Below truck minimum of 60
             else:
-                speed = random.uniform(20, 59)  # Below car minimum of 60
+                speed = rng.uniform(20, 59)  # Below car minimum of 60
                 
         elif random_val < 0.35:
             # Generate speeding violation (above limit with 10-20km tolerance/differentiation)
             if vehicle_type == "truck":
                 # Trucks: 80 km limit, allow 10-20 km over = 90-100 km violation
-                speed = random.uniform(85, 100)  # 5-20 km over truck limit
+                speed = rng.uniform(85, 100)  # 5-20 km over truck limit
             else:
                 # Cars: 100 km limit, allow 10-20 km over = 110-120 km violation
-                speed = random.uniform(105, 120)  # 5-20 km over car limit
+                speed = rng.uniform(105, 120)  # 5-20 km over car limit
         else:
             # Generate normal distribution around the mean (legal speeds)
-            speed = random.gauss(mean, Config.SPEED_STD_DEV)
+            speed = rng.gauss(mean, Config.SPEED_STD_DEV)
         
         # Enforce vehicle-specific speed limits with violation allowance
         if vehicle_type == "truck":
@@ -147,29 +192,39 @@ class DataGenerator:
         return round(speed, 1)
     
     @staticmethod
-    def generate_vehicle_batch():
+    def generate_vehicle_batch(rng: RNGContext = None, count: int = None):
         """Generate a batch of random vehicles with probability distribution:
         75% Pribadi (cars/motorcycles) - Private plate (BLACK)
         15% Barang/Truk/Angkutan Umum (commercial) - Truck plate (YELLOW)
         5% Pemerintah (government) - Government plate (RED)
         5% Kedutaan (diplomatic) - Diplomatic plate (WHITE)
+        
+        Args:
+            rng: Optional RNGContext; every draw (including plates and new owners)
+                 then comes from its stream, so batches are reproducible per seed
+            count: Number of vehicles (default: random MIN..MAX_VEHICLES_PER_BATCH)
         """
-        num_vehicles = random.randint(
-            Config.MIN_VEHICLES_PER_BATCH,
-            Config.MAX_VEHICLES_PER_BATCH
-        )
+        plate_gen = rng.plate_generator if rng else get_plate_generator()
+        rng = rng.random if rng else random
+        if count is not None:
+            num_vehicles = count
+        else:
+            num_vehicles = rng.randint(
+                Config.MIN_VEHICLES_PER_BATCH,
+                Config.MAX_VEHICLES_PER_BATCH
+            )
         
         vehicles = []
-        plate_gen = get_plate_generator()
+        drafts = []  # (vehicle_info, plate, class, category, plate_type, plate_color, speed)
         
-        for i in range(num_vehicles):
+        for _ in range(num_vehicles):
             # Select vehicle type by probability - MOTORCYCLES DISABLED (PP 43/1993)
-            rand = random.random()
+            category = DataGenerator.CATEGORY_SAMPLER.sample(rng)
             
-            if rand < 0.75:
+            if category == CATEGORY_PRIBADI:
                 # PRIBADI (75%) - Private cars ONLY (motorcycles disabled)
                 # No motorcycles on toll roads per PP 43/1993
-                vehicle_info = DataGenerator.generate_vehicle_from_cars_db()
+                vehicle_info = DataGenerator.generate_vehicle_from_cars_db(rng)
                 vehicle_class = 'roda_empat'
                 is_motorcycle = False  # DISABLED
                 
@@ -178,32 +233,22 @@ class DataGenerator:
                 plate_type = 'PRIBADI'
                 
                 # Generate private plate
-                region_code = random.choice(['B', 'D', 'F', 'H', 'L', 'AB', 'AG', 'AA', 'BL', 'BP', 'KB', 'KT', 'DK'])
+                region_code = DataGenerator.PRIVATE_REGION_SAMPLER.sample(rng)
                 plate_data = plate_gen.generate_private_plate(region_code)
                 license_plate = plate_data['plate']
                 
-            elif rand < 0.90:
+            elif category == CATEGORY_BARANG:
                 # BARANG/TRUK/ANGKUTAN UMUM (40%) - Commercial vehicles
-                vehicle_info = DataGenerator.generate_truck_from_db()
+                vehicle_info = DataGenerator.generate_truck_from_db(rng)
                 vehicle_class = 'roda_empat'
                 vehicle_category = VehicleCategory.BARANG.value
                 plate_color = 'YELLOW'
                 plate_type = 'NIAGA/TRUK'
                 
                 # Generate truck plate with random specifications
-                truck_type = random.choice([
-                    TruckSubType.GENERAL,
-                    TruckSubType.CONTAINER,
-                    TruckSubType.TANKER,
-                    TruckSubType.DUMP,
-                    TruckSubType.FLATBED
-                ])
-                truck_class = random.choice([
-                    TruckClass.LIGHT,
-                    TruckClass.MEDIUM,
-                    TruckClass.HEAVY
-                ])
-                region_code = random.choice(['B', 'D', 'F', 'H', 'L', 'AB', 'BL'])
+                truck_type = DataGenerator.TRUCK_TYPE_SAMPLER.sample(rng)
+                truck_class = DataGenerator.TRUCK_CLASS_SAMPLER.sample(rng)
+                region_code = DataGenerator.TRUCK_REGION_SAMPLER.sample(rng)
                 
                 plate_data = plate_gen.generate_truck_plate(
                     region_code=region_code,
@@ -212,58 +257,48 @@ class DataGenerator:
                 )
                 license_plate = plate_data['plate']
                 
-            elif rand < 0.95:
+            elif category == CATEGORY_PEMERINTAH:
                 # PEMERINTAH (5%) - Government vehicles
-                vehicle_info = DataGenerator.generate_vehicle_from_cars_db()
+                vehicle_info = DataGenerator.generate_vehicle_from_cars_db(rng)
                 vehicle_class = 'roda_empat'
                 vehicle_category = 'PEMERINTAH'
                 plate_color = 'RED'
                 plate_type = 'PEMERINTAH'
                 
                 # Generate government plate
-                agency = random.choice([
-                    GovernmentAgency.POLICE,
-                    GovernmentAgency.ARMY_LAND,
-                    GovernmentAgency.ARMY_NAVY,
-                    GovernmentAgency.ARMY_AIR,
-                    GovernmentAgency.PRESIDENCY,
-                    GovernmentAgency.PARLIAMENT
-                ])
+                agency = DataGenerator.AGENCY_SAMPLER.sample(rng)
                 
                 plate_data = plate_gen.generate_government_plate(agency)
                 license_plate = plate_data['plate']
                 
             else:
                 # KEDUTAAN (5%) - Diplomatic vehicles
-                vehicle_info = DataGenerator.generate_vehicle_from_cars_db()
+                vehicle_info = DataGenerator.generate_vehicle_from_cars_db(rng)
                 vehicle_class = 'roda_empat'
                 vehicle_category = 'KEDUTAAN'
                 plate_color = 'WHITE'
                 plate_type = 'DIPLOMATIK'
                 
                 # Generate diplomatic plate
-                country = random.choice([
-                    DiplomaticCountry.USA,
-                    DiplomaticCountry.CHINA,
-                    DiplomaticCountry.JAPAN,
-                    DiplomaticCountry.SOUTH_KOREA,
-                    DiplomaticCountry.SINGAPORE,
-                    DiplomaticCountry.MALAYSIA,
-                    DiplomaticCountry.THAILAND,
-                    DiplomaticCountry.VIETNAM,
-                    DiplomaticCountry.PHILIPPINES,
-                    DiplomaticCountry.INDIA
-                ])
-                is_consular = random.random() < 0.3
+                country = DataGenerator.COUNTRY_SAMPLER.sample(rng)
+                is_consular = rng.random() < 0.3
                 
                 plate_data = plate_gen.generate_diplomatic_plate(country, is_consular)
                 license_plate = plate_data['plate']
             
             vehicle_type = vehicle_info['type']
-            
-            # Get or create owner for this vehicle
-            # Pass vehicle_category so PEMERINTAH and KEDUTAAN vehicles get independent NIK generation
-            owner = owner_db.get_or_create_owner(license_plate, vehicle_class, vehicle_category=vehicle_category)
+            speed = DataGenerator.generate_speed(vehicle_type, rng)
+            drafts.append((vehicle_info, license_plate, vehicle_class, vehicle_category,
+                           plate_type, plate_color, speed))
+        
+        # Get or create the owners of the whole batch at once
+        # Pass vehicle_category so PEMERINTAH and KEDUTAAN vehicles get independent NIK generation
+        owners = owner_db.get_or_create_owners([draft[1] for draft in drafts],
+                                               [draft[2] for draft in drafts],
+                                               [draft[3] for draft in drafts], rng=rng)
+        
+        for i, (draft, owner) in enumerate(zip(drafts, owners)):
+            vehicle_info, license_plate, vehicle_class, vehicle_category, plate_type, plate_color, speed = draft
             
             # Use owner's actual region (from PLATE_DATA) to ensure consistency
             # This ensures the owner_region matches the plate's identified region
@@ -273,7 +308,7 @@ class DataGenerator:
                 vehicle_id=f"{vehicle_info['make'][:3].upper()}{i+1:04d}",
                 license_plate=license_plate,
                 vehicle_type=vehicle_class,  # 'roda_dua' or 'roda_empat'
-                speed=DataGenerator.generate_speed(vehicle_type),
+                speed=speed,
                 timestamp=datetime.now(),
                 owner_id=owner.owner_id,
                 owner_name=owner.name,
@@ -291,6 +326,205 @@ class DataGenerator:
         
         return vehicles
     
+    @staticmethod
+    def generate_chunk(count: int = None, rng: RNGContext = None, bulk: bool = False,
+                       fleet=None) -> Union[List[Vehicle], VehicleBatch]:
+        """Generate one chunk of vehicles, owners resolved
+        
+        Args:
+            count: Number of vehicles (default: random MIN..MAX_VEHICLES_PER_BATCH)
+            rng: Optional RNGContext
+            bulk: Build a columnar VehicleBatch instead of List[Vehicle]
+            fleet: Optional Fleet; the chunk is then sightings of its vehicles (columnar)
+        """
+        if not bulk and fleet is None:
+            return DataGenerator.generate_vehicle_batch(rng, count)
+        
+        if count is None:
+            stream = rng.random if rng else random
+            count = stream.randint(Config.MIN_VEHICLES_PER_BATCH, Config.MAX_VEHICLES_PER_BATCH)
+        if fleet is not None:
+            batch = fleet.sighting_batch(count)
+        else:
+            batch = DataGenerator.generate_vehicle_batch_bulk(count, rng=rng)
+        # Owners decide STNK/SIM penalties, so resolve them before checking
+        batch.resolve_owners()
+        return batch
+    
+    @staticmethod
+    def _paced_chunks(rate, chunk, rng, bulk, fleet, limit):
+        """Yield (chunk, seconds to wait before handing it out) for the iterators below"""
+        start = time.monotonic()
+        produced = 0
+        stream = rng.random if rng else random
+        while limit is None or produced < limit:
+            # Same first draw generate_vehicle_batch would make, so seeded streams match
+            count = chunk or stream.randint(Config.MIN_VEHICLES_PER_BATCH, Config.MAX_VEHICLES_PER_BATCH)
+            if limit is not None:
+                count = min(count, limit - produced)
+            vehicles = DataGenerator.generate_chunk(count, rng, bulk, fleet)
+            # Chunk k is due once the vehicles before it have been spread at `rate`
+            wait = start + produced / rate - time.monotonic() if rate else 0.0
+            produced += len(vehicles)
+            yield vehicles, max(0.0, wait)
+    
+    @staticmethod
+    def iter_vehicles(rate: float = None, chunk: int = None, rng: RNGContext = None,
+                      bulk: bool = False, fleet=None, limit: int = None) -> Iterator:
+        """Stream vehicles in chunks, indefinitely or until `limit` vehicles
+        
+        Chunks are generated only when the consumer asks for the next one, so a
+        slow consumer throttles generation (backpressure) and memory stays
+        bounded by one chunk.
+        
+        Args:
+            rate: Target vehicles per second (None = as fast as consumed)
+            chunk: Vehicles per chunk (default: random MIN..MAX_VEHICLES_PER_BATCH)
+            rng: Optional RNGContext for a reproducible stream
+            bulk: Yield columnar VehicleBatch chunks
+            fleet: Optional Fleet to draw sightings from
+            limit: Stop after this many vehicles (None = never stop)
+        """
+        for vehicles, wait in DataGenerator._paced_chunks(rate, chunk, rng, bulk, fleet, limit):
+            if wait:
+                time.sleep(wait)
+            yield vehicles
+    
+    @staticmethod
+    async def aiter_vehicles(rate: float = None, chunk: int = None, rng: RNGContext = None,
+                             bulk: bool = False, fleet=None, limit: int = None) -> AsyncIterator:
+        """Async variant of iter_vehicles
+        
+        Each chunk is generated in a worker thread (asyncio.to_thread) and pacing
+        awaits, so the event loop is never blocked.
+        """
+        chunks = DataGenerator._paced_chunks(rate, chunk, rng, bulk, fleet, limit)
+        while True:
+            item = await asyncio.to_thread(next, chunks, None)
+            if item is None:
+                return
+            vehicles, wait = item
+            await asyncio.sleep(wait)
+            yield vehicles
+    
+    @staticmethod
+    def _get_bulk_tables():
+        """Build (once) the vocabulary and per-model tables used by the bulk generator
+        
+        Returns:
+            (vocab, num_cars, num_trucks, truck_profile) where models [0, num_cars) are
+            CARS.md entries, the rest are trucks, and truck_profile[i] says whether model i
+            uses the truck speed profile (same rule as generate_speed)
+        """
+        if DataGenerator._bulk_tables is None:
+            cars = [(v['make'], v['model'], v['weight']) for v in DataGenerator.car_db.vehicles]
+            cars = cars or [('Unknown', 'Unknown', 'car')]
+            trucks = [(t['manufacturer'], t['model'], 'truck') for t in DataGenerator.truck_db.trucks]
+            trucks = trucks or [('Unknown', 'Unknown', 'truck')]
+            models = cars + trucks
+            
+            vocab = BatchVocabulary(
+                makes=[m[0] for m in models],
+                models=[m[1] for m in models],
+                regions=DataGenerator.PRIVATE_REGIONS,
+                letters=PlateCharacterValidator.VALID_LETTERS,
+                truck_codes=[t.value[1] for t in DataGenerator.TRUCK_TYPES],
+                truck_class_codes=[c.value[2] for c in DataGenerator.TRUCK_CLASSES],
+                truck_class_routed=[c in (TruckClass.MEDIUM, TruckClass.HEAVY)
+                                    for c in DataGenerator.TRUCK_CLASSES],
+                route_codes=[r.value[0] for r in TourRoute],
+                agency_codes=[a.value[0] for a in DataGenerator.AGENCIES],
+                country_codes=[c.value[0] for c in DataGenerator.COUNTRIES],
+            )
+            truck_profile = np.array([m[2] == 'truck' for m in models])
+            DataGenerator._bulk_tables = (vocab, len(cars), len(trucks), truck_profile)
+        return DataGenerator._bulk_tables
+    
+    @staticmethod
+    def generate_speeds_bulk(truck_profile: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Vectorized generate_speed: same mixture (15% slow, 20% speeding, 65% normal)
+        
+        Args:
+            truck_profile: Boolean array, True where the vehicle uses the truck profile
+            rng: NumPy random generator
+        """
+        n = len(truck_profile)
+        upper = np.where(truck_profile, 100.0, 120.0)
+        speed = rng.normal(np.where(truck_profile, 70.0, 85.0), Config.SPEED_STD_DEV)
+        
+        pick = rng.random(n)
+        slow = pick < 0.15
+        speed[slow] = rng.uniform(20, 59, slow.sum())
+        
+        fast = (pick >= 0.15) & (pick < 0.35)
+        fast_truck = fast & truck_profile
+        fast_car = fast & ~truck_profile
+        speed[fast_truck] = rng.uniform(85, 100, fast_truck.sum())
+        speed[fast_car] = rng.uniform(105, 120, fast_car.sum())
+        
+        return np.round(np.clip(speed, 20, upper), 1)
+    
+    @staticmethod
+    def generate_vehicle_batch_bulk(n: int, rng=None, resolve_owners: bool = True) -> VehicleBatch:
+        """Generate n vehicles at once as a columnar VehicleBatch
+        
+        Draws categories, make/model, speeds and plate parts for the whole batch
+        with NumPy using the same distributions as generate_vehicle_batch
+        (75% Pribadi, 15% Barang, 5% Pemerintah, 5% Kedutaan). Plates, owners and
+        Vehicle objects are only built when rows are read. The whole batch shares
+        one timestamp, and bulk plates are not added to the plate generator session.
+        
+        Args:
+            n: Number of vehicles
+            rng: RNGContext or NumPy Generator (default: fresh unseeded generator)
+            resolve_owners: Resolve owners via owner_db when rows are materialized
+        """
+        owner_rng = None
+        if isinstance(rng, RNGContext):
+            owner_rng = rng.random
+            rng = rng.numpy
+        rng = rng or np.random.default_rng()
+        vocab, num_cars, num_trucks, truck_profile = DataGenerator._get_bulk_tables()
+        
+        # Category from the same alias sampler as generate_vehicle_batch
+        category = DataGenerator.CATEGORY_SAMPLER.sample_indices(n, rng).astype(np.uint8)
+        is_barang = category == CATEGORY_BARANG
+        
+        # Make/model: trucks for Barang, CARS.md for every other category
+        model = rng.integers(0, num_cars, n, dtype=np.int32)
+        model[is_barang] = num_cars + rng.integers(0, num_trucks, is_barang.sum(), dtype=np.int32)
+        
+        # Plate parts (kind = region / agency / country index depending on category)
+        truck_regions = np.array([vocab.regions.index(r) for r in DataGenerator.TRUCK_REGIONS])
+        kind = DataGenerator.PRIVATE_REGION_SAMPLER.sample_indices(n, rng).astype(np.int16)
+        kind[is_barang] = truck_regions[DataGenerator.TRUCK_REGION_SAMPLER.sample_indices(is_barang.sum(), rng)]
+        is_gov = category == CATEGORY_PEMERINTAH
+        kind[is_gov] = DataGenerator.AGENCY_SAMPLER.sample_indices(is_gov.sum(), rng)
+        is_dip = category == CATEGORY_KEDUTAAN
+        kind[is_dip] = DataGenerator.COUNTRY_SAMPLER.sample_indices(is_dip.sum(), rng)
+        
+        num_digits = rng.integers(1, 5, n).astype(np.int8)
+        number = rng.integers(1, 10 ** num_digits.astype(np.int64)).astype(np.int32)
+        letter_count = rng.integers(1, 4, n).astype(np.int8)
+        letters = rng.integers(0, len(vocab.letters) ** letter_count.astype(np.int64)).astype(np.int32)
+        
+        columns = {
+            'category': category,
+            'model': model,
+            'speed': DataGenerator.generate_speeds_bulk(truck_profile[model], rng),
+            'kind': kind,
+            'number': number,
+            'num_digits': num_digits,
+            'letters': letters,
+            'letter_count': letter_count,
+            'truck_type': DataGenerator.TRUCK_TYPE_SAMPLER.sample_indices(n, rng).astype(np.int8),
+            'truck_class': DataGenerator.TRUCK_CLASS_SAMPLER.sample_indices(n, rng).astype(np.int8),
+            'route': rng.integers(0, len(vocab.route_codes), n).astype(np.int8),
+            'consular': rng.random(n) < 0.3,
+        }
+        return VehicleBatch(columns, vocab, timestamp=datetime.now(),
+                            owner_db=owner_db if resolve_owners else None, owner_rng=owner_rng)
+    
     @staticmethod
     def calculate_fine(speed, stnk_status: str = 'Active', sim_status: str = 'Active'):
         """
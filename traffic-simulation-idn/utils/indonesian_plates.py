@@ -8,13 +8,27 @@ Examples:
   - Mobil: B 5678 P ABC
 """
 
+import hashlib
 import json
 import random
-from typing import Dict, List, Tuple, Optional
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 from enum import Enum
 
+import numpy as np
+
+from config import Config
+from utils.admin_index import AdminNameIndex, KabupatenIndex, admin_level
+from utils.db_cache import load_cached
+from utils.logger import logger
+from utils.owner_snapshot import append_snapshot, delta_count, read_snapshot, write_snapshot
+from utils.owner_store import TieredOwnerStore
+from utils.region_matcher import get_region_matcher
+from utils.region_snapshot import load_snapshot
+from utils.rng import RNGContext
+
 
 class VehicleType(Enum):
     """Vehicle classification per Indonesian regulations"""
@@ -952,7 +966,8 @@ class IndonesianPlateManager:
     @classmethod
     def generate_plate(
         cls,
-        vehicle_type: VehicleType = VehicleType.RODA_DUA
+        vehicle_type: VehicleType = VehicleType.RODA_DUA,
+        rng=None
     ) -> Tuple[str, str, str, str]:
         """
         Generate Indonesian license plate following official nomenclature.
@@ -964,24 +979,26 @@ class IndonesianPlateManager:
         
         Args:
             vehicle_type: VehicleType enum value
+            rng: random.Random-compatible stream (default: random module)
             
         Returns:
             (plate_string, region_name, sub_region, vehicle_type_display)
         """
-        region_code = random.choice(list(cls.PLATE_DATA.keys()))
+        rng = rng or random
+        region_code = rng.choice(list(cls.PLATE_DATA.keys()))
         region_data = cls.PLATE_DATA[region_code]
-        sub_code = random.choice(list(region_data['sub_codes'].keys()))
+        sub_code = rng.choice(list(region_data['sub_codes'].keys()))
         sub_region = region_data['sub_codes'][sub_code]
         
         # Randomly choose 1, 2, 3, or 4 digit number
-        num_digits = random.choice([1, 2, 3, 4])
+        num_digits = rng.choice([1, 2, 3, 4])
         max_number = (10 ** num_digits) - 1
-        number = f"{random.randint(0, max_number):0{num_digits}d}"
+        number = f"{rng.randint(0, max_number):0{num_digits}d}"
         
         if vehicle_type == VehicleType.RODA_DUA:
-            owner_code = ''.join(random.choices(cls.OWNER_CODE_LETTERS, k=random.randint(1, 2)))
+            owner_code = ''.join(rng.choices(cls.OWNER_CODE_LETTERS, k=rng.randint(1, 2)))
         else:
-            owner_code = ''.join(random.choices(cls.OWNER_CODE_LETTERS, k=random.randint(2, 3)))
+            owner_code = ''.join(rng.choices(cls.OWNER_CODE_LETTERS, k=rng.randint(2, 3)))
         
         plate = f"{region_code} {number} {sub_code} {owner_code}"
         return plate, region_data['region_name'], sub_region, vehicle_type.value
@@ -1091,17 +1108,18 @@ class IndonesianPlateManager:
             return None
     
     @classmethod
-    def generate_nik_from_plate(cls, plate_region_code: str, sub_region: str = None) -> str:
+    def generate_nik_from_plate(cls, plate_region_code: str, sub_region: str = None, rng=None) -> str:
         """
         Generate NIK dari plate region dengan CSV administrative codes
         
         Format: Province(2) + City(2) + District(2) + BirthDay(2) + Month(2) + Year(2) + Sequential(4)
         Contoh: "B" + "Jakarta Selatan" -> 31.74.01 -> NIK = 3174DDMMYYSSSS
         """
+        rng = rng or random
         # Get province code from plate
         province_code = cls.get_province_code_from_plate_code(plate_region_code)
         if not province_code:
-            province_code = f"{random.randint(11, 94):02d}"
+            province_code = f"{rng.randint(11, 94):02d}"
         
         # Extract city and district from CSV if sub_region provided
         city_code = None
@@ -1109,7 +1127,7 @@ class IndonesianPlateManager:
         
         if sub_region:
             try:
-                csv_codes = cls._get_csv_codes_for_region(sub_region)
+                csv_codes = cls._get_csv_codes_for_region(sub_region, rng)
                 if csv_codes:
                     city_code = csv_codes['city']
                     district_code = csv_codes['district']
@@ -1122,9 +1140,9 @@ class IndonesianPlateManager:
                 plate_info = cls.PLATE_DATA[plate_region_code]
                 # Get a random sub_region from the sub_codes
                 if plate_info.get('sub_codes'):
-                    random_sub_region_name = random.choice(list(plate_info['sub_codes'].values()))
+                    random_sub_region_name = rng.choice(list(plate_info['sub_codes'].values()))
                     # Now search CSV for this sub_region name
-                    csv_codes = cls._get_csv_codes_for_region(random_sub_region_name)
+                    csv_codes = cls._get_csv_codes_for_region(random_sub_region_name, rng)
                     if csv_codes:
                         city_code = csv_codes['city']
                         district_code = csv_codes['district']
@@ -1133,26 +1151,26 @@ class IndonesianPlateManager:
         
         # Fallback to random if still not found
         if not city_code:
-            city_code = f"{random.randint(1, 99):02d}"
+            city_code = f"{rng.randint(1, 99):02d}"
         if not district_code:
-            district_code = f"{random.randint(1, 99):02d}"
+            district_code = f"{rng.randint(1, 99):02d}"
         
         # Birth info with gender indicator
-        day = random.randint(1, 28)
-        is_female = random.random() < 0.5
+        day = rng.randint(1, 28)
+        is_female = rng.random() < 0.5
         if is_female:
             day += 40
-        month = random.randint(1, 12)
-        year = random.randint(50, 99)
+        month = rng.randint(1, 12)
+        year = rng.randint(50, 99)
         
         # Sequential
-        seq = random.randint(1, 9999)
+        seq = rng.randint(1, 9999)
         
         nik = f"{province_code}{city_code}{district_code}{day:02d}{month:02d}{year:02d}{seq:04d}"
         return nik
     
     @staticmethod
-    def _get_csv_codes_for_region(sub_region: str) -> dict:
+    def _get_csv_codes_for_region(sub_region: str, rng=None) -> dict:
         """
         Extract city and district codes from base.csv for a given region
         
@@ -1165,76 +1183,58 @@ class IndonesianPlateManager:
         
         Returns: {'city': '74', 'district': '01', 'full': '31.74.01'} or None
         """
-        try:
-            base_csv_path = Path(__file__).parent.parent / 'base.csv'
-            if not base_csv_path.exists():
+        rng = rng or random
+        if not sub_region or not isinstance(sub_region, str):
+            return None
+        
+        code = IndonesianPlateManager._lookup_kabupaten_code(sub_region)
+        if not code:
+            return None
+        
+        province, city = code.split('.')
+        district = f"{rng.randint(1, 30):02d}"
+        return {
+            'city': city,
+            'district': district,
+            'full': f"{province}.{city}.{district}"
+        }
+    
+    # Kabupaten/kota index over base.csv (built on first use, shared by the process)
+    _KABUPATEN_INDEX = None
+    # sub_region -> XX.YY code (or None), see warm_admin_code_cache()
+    _KABUPATEN_CODE_MEMO: Dict[str, Optional[str]] = {}
+    
+    @staticmethod
+    def _lookup_kabupaten_code(sub_region: str) -> Optional[str]:
+        """Memoized KabupatenIndex lookup (None if unmatched or base.csv is missing)"""
+        memo = IndonesianPlateManager._KABUPATEN_CODE_MEMO
+        if sub_region not in memo:
+            index = IndonesianPlateManager._load_kabupaten_index()
+            if index is None:
                 return None
-            
-            if not sub_region or not isinstance(sub_region, str):
+            code = index.lookup(sub_region)
+            if code is None:
+                # No entry contains the name: take the best ranked match instead
+                match = get_region_matcher(1).best(sub_region)
+                code = match.code if match else None
+            memo[sub_region] = code
+        return memo[sub_region]
+    
+    @staticmethod
+    def _load_kabupaten_index() -> Optional[KabupatenIndex]:
+        """Index the KOTA/KAB entries (XX.YY codes) of base.csv, or None without base.csv"""
+        if IndonesianPlateManager._KABUPATEN_INDEX is None:
+            snapshot = load_snapshot()
+            if snapshot is None:
                 return None
             
-            sub_region_upper = sub_region.upper().strip()
-            
-            # Read all lines once
-            with open(base_csv_path, 'r', encoding='utf-8') as f:
-                all_lines = f.readlines()
-            
-            # Build a list of clean region words (remove Kota/Kabupaten/KAB/KOTA/ADM prefixes)
-            region_words = []
-            temp = sub_region_upper
-            for prefix in ['KOTA ', 'KAB. ', 'KABUPATEN ', 'ADM. ', 'KOTA ADM. ']:
-                temp = temp.replace(prefix, '', 1)
-            region_words = [w for w in temp.split() if w and len(w) > 2]
-            
-            # First pass: Try to find exact match in CSV (even with prefixes different)
-            for line in all_lines:
-                line = line.strip()
-                if not line or ',' not in line:
-                    continue
-                
-                parts = line.split(',', 1)
-                code = parts[0].strip()
-                name = parts[1].strip().upper()
-                
-                # Only look at city/kabupaten level entries (format: XX.YY)
-                if code.count('.') != 1 or ('KOTA' not in name and 'KAB' not in name):
-                    continue
-                
-                # Remove prefixes from CSV name too
-                csv_name = name
-                for prefix in ['KOTA ', 'KAB. ', 'KABUPATEN ', 'ADM. ', 'KOTA ADM. ']:
-                    csv_name = csv_name.replace(prefix, '', 1)
-                csv_name = csv_name.strip()
-                
-                # Check exact match of cleaned names
-                if csv_name == temp:
-                    code_parts = code.split('.')
-                    if len(code_parts) == 2:
-                        province = code_parts[0]
-                        city = code_parts[1]
-                        district = f"{random.randint(1, 30):02d}"
-                        return {
-                            'city': city,
-                            'district': district,
-                            'full': f"{province}.{city}.{district}"
-                        }
-                
-                # Check if all significant words match
-                if sub_region_upper in name or all(word in name for word in region_words):
-                    code_parts = code.split('.')
-                    if len(code_parts) == 2:
-                        province = code_parts[0]
-                        city = code_parts[1]
-                        district = f"{random.randint(1, 30):02d}"
-                        return {
-                            'city': city,
-                            'district': district,
-                            'full': f"{province}.{city}.{district}"
-                        }
-            
-            return None
-        except Exception as e:
-            return None
+            entries = []
+            for code, name in snapshot.entries(level=1):
+                name = name.upper()
+                if 'KOTA' in name or 'KAB' in name:
+                    entries.append((name, code))
+            IndonesianPlateManager._KABUPATEN_INDEX = KabupatenIndex(entries)
+        return IndonesianPlateManager._KABUPATEN_INDEX
     
     @classmethod
     def validate_plate(cls, plate: str) -> Dict:
@@ -1310,9 +1310,17 @@ class VehicleOwner:
         sub_region: str,
         stnk_status: bool,
         sim_status: bool,
-        vehicle_type: str = 'roda_dua'
+        vehicle_type: str = 'roda_dua',
+        rng=None,
+        stnk_expiry: Optional[datetime] = None,
+        sim_expiry: Optional[datetime] = None,
+        registration_date: Optional[datetime] = None
     ):
-        """Simple owner object"""
+        """Simple owner object (rng: random.Random-compatible stream, default: random module)
+        
+        Dates that are passed in are kept as is; missing ones are generated randomly.
+        """
+        rng = rng or random
         self.owner_id = owner_id
         self.name = name
         self.region = region
@@ -1320,12 +1328,15 @@ class VehicleOwner:
         self.stnk_status = stnk_status
         self.sim_status = sim_status
         self.vehicle_type = vehicle_type
-        self.stnk_expiry = self._generate_stnk_expiry(stnk_status)
-        self.sim_expiry = self._generate_sim_expiry(sim_status)
-        self.registration_date = datetime.now() - timedelta(days=random.randint(30, 365*3))
+        self.stnk_expiry = stnk_expiry or self._generate_stnk_expiry(stnk_status, rng)
+        self.sim_expiry = sim_expiry or self._generate_sim_expiry(sim_status, rng)
+        self.registration_date = registration_date or datetime.now() - timedelta(days=rng.randint(30, 365*3))
     
     # Load base.csv data for real administrative codes (cached for performance)
     _ADMIN_CODES_CACHE = None
+    _ADMIN_INDEX_CACHE = None
+    # (region, sub_region) -> resolved codes, see warm_admin_code_cache()
+    _ADMIN_CODE_MEMO: Dict[Tuple[str, Optional[str]], Tuple[Optional[str], Optional[str]]] = {}
     
     @staticmethod
     def _load_admin_codes_from_base_csv():
@@ -1333,38 +1344,72 @@ class VehicleOwner:
         if VehicleOwner._ADMIN_CODES_CACHE is not None:
             return VehicleOwner._ADMIN_CODES_CACHE
         
-        admin_data = {}
-        
         try:
-            base_csv_path = Path(__file__).parent.parent / 'base.csv'
-            
-            if not base_csv_path.exists():
+            snapshot = load_snapshot()
+            if snapshot is None:
                 # Fallback if file not found
                 return None
             
-            with open(base_csv_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    parts = line.split(',', 1)
-                    if len(parts) < 2:
-                        continue
-                    
-                    code = parts[0]
-                    name = parts[1]
-                    
-                    # Store mapping: name -> code
-                    admin_data[name.strip().upper()] = code
-            
+            # Store mapping: name -> code
+            admin_data = {name.upper(): code for code, name in snapshot.entries()}
             VehicleOwner._ADMIN_CODES_CACHE = admin_data
             return admin_data
         except Exception:
             return None
     
     @staticmethod
-    def _extract_administrative_codes(region: str, sub_region: str) -> Tuple[str, str]:
+    def _load_admin_indexes() -> Tuple[AdminNameIndex, AdminNameIndex]:
+        """Kabupaten and kecamatan name indexes over base.csv (built once, in base.csv order)"""
+        if VehicleOwner._ADMIN_INDEX_CACHE is None:
+            admin_data = VehicleOwner._load_admin_codes_from_base_csv() or {}
+            VehicleOwner._ADMIN_INDEX_CACHE = (
+                AdminNameIndex((name, code) for name, code in admin_data.items() if admin_level(code) == 1),
+                AdminNameIndex((name, code) for name, code in admin_data.items() if admin_level(code) == 2),
+            )
+        return VehicleOwner._ADMIN_INDEX_CACHE
+    
+    @staticmethod
+    def _resolve_admin_codes(region: str, sub_region: str) -> Tuple[Optional[str], Optional[str]]:
+        """Full base.csv kabupaten (XX.YY) and kecamatan (XX.YY.ZZ) codes for a region, None if unmatched"""
+        district_index, subdistrict_index = VehicleOwner._load_admin_indexes()
+        districts, subdistricts = get_region_matcher(1), get_region_matcher(2)
+        region_upper = region.upper()
+        sub_region_upper = sub_region.upper() if sub_region else None
+        
+        def best_code(matcher, name, prefix=None):
+            match = matcher.best(name, prefix) if matcher else None
+            return match.code if match else None
+        
+        # District (XX.YY): sub_region is more specific, then region; whole name first, then best ranked match
+        district_code = None
+        if sub_region_upper:
+            district_code = (district_index.code_containing(sub_region_upper)
+                             or best_code(districts, sub_region_upper))
+        if not district_code:
+            district_code = (district_index.code_containing(region_upper)
+                             or best_code(districts, region_upper))
+        
+        # Subdistrict (XX.YY.ZZ) from sub_region name; ranked matches only inside the district
+        subdistrict_code = None
+        if sub_region_upper:
+            subdistrict_code = (subdistrict_index.code_containing(sub_region_upper)
+                                or best_code(subdistricts, sub_region_upper,
+                                             f"{district_code}." if district_code else None))
+        return district_code, subdistrict_code
+    
+    @staticmethod
+    def _lookup_admin_codes(region: str, sub_region: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """Memoized _resolve_admin_codes (None if base.csv is not available)"""
+        codes = VehicleOwner._ADMIN_CODE_MEMO.get((region, sub_region))
+        if codes is None:
+            if VehicleOwner._load_admin_codes_from_base_csv() is None:
+                return None
+            codes = VehicleOwner._resolve_admin_codes(region, sub_region)
+            VehicleOwner._ADMIN_CODE_MEMO[(region, sub_region)] = codes
+        return codes
+    
+    @staticmethod
+    def _extract_administrative_codes(region: str, sub_region: str, rng=None) -> Tuple[str, str]:
         """
         Extract real district and subdistrict codes from base.csv data
         
@@ -1377,92 +1422,30 @@ class VehicleOwner:
         - District/Kabupaten: 11.01 (Aceh Selatan)
         - Subdistrict/Kecamatan: 11.01.01 (Bakongan)
         """
-        # Load admin data
-        admin_data = VehicleOwner._load_admin_codes_from_base_csv()
-        
-        if admin_data is None:
+        rng = rng or random
+        codes = VehicleOwner._lookup_admin_codes(region, sub_region)
+        if codes is None:
             # Fallback to random if CSV not available
-            return f"{random.randint(1, 99):02d}", f"{random.randint(1, 99):02d}"
-        
-        # Look up district code from region name or sub_region
-        region_upper = region.upper()
-        district_code = None
-        
-        # First, try to find district using sub_region (which is more specific)
-        if sub_region:
-            sub_region_upper = sub_region.upper()
-            # Search for district level codes using sub_region
-            for name, code in admin_data.items():
-                # Match district level codes (format: XX.YY)
-                if '.' in code and code.count('.') == 1:
-                    if sub_region_upper in name:
-                        district_code = code
-                        break
-            
-            # If not found, try partial match with sub_region
-            if not district_code:
-                for name, code in admin_data.items():
-                    if '.' in code and code.count('.') == 1:
-                        if any(word in name for word in sub_region_upper.split()):
-                            district_code = code
-                            break
-        
-        # Fallback: Search for matching district using region name
-        if not district_code:
-            for name, code in admin_data.items():
-                # Match district level codes (format: XX.YY)
-                if '.' in code and code.count('.') == 1:
-                    if region_upper in name or region.upper() in name:
-                        district_code = code
-                        break
-        
-        # If still not found, try partial match with region
-        if not district_code:
-            for name, code in admin_data.items():
-                if '.' in code and code.count('.') == 1:
-                    if any(word in name for word in region_upper.split()):
-                        district_code = code
-                        break
-        
-        # Look up subdistrict code from sub_region name
-        subdistrict_code = None
-        
-        if sub_region:
-            sub_region_upper = sub_region.upper()
-            
-            # Search for matching subdistrict
-            for name, code in admin_data.items():
-                # Match subdistrict level codes (format: XX.YY.ZZ)
-                if code.count('.') == 2:
-                    if sub_region_upper in name or sub_region.upper() in name:
-                        subdistrict_code = code
-                        break
-            
-            # If not found, try partial match
-            if not subdistrict_code:
-                for name, code in admin_data.items():
-                    if code.count('.') == 2:
-                        if any(word in name for word in sub_region_upper.split()):
-                            subdistrict_code = code
-                            break
+            return f"{rng.randint(1, 99):02d}", f"{rng.randint(1, 99):02d}"
+        district_code, subdistrict_code = codes
         
         # Extract the numeric parts from codes
         if district_code and '.' in district_code:
             dist_parts = district_code.split('.')
-            district_num = dist_parts[1] if len(dist_parts) > 1 else f"{random.randint(1, 99):02d}"
+            district_num = dist_parts[1] if len(dist_parts) > 1 else f"{rng.randint(1, 99):02d}"
         else:
-            district_num = f"{random.randint(1, 99):02d}"
+            district_num = f"{rng.randint(1, 99):02d}"
         
         if subdistrict_code and '.' in subdistrict_code:
             subdist_parts = subdistrict_code.split('.')
-            subdistrict_num = subdist_parts[2] if len(subdist_parts) > 2 else f"{random.randint(1, 99):02d}"
+            subdistrict_num = subdist_parts[2] if len(subdist_parts) > 2 else f"{rng.randint(1, 99):02d}"
         else:
-            subdistrict_num = f"{random.randint(1, 99):02d}"
+            subdistrict_num = f"{rng.randint(1, 99):02d}"
         
         return district_num, subdistrict_num
     
     @staticmethod
-    def generate_random_owner(region: str, sub_region: str, vehicle_type: str = 'roda_dua', required_province_code: Optional[str] = None, is_special_plate: bool = False) -> 'VehicleOwner':
+    def generate_random_owner(region: str, sub_region: str, vehicle_type: str = 'roda_dua', required_province_code: Optional[str] = None, is_special_plate: bool = False, rng=None) -> 'VehicleOwner':
         """
         Generate random owner with NIK synchronized to plate region.
         
@@ -1472,15 +1455,17 @@ class VehicleOwner:
             vehicle_type: 'roda_dua' (motorcycle) or 'roda_empat' (car)
             required_province_code: Province code from plate (e.g., '31' for Jakarta)
             is_special_plate: If True, use generic codes for special plates (RI, CD, CC)
+            rng: random.Random-compatible stream (default: random module)
         
         Returns:
             VehicleOwner with valid NIK matching plate region
         """
+        rng = rng or random
         # Step 1: Province code (from plate or random)
         if required_province_code:
             province_code = required_province_code
         else:
-            province_code = f"{random.randint(1, 34):02d}"
+            province_code = f"{rng.randint(1, 34):02d}"
         
         # Step 2: Extract administrative codes from region/sub_region (skip for special plates)
         if is_special_plate:
@@ -1488,37 +1473,37 @@ class VehicleOwner:
             district_code = '00'
             subdistrict_code = '00'
         else:
-            district_code, subdistrict_code = VehicleOwner._extract_administrative_codes(region, sub_region)
+            district_code, subdistrict_code = VehicleOwner._extract_administrative_codes(region, sub_region, rng)
         
         # Step 3: Randomize birth data
-        birth_day = random.randint(1, 28)
-        is_female = random.random() < 0.5
+        birth_day = rng.randint(1, 28)
+        is_female = rng.random() < 0.5
         if is_female:
             birth_day += 40
         birth_date = f"{birth_day:02d}"
         
-        birth_month = f"{random.randint(1, 12):02d}"
-        birth_year = f"{random.randint(50, 99):02d}"
+        birth_month = f"{rng.randint(1, 12):02d}"
+        birth_year = f"{rng.randint(50, 99):02d}"
         
         # Step 4: Randomize sequential number
-        sequential_number = f"{random.randint(1, 9999):04d}"
+        sequential_number = f"{rng.randint(1, 9999):04d}"
         
         # Construct NIK: [province][district][subdistrict][birth_date][birth_month][birth_year][sequential]
         owner_id = f"{province_code}{district_code}{subdistrict_code}{birth_date}{birth_month}{birth_year}{sequential_number}"
         
         # Generate name
-        first_name = random.choice(VehicleOwner.INDONESIAN_FIRST_NAMES)
-        last_name = random.choice(VehicleOwner.INDONESIAN_LAST_NAMES)
+        first_name = rng.choice(VehicleOwner.INDONESIAN_FIRST_NAMES)
+        last_name = rng.choice(VehicleOwner.INDONESIAN_LAST_NAMES)
         name = f"{first_name} {last_name}"
         
         # Randomize document status
-        stnk_status = random.random() < 0.7
-        sim_status = random.random() < 0.8
+        stnk_status = rng.random() < 0.7
+        sim_status = rng.random() < 0.8
         
-        return VehicleOwner(owner_id, name, region, sub_region, stnk_status, sim_status, vehicle_type)
+        return VehicleOwner(owner_id, name, region, sub_region, stnk_status, sim_status, vehicle_type, rng)
     
     @staticmethod
-    def generate_independent_nik(region: str, sub_region: str, vehicle_type: str = 'roda_dua') -> 'VehicleOwner':
+    def generate_independent_nik(region: str, sub_region: str, vehicle_type: str = 'roda_dua', rng=None) -> 'VehicleOwner':
         """
         Generate owner with completely independent NIK NOT based on plate region.
         Used for special vehicle categories: PEMERINTAH (Government) and KEDUTAAN (Diplomatic)
@@ -1531,56 +1516,137 @@ class VehicleOwner:
         Returns:
             VehicleOwner with valid independent NIK (not tied to any plate region)
         """
+        rng = rng or random
         # Generate completely random province code (01-34) - NOT from plate
-        province_code = f"{random.randint(1, 34):02d}"
+        province_code = f"{rng.randint(1, 34):02d}"
         
         # Generate random administrative codes (not extracted from CSV)
-        district_code = f"{random.randint(1, 99):02d}"
-        subdistrict_code = f"{random.randint(1, 99):02d}"
+        district_code = f"{rng.randint(1, 99):02d}"
+        subdistrict_code = f"{rng.randint(1, 99):02d}"
         
         # Randomize birth data
-        birth_day = random.randint(1, 28)
-        is_female = random.random() < 0.5
+        birth_day = rng.randint(1, 28)
+        is_female = rng.random() < 0.5
         if is_female:
             birth_day += 40
         birth_date = f"{birth_day:02d}"
         
-        birth_month = f"{random.randint(1, 12):02d}"
-        birth_year = f"{random.randint(50, 99):02d}"
+        birth_month = f"{rng.randint(1, 12):02d}"
+        birth_year = f"{rng.randint(50, 99):02d}"
         
         # Randomize sequential number
-        sequential_number = f"{random.randint(1, 9999):04d}"
+        sequential_number = f"{rng.randint(1, 9999):04d}"
         
         # Construct NIK: [province][district][subdistrict][birth_date][birth_month][birth_year][sequential]
         owner_id = f"{province_code}{district_code}{subdistrict_code}{birth_date}{birth_month}{birth_year}{sequential_number}"
         
         # Generate name
-        first_name = random.choice(VehicleOwner.INDONESIAN_FIRST_NAMES)
-        last_name = random.choice(VehicleOwner.INDONESIAN_LAST_NAMES)
+        first_name = rng.choice(VehicleOwner.INDONESIAN_FIRST_NAMES)
+        last_name = rng.choice(VehicleOwner.INDONESIAN_LAST_NAMES)
         name = f"{first_name} {last_name}"
         
         # Randomize document status
-        stnk_status = random.random() < 0.7
-        sim_status = random.random() < 0.8
+        stnk_status = rng.random() < 0.7
+        sim_status = rng.random() < 0.8
         
-        return VehicleOwner(owner_id, name, region, sub_region, stnk_status, sim_status, vehicle_type)
+        return VehicleOwner(owner_id, name, region, sub_region, stnk_status, sim_status, vehicle_type, rng)
     
     @staticmethod
-    def _generate_stnk_expiry(is_active: bool) -> datetime:
+    def generate_owners_bulk(
+        specs: List[Tuple[str, str, Optional[str], Optional[str], Optional[str]]],
+        vehicle_type: str = 'roda_dua',
+        rng=None,
+        now: Optional[datetime] = None
+    ) -> List['VehicleOwner']:
+        """
+        Generate many owners at once with NumPy
+        
+        Same NIK format and distributions as generate_random_owner /
+        generate_independent_nik, but birth data, sequence numbers, names,
+        document status and expiry offsets are drawn as arrays for the whole
+        batch, and every date is relative to a single `now`.
+        
+        Args:
+            specs: (region, sub_region, province_code, district_code, subdistrict_code)
+                per owner; a None code is drawn at random (province 01-34,
+                district/subdistrict 01-99), like generate_independent_nik
+            vehicle_type: 'roda_dua' or 'roda_empat'
+            rng: RNGContext or NumPy Generator (default: fresh unseeded generator)
+            now: Reference time for expiry and registration dates (default: datetime.now())
+        
+        Returns:
+            One VehicleOwner per spec, in order
+        """
+        if isinstance(rng, RNGContext):
+            rng = rng.numpy
+        rng = rng or np.random.default_rng()
+        now = now or datetime.now()
+        n = len(specs)
+        if n == 0:
+            return []
+        
+        # Administrative prefix: given codes, random where missing
+        codes = np.array([[-1 if c is None else int(c) for c in spec[2:5]] for spec in specs],
+                         dtype=np.int64).reshape(n, 3)
+        random_codes = np.column_stack([
+            rng.integers(1, 35, n), rng.integers(1, 100, n), rng.integers(1, 100, n)
+        ])
+        codes = np.where(codes < 0, random_codes, codes)
+        
+        # Birth data (+40 on the day for women) and sequential number
+        birth_day = rng.integers(1, 29, n) + 40 * (rng.random(n) < 0.5)
+        birth_month = rng.integers(1, 13, n)
+        birth_year = rng.integers(50, 100, n)
+        sequential = rng.integers(1, 10000, n)
+        
+        # NIK: [province][district][subdistrict][birth_date][birth_month][birth_year][sequential]
+        nik = (((((codes[:, 0] * 100 + codes[:, 1]) * 100 + codes[:, 2]) * 100 + birth_day) * 100
+                + birth_month) * 100 + birth_year) * 10000 + sequential
+        
+        first = rng.integers(0, len(VehicleOwner.INDONESIAN_FIRST_NAMES), n)
+        last = rng.integers(0, len(VehicleOwner.INDONESIAN_LAST_NAMES), n)
+        
+        # Document status and day offsets (same ranges as _generate_*_expiry)
+        stnk_status = rng.random(n) < 0.7
+        sim_status = rng.random(n) < 0.8
+        stnk_days = np.where(stnk_status, rng.integers(30, 365*5 + 1, n), -rng.integers(30, 731, n))
+        sim_days = np.where(sim_status, rng.integers(30, 365*5 + 1, n), -rng.integers(30, 1096, n))
+        registration_days = rng.integers(30, 365*3 + 1, n)
+        
+        first_names = VehicleOwner.INDONESIAN_FIRST_NAMES
+        last_names = VehicleOwner.INDONESIAN_LAST_NAMES
+        return [
+            VehicleOwner(
+                f"{nik_value:016d}", f"{first_names[f]} {last_names[l]}", spec[0], spec[1],
+                stnk, sim, vehicle_type,
+                stnk_expiry=now + timedelta(days=stnk_day),
+                sim_expiry=now + timedelta(days=sim_day),
+                registration_date=now - timedelta(days=reg_day)
+            )
+            for spec, nik_value, f, l, stnk, sim, stnk_day, sim_day, reg_day in zip(
+                specs, nik.tolist(), first.tolist(), last.tolist(), stnk_status.tolist(),
+                sim_status.tolist(), stnk_days.tolist(), sim_days.tolist(), registration_days.tolist()
+            )
+        ]
+    
+    @staticmethod
+    def _generate_stnk_expiry(is_active: bool, rng=None) -> datetime:
+        rng = rng or random
         if is_active:
-            days = random.randint(30, 365*5)
+            days = rng.randint(30, 365*5)
             return datetime.now() + timedelta(days=days)
         else:
-            days = -random.randint(30, 730)
+            days = -rng.randint(30, 730)
             return datetime.now() + timedelta(days=days)
     
     @staticmethod
-    def _generate_sim_expiry(is_active: bool) -> datetime:
+    def _generate_sim_expiry(is_active: bool, rng=None) -> datetime:
+        rng = rng or random
         if is_active:
-            days = random.randint(30, 365*5)
+            days = rng.randint(30, 365*5)
             return datetime.now() + timedelta(days=days)
         else:
-            days = -random.randint(30, 1095)
+            days = -rng.randint(30, 1095)
             return datetime.now() + timedelta(days=days)
     
     def get_vehicle_type_display(self) -> str:
@@ -1608,6 +1674,28 @@ class VehicleOwner:
         """Check if owner has inactive STNK or SIM"""
         return not self.stnk_status or not self.sim_status
     
+    # Dates in rows are microseconds since this (naive) epoch, so round trips are exact
+    _ROW_EPOCH = datetime(1970, 1, 1)
+    
+    def to_row(self) -> Tuple:
+        """Compact tuple with every field, including exact dates (see from_row)"""
+        epoch, micro = VehicleOwner._ROW_EPOCH, timedelta(microseconds=1)
+        return (self.owner_id, self.name, self.region, self.sub_region, self.stnk_status,
+                self.sim_status, self.vehicle_type, (self.stnk_expiry - epoch) // micro,
+                (self.sim_expiry - epoch) // micro, (self.registration_date - epoch) // micro)
+    
+    @staticmethod
+    def from_row(row: Tuple) -> 'VehicleOwner':
+        """Rebuild an owner from to_row() without regenerating anything"""
+        epoch = VehicleOwner._ROW_EPOCH
+        owner_id, name, region, sub_region, stnk, sim, vehicle_type, stnk_us, sim_us, registered_us = row
+        return VehicleOwner(
+            owner_id, name, region, sub_region, bool(stnk), bool(sim), vehicle_type,
+            stnk_expiry=epoch + timedelta(microseconds=stnk_us),
+            sim_expiry=epoch + timedelta(microseconds=sim_us),
+            registration_date=epoch + timedelta(microseconds=registered_us)
+        )
+    
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
         return {
@@ -1625,21 +1713,99 @@ class VehicleOwner:
         }
 
 
+def _code_part(code: Optional[str], index: int) -> Optional[str]:
+    """One dotted component of a base.csv code (e.g. '11.01.05', 1 -> '01'), None if absent"""
+    parts = code.split('.') if code else []
+    return parts[index] if len(parts) > index else None
+
+
 class OwnerDatabase:
-    """Database for storing vehicle owners by license plate"""
+    """Database for storing vehicle owners by license plate (safe to share between threads)"""
+    
+    LOCK_STRIPES = 64
+    # Incremental snapshot saves append deltas until the file holds this many of them
+    MAX_SNAPSHOT_DELTAS = 16
     
-    def __init__(self):
-        self.owners: Dict[str, VehicleOwner] = {}
+    def __init__(self, max_memory_owners: Optional[int] = None, spill_path: Optional[str] = None):
+        """
+        Args:
+            max_memory_owners: Keep at most this many owners in memory and spill the
+                least recently used ones to SQLite (None = unbounded dict)
+            spill_path: SQLite file for spilled owners (default: private temporary file)
+        """
+        if max_memory_owners:
+            self.owners = TieredOwnerStore(max_memory_owners, VehicleOwner.to_row,
+                                           VehicleOwner.from_row, spill_path)
+        else:
+            self.owners: Dict[str, VehicleOwner] = {}
+        # Lock striping: plates hash onto a few locks, so workers creating owners
+        # for different plates rarely wait on each other
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        # Plates added since the last snapshot save/load of _snapshot_path
+        # (only tracked once a snapshot file is in use)
+        self._dirty = set()
+        self._dirty_lock = threading.Lock()
+        self._save_lock = threading.RLock()
+        self._snapshot_path = None
+        self._autosave = None  # (filepath, every N new owners)
+    
+    def _stripe(self, plate: str) -> threading.Lock:
+        """Lock guarding owner creation for a plate"""
+        return self._locks[hash(plate) % len(self._locks)]
+    
+    def get_stats(self) -> Dict:
+        """Owner count plus tier counters when the store is bounded"""
+        if isinstance(self.owners, TieredOwnerStore):
+            return {'owners': len(self.owners), **self.owners.get_stats()}
+        return {'owners': len(self.owners)}
     
     def register_vehicle(self, plate: str, owner: VehicleOwner) -> None:
         """Register a vehicle with its owner"""
-        self.owners[plate] = owner
+        with self._stripe(plate):
+            self.owners[plate] = owner
+            self._mark_dirty(plate)
+        self._maybe_autosave()
+    
+    def clear(self) -> None:
+        """Forget every owner"""
+        self.owners.clear()
+        with self._dirty_lock:
+            self._dirty.clear()
+    
+    def _mark_dirty(self, plate: str) -> None:
+        """Remember a new owner for the next incremental snapshot save"""
+        if self._snapshot_path is not None or self._autosave is not None:
+            with self._dirty_lock:
+                self._dirty.add(plate)
+    
+    def _maybe_autosave(self) -> None:
+        """Append a delta once enough new owners have piled up (see autosave)"""
+        autosave = self._autosave
+        if autosave is None or len(self._dirty) < autosave[1]:
+            return
+        with self._save_lock:
+            if len(self._dirty) < autosave[1]:
+                return  # Another worker saved meanwhile
+            try:
+                self.save_snapshot(autosave[0])
+            except OSError as e:
+                logger.warning(f"Owner autosave to {autosave[0]} failed, disabling it: {e}")
+                self._autosave = None
+    
+    def autosave(self, filepath: Optional[str], every: int) -> None:
+        """
+        Save a snapshot delta to filepath after every `every` new owners
+        
+        Keeps the set of unsaved plates bounded and limits what a crash can
+        lose. filepath None turns autosaving off.
+        """
+        self._autosave = (filepath, max(1, every)) if filepath else None
     
     def get_owner(self, plate: str) -> Optional[VehicleOwner]:
         """Get owner by plate number"""
         return self.owners.get(plate)
     
-    def get_or_create_owner(self, plate: str, vehicle_type: str = 'roda_dua', vehicle_category: str = None) -> VehicleOwner:
+    def get_or_create_owner(self, plate: str, vehicle_type: str = 'roda_dua', vehicle_category: str = None, rng=None) -> VehicleOwner:
         """Get existing owner or create a new one with KTP-Plate synchronization
         
         Extracts region information from plate number to generate owner from correct region.
@@ -1651,99 +1817,226 @@ class OwnerDatabase:
             plate: License plate string
             vehicle_type: 'roda_dua' or 'roda_empat'
             vehicle_category: Optional - 'PEMERINTAH' or 'KEDUTAAN' for independent NIK generation
+            rng: random.Random-compatible stream used when a new owner is created
+        """
+        rng = rng or random
+        owner = self.owners.get(plate)
+        if owner is not None:
+            return owner
+        
+        # Check again under the plate's stripe lock: concurrent workers create one owner per plate
+        with self._stripe(plate):
+            if plate in self.owners:
+                return self.owners[plate]
+            owner = self._create_owner(plate, vehicle_type, vehicle_category, rng)
+            self.owners[plate] = owner
+            self._mark_dirty(plate)
+        self._maybe_autosave()
+        return owner
+    
+    def _create_owner(self, plate: str, vehicle_type: str, vehicle_category: Optional[str], rng) -> VehicleOwner:
+        """Build a new owner for a plate (does not register it)"""
+        kind, region, sub_region, province_code = self._owner_spec(plate, vehicle_category, rng)
+        
+        if kind == 'independent':
+            # Generate completely independent NIK for special vehicles
+            # NOT based on plate region codes
+            return VehicleOwner.generate_independent_nik(region, sub_region, vehicle_type, rng=rng)
+        
+        # Create new owner with synchronized province code from plate
+        # Special plates (RI/CD/CC) skip administrative code extraction
+        return VehicleOwner.generate_random_owner(
+            region, 
+            sub_region, 
+            vehicle_type,
+            required_province_code=province_code,  # SYNCHRONIZATION POINT
+            is_special_plate=(kind == 'special'),
+            rng=rng
+        )
+    
+    @staticmethod
+    def _owner_spec(plate: str, vehicle_category: Optional[str], rng) -> Tuple[str, str, str, Optional[str]]:
         """
-        if plate in self.owners:
-            return self.owners[plate]
+        Where a new owner of a plate comes from
         
+        Returns:
+            (kind, region, sub_region, province_code) where kind is 'independent'
+            (PEMERINTAH/KEDUTAAN category, NIK not tied to the plate), 'special'
+            (RI/CD/CC plates, no administrative codes) or 'regional'
+        """
         # Extract plate code (first part of plate before space)
         parts = plate.split()
         plate_code = parts[0] if parts else 'B'
         
-        # Parse plate to get region information
-        plate_info = IndonesianPlateManager.parse_plate(plate)
-        
         # Handle special vehicle categories: Government (PEMERINTAH) and Diplomatic (KEDUTAAN)
         # These use independent NIK generation that doesn't depend on plate region
-        if vehicle_category in ('PEMERINTAH', 'KEDUTAAN'):
-            if vehicle_category == 'PEMERINTAH':
-                region = 'Pemerintah Indonesia'
-                sub_region = 'Pemerintah Indonesia'
-            else:  # KEDUTAAN
-                region = 'Diplomatik'
-                sub_region = 'Diplomatik'
-            
-            # Generate completely independent NIK for special vehicles
-            # NOT based on plate region codes
-            owner = VehicleOwner.generate_independent_nik(
-                region, 
-                sub_region, 
-                vehicle_type
-            )
-            self.owners[plate] = owner
-            return owner
+        if vehicle_category == 'PEMERINTAH':
+            return 'independent', 'Pemerintah Indonesia', 'Pemerintah Indonesia', None
+        if vehicle_category == 'KEDUTAAN':
+            return 'independent', 'Diplomatik', 'Diplomatik', None
         
         # Handle special plates: Government (RI) and Diplomatic (CD/CC)
-        if plate_code in ('RI', 'CD', 'CC'):
-            # These are special plates without regional mapping
-            # Generate owner with only province code (no administrative codes)
-            if plate_code == 'RI':
-                region = 'Pemerintah Indonesia'
-                sub_region = 'Pemerintah Indonesia'
-                # Use a special code for government vehicles
-                province_code = '00'  # Special code for government
-            else:  # CD or CC (Diplomatic)
-                region = 'Diplomatik'
-                sub_region = 'Diplomatik'
-                # Use a special code for diplomatic vehicles
-                province_code = '99'  # Special code for diplomatic
-            
-            # Create owner WITHOUT extracting administrative codes
-            owner = VehicleOwner.generate_random_owner(
-                region, 
-                sub_region, 
-                vehicle_type,
-                required_province_code=province_code,
-                is_special_plate=True  # Flag to skip administrative code extraction
-            )
-            self.owners[plate] = owner
-            return owner
+        # These are special plates without regional mapping, only a special province code
+        if plate_code == 'RI':
+            return 'special', 'Pemerintah Indonesia', 'Pemerintah Indonesia', '00'
+        if plate_code in ('CD', 'CC'):
+            return 'special', 'Diplomatik', 'Diplomatik', '99'
         
         # Get the required province code from plate for KTP synchronization
         required_province_code = IndonesianPlateManager.get_province_code_from_plate_code(plate_code)
         
-        # Get sub_region from parsed plate (which now correctly extracts it from plate letters)
-        sub_region = None
+        # Get sub_region from parsed plate (which correctly maps letter to city)
+        plate_info = IndonesianPlateManager.parse_plate(plate)
         if plate_info and 'sub_region' in plate_info:
-            # Use the parsed plate's sub_region which correctly maps letter to city
-            sub_region = plate_info['sub_region']
-            region = plate_info['region_name']
-        elif plate_code in IndonesianPlateManager.PLATE_DATA:
+            return 'regional', plate_info['region_name'], plate_info['sub_region'], required_province_code
+        
+        if plate_code in IndonesianPlateManager.PLATE_DATA:
             # Fallback: get region from PLATE_DATA
             plate_data = IndonesianPlateManager.PLATE_DATA[plate_code]
             region = plate_data['region_name']
             # Pick a random sub_region from sub_codes if no parsed sub_region available
             if plate_data.get('sub_codes'):
-                sub_region = random.choice(list(plate_data['sub_codes'].values()))
+                sub_region = rng.choice(list(plate_data['sub_codes'].values()))
             else:
                 sub_region = region
-        else:
-            # Final fallback
-            region = 'Jakarta'
-            sub_region = 'Jakarta'
-            required_province_code = '31'
+            return 'regional', region, sub_region, required_province_code
         
-        # Create new owner with synchronized province code from plate
-        # IMPORTANT: Pass sub_region to get_or_create_owner to use CSV administrative codes
-        owner = VehicleOwner.generate_random_owner(
-            region, 
-            sub_region, 
-            vehicle_type,
-            required_province_code=required_province_code,  # SYNCHRONIZATION POINT
-            is_special_plate=False
-        )
-        self.owners[plate] = owner
+        # Final fallback
+        return 'regional', 'Jakarta', 'Jakarta', '31'
+    
+    def get_or_create_owners(self, plates: Sequence[str], vehicle_classes=None, categories=None,
+                             rng=None) -> List[VehicleOwner]:
+        """
+        get_or_create_owner for a whole batch of plates
         
-        return owner
+        Plates repeated within the batch are resolved once, existing owners are
+        reused, administrative codes are looked up once per (region, sub_region)
+        and all missing owners are drawn together with generate_owners_bulk.
+        
+        Args:
+            plates: License plate strings
+            vehicle_classes: 'roda_dua'/'roda_empat' per plate, or one value for all (default 'roda_dua')
+            categories: Vehicle category per plate (only PEMERINTAH/KEDUTAAN matter), or one value for all
+            rng: random.Random-compatible stream or RNGContext used for new owners
+        
+        Returns:
+            One VehicleOwner per plate, in order
+        """
+        n = len(plates)
+        if vehicle_classes is None or isinstance(vehicle_classes, str):
+            vehicle_classes = [vehicle_classes or 'roda_dua'] * n
+        if categories is None or isinstance(categories, str):
+            categories = [categories] * n
+        
+        # Distinct plates in first-seen order, split into known and new
+        found: Dict[str, VehicleOwner] = {}
+        missing: Dict[str, Tuple[str, Optional[str]]] = {}
+        for plate, vehicle_class, category in zip(plates, vehicle_classes, categories):
+            if plate in found or plate in missing:
+                continue
+            owner = self.owners.get(plate)
+            if owner is not None:
+                found[plate] = owner
+            else:
+                missing[plate] = (vehicle_class, category)
+        
+        if missing:
+            if isinstance(rng, RNGContext):
+                py_rng, np_rng = rng.random, rng.numpy
+            else:
+                py_rng = rng or random
+                np_rng = np.random.default_rng(py_rng.getrandbits(64))
+            
+            # Specs grouped by vehicle type; admin codes resolved once per (region, sub_region)
+            groups: Dict[str, Tuple[List[str], List[Tuple]]] = {}
+            admin_codes: Dict[Tuple[str, str], Tuple[Optional[str], Optional[str]]] = {}
+            for plate, (vehicle_class, category) in missing.items():
+                kind, region, sub_region, province_code = self._owner_spec(plate, category, py_rng)
+                if kind == 'independent':
+                    spec = (region, sub_region, None, None, None)
+                elif kind == 'special':
+                    spec = (region, sub_region, province_code, '00', '00')
+                else:
+                    key = (region, sub_region)
+                    if key not in admin_codes:
+                        admin_codes[key] = VehicleOwner._lookup_admin_codes(region, sub_region) or (None, None)
+                    district_code, subdistrict_code = admin_codes[key]
+                    spec = (region, sub_region, province_code,
+                            _code_part(district_code, 1), _code_part(subdistrict_code, 2))
+                group_plates, specs = groups.setdefault(vehicle_class, ([], []))
+                group_plates.append(plate)
+                specs.append(spec)
+            
+            now = datetime.now()
+            for vehicle_class, (group_plates, specs) in groups.items():
+                created = VehicleOwner.generate_owners_bulk(specs, vehicle_class, rng=np_rng, now=now)
+                for plate, owner in zip(group_plates, created):
+                    # Another worker may have created this plate's owner meanwhile
+                    with self._stripe(plate):
+                        existing = self.owners.get(plate)
+                        if existing is None:
+                            self.owners[plate] = owner
+                            self._mark_dirty(plate)
+                        else:
+                            owner = existing
+                    found[plate] = owner
+            self._maybe_autosave()
+        
+        return [found[plate] for plate in plates]
+    
+    def save_snapshot(self, filepath: str, full: bool = False) -> int:
+        """
+        Save owners to a binary snapshot (see utils.owner_snapshot)
+        
+        Appends only the owners added since the last save/load of the same
+        file; the file is rewritten in full when it belongs to another
+        database, holds MAX_SNAPSHOT_DELTAS deltas already or full is set.
+        A full save streams the owners, spilled ones straight from SQLite.
+        
+        Returns:
+            Number of owners written
+        """
+        with self._save_lock:
+            with self._dirty_lock:
+                dirty, self._dirty = self._dirty, set()
+            try:
+                deltas = delta_count(filepath) if filepath == self._snapshot_path else None
+                if not full and deltas is not None and deltas < self.MAX_SNAPSHOT_DELTAS:
+                    items = [(plate, owner.to_row()) for plate, owner in
+                             ((plate, self.owners.get(plate)) for plate in dirty) if owner is not None]
+                    append_snapshot(filepath, items)
+                    written = len(items)
+                else:
+                    if isinstance(self.owners, TieredOwnerStore):
+                        items = self.owners.rows()
+                    else:
+                        items = ((plate, owner.to_row()) for plate, owner in list(self.owners.items()))
+                    written = write_snapshot(filepath, items)
+            except Exception:
+                with self._dirty_lock:
+                    self._dirty |= dirty  # Keep them for the next attempt
+                raise
+            self._snapshot_path = filepath
+            return written
+    
+    def load_snapshot(self, filepath: str) -> int:
+        """
+        Load owners from a binary snapshot, exactly as saved
+        
+        Returns:
+            Number of owner records read (0 if the file does not exist)
+        """
+        loaded = 0
+        try:
+            with self._dirty_lock:
+                for plate, row in read_snapshot(filepath):
+                    self.owners[plate] = VehicleOwner.from_row(row)
+                    self._dirty.discard(plate)  # Already in the file
+                    loaded += 1
+        except FileNotFoundError:
+            return 0
+        self._snapshot_path = filepath
+        return loaded
     
     def save_to_file(self, filepath: str) -> None:
         """Save database to JSON file"""
@@ -1752,7 +2045,7 @@ class OwnerDatabase:
             json.dump(data, f, indent=2, ensure_ascii=False)
     
     def load_from_file(self, filepath: str) -> None:
-        """Load database from JSON file"""
+        """Load database from JSON file (dates are kept as saved, to the day)"""
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -1766,12 +2059,67 @@ class OwnerDatabase:
                     sub_region=owner_data.get('sub_region', ''),
                     stnk_status=owner_data['stnk_status'] == 'Active',
                     sim_status=owner_data['sim_status'] == 'Active',
-                    vehicle_type=vehicle_type
+                    vehicle_type=vehicle_type,
+                    stnk_expiry=_parse_date(owner_data.get('stnk_expiry')),
+                    sim_expiry=_parse_date(owner_data.get('sim_expiry')),
+                    registration_date=_parse_date(owner_data.get('registration_date'))
                 )
                 self.owners[plate] = owner
         except FileNotFoundError:
             pass
 
 
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Date written by VehicleOwner.to_dict() (None if missing)"""
+    return datetime.strptime(value, '%Y-%m-%d') if value else None
+
+
+# Bump when the resolution rules change (invalidates persisted admin-code tables)
+ADMIN_CODE_CACHE_VERSION = 3
+
+
+def _plate_data_regions() -> Tuple[List[Tuple[str, str]], List[str]]:
+    """(region, sub_region) pairs and region names reachable from PLATE_DATA"""
+    pairs, names = set(), set()
+    for plate_data in IndonesianPlateManager.PLATE_DATA.values():
+        region = plate_data['region_name']
+        sub_regions = set(plate_data.get('sub_codes', {}).values()) | {region}
+        pairs.update((region, sub_region) for sub_region in sub_regions)
+        names.update(sub_regions)
+    return sorted(pairs), sorted(names)
+
+
+def warm_admin_code_cache(cache_dir: Optional[str] = None) -> int:
+    """
+    Resolve base.csv codes for every PLATE_DATA region up front
+    
+    Fills the (region, sub_region) memo of VehicleOwner._extract_administrative_codes
+    and the kabupaten memo of IndonesianPlateManager._get_csv_codes_for_region.
+    The resolved table is cached on disk next to the other database caches and
+    rebuilt when base.csv or the PLATE_DATA region names change. Only the
+    lookups are cached; random fallback digits are still drawn per owner.
+    
+    Returns:
+        Number of memoized entries (0 without base.csv)
+    """
+    base_csv_path = Path(__file__).parent.parent / 'base.csv'
+    if not base_csv_path.exists():
+        return 0
+    
+    pairs, names = _plate_data_regions()
+    
+    def build():
+        return {
+            'owner': {pair: VehicleOwner._resolve_admin_codes(*pair) for pair in pairs},
+            'kabupaten': {name: IndonesianPlateManager._lookup_kabupaten_code(name) for name in names},
+        }
+    
+    fingerprint = hashlib.sha1(repr((ADMIN_CODE_CACHE_VERSION, pairs, names)).encode('utf-8')).hexdigest()[:8]
+    data = load_cached(base_csv_path, 'admin-codes', build, cache_dir, key=fingerprint)
+    VehicleOwner._ADMIN_CODE_MEMO.update(data['owner'])
+    IndonesianPlateManager._KABUPATEN_CODE_MEMO.update(data['kabupaten'])
+    return len(data['owner']) + len(data['kabupaten'])
+
+
 # Global database instance
-owner_db = OwnerDatabase()
+owner_db = OwnerDatabase(Config.OWNER_CACHE_SIZE, Config.OWNER_SPILL_FILE)
@@ -1,18 +1,26 @@
 """
-Indonesian Regions - Province, Kabupaten/Kota, and Kecamatan mappings
+Indonesian Regions - Province, Kabupaten/Kota, Kecamatan and Desa mappings
 Generated from base.csv file
+
+Children are indexed by parent code (code-sorted), and the get_all_*
+methods return read-only views. Desa (village, XX.YY.ZZ.NNNN) entries are
+only loaded the first time one is requested.
 """
 
-import csv
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 from functools import lru_cache
 
+from utils.region_snapshot import load_snapshot
+
 class IndonesianRegions:
     """Parse and manage Indonesian administrative regions"""
     
     _instance = None
     _data = None
+    _desa_lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
@@ -29,54 +37,64 @@ class IndonesianRegions:
             'provinces': {},  # code -> name
             'kabupatens': {},  # code -> {'name': ..., 'province_code': ...}
             'kecamatan': {},   # code -> {'name': ..., 'kabupaten_code': ..., 'province_code': ...}
+            'children': {},    # parent code -> code-sorted child codes
+            'desa': None,      # code -> {'name': ..., 'kecamatan_code': ...} (loaded on demand)
         }
         
         # Try to load from base.csv
         csv_path = Path(__file__).parent.parent / 'base.csv'
+        self._csv_path = csv_path
         
         if csv_path.exists():
             self._load_from_csv(csv_path)
         else:
             self._load_default_provinces()
+        
+        children = self._data['children']
+        for code in self._data['kabupatens']:
+            children.setdefault(self._data['kabupatens'][code]['province_code'], []).append(code)
+        for code in self._data['kecamatan']:
+            children.setdefault(self._data['kecamatan'][code]['kabupaten_code'], []).append(code)
+        for codes in children.values():
+            codes.sort()
+        self._sorted_codes = {level: tuple(sorted(self._data[level]))
+                              for level in ('provinces', 'kabupatens', 'kecamatan')}
     
     def _load_from_csv(self, csv_path):
-        """Load data from base.csv"""
+        """Load data from the compiled base.csv snapshot"""
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if not row:
-                        continue
-                    
-                    code, name = row[0].strip(), row[1].strip() if len(row) > 1 else ''
+            snapshot = load_snapshot(csv_path)
+            codes, names, parents = snapshot.codes, snapshot.names, snapshot.parents
+            for i, level in enumerate(snapshot.levels.tolist()):
+                code, name = codes[i], names[i]
+                
+                if level == 0:
+                    # Province level: 11
+                    self._data['provinces'][code] = name
+                
+                elif level == 1:
+                    # Kabupaten/Kota level: 11.01
+                    province_code = code.split('.')[0]
+                    self._data['kabupatens'][code] = {
+                        'name': name,
+                        'province_code': province_code,
+                        'province_name': self._data['provinces'].get(province_code, '')
+                    }
+                
+                elif level == 2:
+                    # Kecamatan level: 11.01.01
                     parts = code.split('.')
+                    kabupaten_code = f"{parts[0]}.{parts[1]}"
+                    province_code = parts[0]
                     
-                    if len(parts) == 1:
-                        # Province level: 11
-                        self._data['provinces'][code] = name
-                    
-                    elif len(parts) == 2:
-                        # Kabupaten/Kota level: 11.01
-                        province_code = parts[0]
-                        self._data['kabupatens'][code] = {
-                            'name': name,
-                            'province_code': province_code,
-                            'province_name': self._data['provinces'].get(province_code, '')
-                        }
-                    
-                    elif len(parts) == 3:
-                        # Kecamatan level: 11.01.01
-                        kabupaten_code = f"{parts[0]}.{parts[1]}"
-                        province_code = parts[0]
-                        
-                        kabupaten_data = self._data['kabupatens'].get(kabupaten_code, {})
-                        self._data['kecamatan'][code] = {
-                            'name': name,
-                            'kabupaten_code': kabupaten_code,
-                            'province_code': province_code,
-                            'kabupaten_name': kabupaten_data.get('name', ''),
-                            'province_name': self._data['provinces'].get(province_code, '')
-                        }
+                    kabupaten_data = self._data['kabupatens'].get(kabupaten_code, {})
+                    self._data['kecamatan'][code] = {
+                        'name': name,
+                        'kabupaten_code': kabupaten_code,
+                        'province_code': province_code,
+                        'kabupaten_name': kabupaten_data.get('name', ''),
+                        'province_name': self._data['provinces'].get(province_code, '')
+                    }
         except Exception as e:
             print(f"Error loading CSV: {e}")
             self._load_default_provinces()
@@ -113,29 +131,62 @@ class IndonesianRegions:
         """Get kecamatan info by code"""
         return self._data['kecamatan'].get(code)
     
-    def get_all_provinces(self) -> Dict[str, str]:
-        """Get all provinces"""
-        return self._data['provinces'].copy()
+    def get_all_provinces(self) -> Mapping[str, str]:
+        """Get all provinces (read-only view)"""
+        return MappingProxyType(self._data['provinces'])
     
-    def get_all_kabupatens(self) -> Dict[str, Dict]:
-        """Get all kabupaten/kota"""
-        return self._data['kabupatens'].copy()
+    def get_all_kabupatens(self) -> Mapping[str, Dict]:
+        """Get all kabupaten/kota (read-only view)"""
+        return MappingProxyType(self._data['kabupatens'])
+    
+    def get_sorted_codes(self, level: str) -> Tuple[str, ...]:
+        """All codes of a level ('provinces', 'kabupatens' or 'kecamatan'), sorted"""
+        return self._sorted_codes[level]
     
     def get_kabupatens_by_province(self, province_code: str) -> Dict[str, str]:
         """Get all kabupaten/kota in a province"""
-        result = {}
-        for code, data in self._data['kabupatens'].items():
-            if data['province_code'] == province_code:
-                result[code] = data['name']
-        return result
+        kabupatens = self._data['kabupatens']
+        return {code: kabupatens[code]['name'] for code in self._data['children'].get(province_code, ())}
     
     def get_kecamatan_by_kabupaten(self, kabupaten_code: str) -> Dict[str, str]:
         """Get all kecamatan in a kabupaten"""
-        result = {}
-        for code, data in self._data['kecamatan'].items():
-            if data['kabupaten_code'] == kabupaten_code:
-                result[code] = data['name']
-        return result
+        kecamatan = self._data['kecamatan']
+        return {code: kecamatan[code]['name'] for code in self._data['children'].get(kabupaten_code, ())}
+    
+    def get_desa(self, code: str) -> Optional[Dict]:
+        """Get desa/kelurahan info by code (XX.YY.ZZ.NNNN)"""
+        return self._load_desa().get(code)
+    
+    def get_desa_by_kecamatan(self, kecamatan_code: str) -> Dict[str, str]:
+        """Get all desa/kelurahan in a kecamatan"""
+        desa = self._load_desa()
+        return {code: desa[code]['name'] for code in self._data['children'].get(kecamatan_code, ())}
+    
+    def _load_desa(self) -> Dict[str, Dict]:
+        """Load the village level from the snapshot on first use (once, even across threads)"""
+        if self._data['desa'] is None:
+            with self._desa_lock:
+                if self._data['desa'] is None:
+                    self._data['desa'] = self._build_desa()
+        return self._data['desa']
+    
+    def _build_desa(self) -> Dict[str, Dict]:
+        """Desa entries; their code-sorted lists are added to the children index"""
+        desa, children = {}, {}
+        snapshot = load_snapshot(self._csv_path) if self._csv_path.exists() else None
+        if snapshot is not None:
+            for code, name in snapshot.entries(level=3):
+                kecamatan_code = code.rsplit('.', 1)[0]
+                desa[code] = {
+                    'name': name,
+                    'kecamatan_code': kecamatan_code,
+                    'kabupaten_code': kecamatan_code.rsplit('.', 1)[0],
+                    'province_code': code.split('.')[0]
+                }
+                children.setdefault(kecamatan_code, []).append(code)
+        for kecamatan_code, codes in children.items():
+            self._data['children'][kecamatan_code] = sorted(codes)
+        return desa
 
 
 class NIKParser:
@@ -4,11 +4,19 @@ import csv
 import random
 from pathlib import Path
 
+from utils.logger import logger
+
 
 class MotorcycleDatabase:
     """Load and manage motorcycle models from CSV"""
     
-    def __init__(self, csv_file="model.csv"):
+    def __init__(self, csv_file="model.csv", use_cache: bool = True):
+        """
+        Args:
+            csv_file: Path to the motorcycle model CSV
+            use_cache: Reuse the parsed models from the binary cache while the CSV is unchanged
+        """
+        self.use_cache = use_cache
         self.models = []
         self.manufacturers = {
             1: "Honda",
@@ -29,7 +37,7 @@ class MotorcycleDatabase:
         csv_path = Path(csv_file)
         
         if not csv_path.exists():
-            print(f"Warning: {csv_file} not found, using defaults")
+            logger.warning(f"{csv_file} not found, using default motorcycle models")
             self.models = [
                 ("Honda", "CB500X"),
                 ("Suzuki", "GSX-R600"),
@@ -40,30 +48,41 @@ class MotorcycleDatabase:
             return
         
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if len(row) >= 2:
-                        mfg_id = int(row[0])
-                        model_name = row[1].strip()
-                        
-                        manufacturer = self.manufacturers.get(mfg_id, f"Manufacturer {mfg_id}")
-                        self.models.append((manufacturer, model_name))
+            if self.use_cache:
+                from .db_cache import load_cached
+                self.models = load_cached(csv_path, 'motorcycles', lambda: self._parse_csv(csv_path))
+            else:
+                self.models = self._parse_csv(csv_path)
             
-            print(f"Loaded {len(self.models)} motorcycle models from {csv_file}")
+            logger.debug(f"Loaded {len(self.models)} motorcycle models from {csv_file}")
         except Exception as e:
-            print(f"Error loading motorcycle database: {e}")
+            logger.error(f"Error loading motorcycle database: {e}")
             self.models = []
     
-    def get_random_motorcycle(self):
-        """Get a random motorcycle model"""
+    def _parse_csv(self, csv_path: Path):
+        """Parse (manufacturer, model) pairs from the CSV"""
+        models = []
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            for row in reader:
+                if len(row) >= 2:
+                    mfg_id = int(row[0])
+                    model_name = row[1].strip()
+                    
+                    manufacturer = self.manufacturers.get(mfg_id, f"Manufacturer {mfg_id}")
+                    models.append((manufacturer, model_name))
+        return models
+    
+    def get_random_motorcycle(self, rng=None):
+        """Get a random motorcycle model (rng: optional random.Random-compatible stream)"""
+        rng = rng or random
         if not self.models:
             return {
                 'make': 'Unknown',
                 'model': 'Unknown'
             }
         
-        make, model = random.choice(self.models)
+        make, model = rng.choice(self.models)
         return {
             'make': make,
             'model': model
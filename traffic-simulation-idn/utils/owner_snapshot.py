@@ -0,0 +1,180 @@
+"""
+Binary owner snapshots
+OwnerDatabase used to persist through an indented JSON file (several
+strftime calls per owner, dates reduced to days). An owner snapshot stores
+VehicleOwner.to_row() tuples column by column instead:
+
+- plates, owner_ids, names   string tables (UTF-8 joined by newlines)
+- region, sub_region,        indices into small vocabularies kept in the
+  vehicle_type               segment header (a few hundred distinct values)
+- flags                      bit 0 = STNK active, bit 1 = SIM active
+- dates                      stnk_expiry, sim_expiry, registration_date as
+                             microseconds since 1970 (exact round trip)
+
+A file is MAGIC followed by segments. A full dump is written as segments of
+at most SEGMENT_ROWS owners (so saving never holds more than one segment in
+memory) and incremental saves append delta segments; reading applies them in
+order, so the last record of a plate wins. A segment cut short by a crash is
+ignored and overwritten by the next append.
+"""
+
+import json
+import os
+import struct
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.logger import logger
+
+MAGIC = b'OWNSNAP1'
+SEGMENT_MAGIC = b'SEGM'
+SNAPSHOT_VERSION = 1
+ALIGNMENT = 8
+# Owners per segment of a full dump
+SEGMENT_ROWS = 65536
+
+# Row fields stored as vocabulary indices
+VOCAB_FIELDS = {'region': 2, 'sub_region': 3, 'vehicle_type': 6}
+
+
+def _blob(values: Sequence[str]) -> np.ndarray:
+    return np.frombuffer('\n'.join(values).encode('utf-8'), dtype=np.uint8)
+
+
+def _unblob(array: np.ndarray, count: int) -> List[str]:
+    return array.tobytes().decode('utf-8').split('\n') if count else []
+
+
+def encode_segment(items: Sequence[Tuple[str, Tuple]], delta: bool = False) -> bytes:
+    """One segment holding (plate, VehicleOwner.to_row()) pairs"""
+    rows = [row for _, row in items]
+    vocab, arrays = {}, {}
+    for field, column in VOCAB_FIELDS.items():
+        values = [row[column] for row in rows]
+        vocab[field] = sorted(set(values), key=lambda value: (value is None, value or ''))
+        index = {value: i for i, value in enumerate(vocab[field])}
+        arrays[field] = np.array([index[value] for value in values], dtype=np.uint32)
+    arrays['plates'] = _blob([plate for plate, _ in items])
+    arrays['owner_ids'] = _blob([row[0] for row in rows])
+    arrays['names'] = _blob([row[1] for row in rows])
+    arrays['flags'] = np.array([bool(row[4]) | bool(row[5]) << 1 for row in rows], dtype=np.uint8)
+    arrays['dates'] = np.array([row[7:10] for row in rows], dtype=np.int64).reshape(-1)
+
+    layout, offset = {}, 0
+    for key, array in arrays.items():
+        layout[key] = [array.dtype.str, len(array), offset]
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    header = json.dumps({'version': SNAPSHOT_VERSION, 'count': len(items), 'delta': delta,
+                         'vocab': vocab, 'arrays': layout, 'size': offset}).encode('utf-8')
+    header += b' ' * (-(len(SEGMENT_MAGIC) + 4 + len(header)) % ALIGNMENT)
+
+    parts = [SEGMENT_MAGIC, struct.pack('<I', len(header)), header]
+    for array in arrays.values():
+        data = array.tobytes()
+        parts.append(data + b'\0' * (-len(data) % ALIGNMENT))
+    return b''.join(parts)
+
+
+def decode_segment(header: Dict, data: memoryview) -> Iterator[Tuple[str, Tuple]]:
+    """(plate, row) pairs of one segment, data being its array section"""
+    count = header['count']
+    arrays = {key: np.frombuffer(data, dtype=dtype, count=length, offset=offset)
+              for key, (dtype, length, offset) in header['arrays'].items()}
+    columns = {field: [header['vocab'][field][i] for i in arrays[field].tolist()]
+               for field in VOCAB_FIELDS}
+    flags = arrays['flags'].tolist()
+    dates = arrays['dates'].reshape(-1, 3).tolist()
+    for i, (plate, owner_id, name) in enumerate(zip(_unblob(arrays['plates'], count),
+                                                    _unblob(arrays['owner_ids'], count),
+                                                    _unblob(arrays['names'], count))):
+        yield plate, (owner_id, name, columns['region'][i], columns['sub_region'][i],
+                      bool(flags[i] & 1), bool(flags[i] & 2), columns['vehicle_type'][i], *dates[i])
+
+
+def _scan(f) -> Tuple[List[Tuple[Dict, int]], int]:
+    """(header, array offset) of every complete segment and the end of the last one
+
+    Only segment headers are read; the arrays are skipped over.
+    """
+    size = os.fstat(f.fileno()).st_size
+    f.seek(0)
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not an owner snapshot")
+    segments, position = [], len(MAGIC)
+    prefix = len(SEGMENT_MAGIC) + 4
+    while position + prefix <= size:
+        f.seek(position)
+        head = f.read(prefix)
+        if head[:len(SEGMENT_MAGIC)] != SEGMENT_MAGIC:
+            break
+        (header_size,) = struct.unpack_from('<I', head, len(SEGMENT_MAGIC))
+        try:
+            header = json.loads(f.read(header_size))
+        except ValueError:
+            break
+        if header.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported owner snapshot version {header.get('version')}")
+        start = position + prefix + header_size
+        if start + header['size'] > size:
+            break
+        segments.append((header, start))
+        position = start + header['size']
+    if position < size:
+        logger.warning(f"Ignoring {size - position} trailing bytes of a truncated owner snapshot")
+    return segments, position
+
+
+def read_snapshot(path) -> Iterator[Tuple[str, Tuple]]:
+    """(plate, row) pairs of every segment in order (later records supersede earlier ones)"""
+    with open(path, 'rb') as f:
+        segments, end = _scan(f)
+        f.seek(0)
+        view = memoryview(f.read(end))
+    for header, offset in segments:
+        yield from decode_segment(header, view[offset:offset + header['size']])
+
+
+def delta_count(path) -> Optional[int]:
+    """Number of delta segments in a snapshot (None if missing or unreadable)"""
+    try:
+        with open(path, 'rb') as f:
+            return sum(1 for header, _ in _scan(f)[0] if header.get('delta'))
+    except (OSError, ValueError):
+        return None
+
+
+def write_snapshot(path, items: Iterable[Tuple[str, Tuple]]) -> int:
+    """
+    Write a full snapshot, SEGMENT_ROWS owners at a time (atomically replaces the file)
+
+    Returns:
+        Number of owners written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    items = iter(items)
+    with open(tmp_file, 'wb') as f:
+        f.write(MAGIC)
+        segment = list(islice(items, SEGMENT_ROWS))
+        f.write(encode_segment(segment))
+        written = len(segment)
+        while len(segment) == SEGMENT_ROWS:
+            segment = list(islice(items, SEGMENT_ROWS))
+            if segment:
+                f.write(encode_segment(segment))
+                written += len(segment)
+    os.replace(tmp_file, path)
+    return written
+
+
+def append_snapshot(path, items: Sequence[Tuple[str, Tuple]]) -> None:
+    """Append a delta segment (drops a truncated tail left by an earlier crash)"""
+    with open(path, 'r+b') as f:
+        _, end = _scan(f)
+        f.seek(end)
+        f.truncate()
+        f.write(encode_segment(items, delta=True))
@@ -0,0 +1,214 @@
+"""
+Tiered owner storage
+OwnerDatabase keeps one VehicleOwner per plate forever. TieredOwnerStore
+bounds that: the most recently used owners stay in an in-memory LRU tier
+and older ones are spilled to an SQLite table. Reading a spilled plate
+promotes it back into memory, so callers see a normal mapping and plate ->
+owner stays consistent no matter how long the simulator runs. Every
+operation holds the store's own lock, so it can be shared between threads.
+"""
+
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from functools import wraps
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+# Pending spill writes are committed in batches of this size
+COMMIT_EVERY = 1000
+
+
+def _locked(method):
+    """Run a store method under the store's lock (tiers change even on reads)"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class TieredOwnerStore(MutableMapping):
+    """Size-bounded LRU mapping of plate -> owner with an SQLite spill tier"""
+
+    def __init__(self, capacity: int, encode: Callable[[object], Tuple], decode: Callable[[Tuple], object],
+                 path: Optional[str] = None):
+        """
+        Args:
+            capacity: Owners kept in memory
+            encode: owner -> row tuple of picklable values
+            decode: row tuple -> owner
+            path: SQLite file for spilled owners (default: private temporary file)
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._encode = encode
+        self._decode = decode
+        self._memory: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        self._temporary = path is None
+        if self._temporary:
+            fd, path = tempfile.mkstemp(prefix='owners-', suffix='.sqlite')
+            os.close(fd)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute("PRAGMA journal_mode=MEMORY")
+        self._db.execute("CREATE TABLE IF NOT EXISTS owners (plate TEXT PRIMARY KEY, row BLOB)")
+        self._disk_count = self._db.execute("SELECT COUNT(*) FROM owners").fetchone()[0]
+        self._pending = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _dump(self, owner) -> bytes:
+        return pickle.dumps(self._encode(owner), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _load(self, blob: bytes):
+        return self._decode(pickle.loads(blob))
+
+    def _disk_get(self, plate: str) -> Optional[bytes]:
+        row = self._db.execute("SELECT row FROM owners WHERE plate = ?", (plate,)).fetchone()
+        return row[0] if row else None
+
+    def _disk_delete(self, plate: str) -> bool:
+        deleted = self._db.execute("DELETE FROM owners WHERE plate = ?", (plate,)).rowcount > 0
+        if deleted:
+            self._disk_count -= 1
+            self._written()
+        return deleted
+
+    def _written(self):
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self._db.commit()
+            self._pending = 0
+
+    def _evict(self):
+        """Spill least recently used owners until the memory tier fits"""
+        while len(self._memory) > self.capacity:
+            plate, owner = self._memory.popitem(last=False)
+            self._db.execute("INSERT OR REPLACE INTO owners VALUES (?, ?)", (plate, self._dump(owner)))
+            self._disk_count += 1
+            self.evictions += 1
+            self._written()
+
+    @_locked
+    def __getitem__(self, plate: str):
+        owner = self._memory.get(plate)
+        if owner is not None:
+            self._memory.move_to_end(plate)
+            self.hits += 1
+            return owner
+
+        blob = self._disk_get(plate) if self._disk_count else None
+        if blob is None:
+            self.misses += 1
+            raise KeyError(plate)
+
+        # Promote: a plate lives in exactly one tier
+        owner = self._load(blob)
+        self._disk_delete(plate)
+        self._memory[plate] = owner
+        self.disk_hits += 1
+        self._evict()
+        return owner
+
+    @_locked
+    def __setitem__(self, plate: str, owner) -> None:
+        if plate not in self._memory and self._disk_count:
+            self._disk_delete(plate)
+        self._memory[plate] = owner
+        self._memory.move_to_end(plate)
+        self._evict()
+
+    @_locked
+    def __delitem__(self, plate: str) -> None:
+        if plate in self._memory:
+            del self._memory[plate]
+        elif not self._disk_delete(plate):
+            raise KeyError(plate)
+
+    @_locked
+    def __contains__(self, plate) -> bool:
+        """Membership test without promotion or counter updates"""
+        return plate in self._memory or (self._disk_count > 0 and self._disk_get(plate) is not None)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            plates = list(self._memory)
+            plates += [plate for (plate,) in self._db.execute("SELECT plate FROM owners").fetchall()]
+        return iter(plates)
+
+    @_locked
+    def __len__(self) -> int:
+        return len(self._memory) + self._disk_count
+
+    def rows(self) -> Iterator[Tuple[str, Tuple]]:
+        """
+        (plate, encoded row) of every owner, without promoting spilled ones
+
+        Spilled rows are streamed from the table cursor. The store's lock is
+        held until the iterator is exhausted or closed, so the tiers cannot
+        change underneath it.
+        """
+        with self._lock:
+            for plate, owner in list(self._memory.items()):
+                yield plate, self._encode(owner)
+            cursor = self._db.execute("SELECT plate, row FROM owners")
+            while True:
+                page = cursor.fetchmany(COMMIT_EVERY)
+                if not page:
+                    break
+                for plate, blob in page:
+                    yield plate, pickle.loads(blob)
+
+    @_locked
+    def clear(self) -> None:
+        self._memory.clear()
+        self._db.execute("DELETE FROM owners")
+        self._db.commit()
+        self._disk_count = 0
+        self._pending = 0
+
+    @_locked
+    def get_stats(self) -> Dict:
+        """Tier sizes and hit/miss/eviction counters"""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'capacity': self.capacity,
+            'memory': len(self._memory),
+            'disk': self._disk_count,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+    @_locked
+    def close(self) -> None:
+        """Close the spill database (and remove it if it was temporary)"""
+        if self._db is None:
+            return
+        self._db.commit()
+        self._db.close()
+        self._db = None
+        if self._temporary:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
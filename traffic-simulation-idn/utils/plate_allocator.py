@@ -0,0 +1,184 @@
+"""
+Compact unique-plate allocator
+A plate is identified by its namespace (region code, "RI <agency>",
+"CD/CC <country>" or "KB" for trial plates), its number string and its
+letters. Number and letters are packed into one 32-bit integer, and issued
+keys are tracked per namespace in a roaring-style bitset: the upper 16 bits
+pick a container, which is a sorted uint16 array while sparse and an
+8 KiB bitmap once dense. Lookups and reservations are O(1) (bounded by the
+container size), memory stays around 2 bytes per issued plate, and class
+suffixes like "(TRUK-16T) - RUTE: LN" never enter the key.
+
+For parallel generation the number space is partitioned by residue: shard i
+of n only issues numbers with number % n == i, so shards never collide and
+need no shared state.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# Same alphabet as PlateCharacterValidator.VALID_LETTERS (no I, O, Q)
+VALID_LETTERS = "ABCDEFGHJKLMNPRSTUVWXYZ"
+
+# Number strings are 1-4 digits with leading zeros kept ("07" != "7")
+NUMBER_OFFSETS = (0, 0, 10, 110, 1110)       # First code for each digit count
+NUMBER_CODES = 11110                         # 10 + 100 + 1000 + 10000
+
+# Letters are 0-4 characters (truck code letter + up to 3 letters)
+LETTER_BASE = len(VALID_LETTERS)
+LETTER_OFFSETS = (0, 1, 24, 553, 12720)      # First code for each length
+LETTER_CODES = 292561                        # sum(23 ** k for k in 0..4)
+_LETTER_INDEX = {c: i for i, c in enumerate(VALID_LETTERS)}
+
+ARRAY_LIMIT = 4096  # Array containers above this size become bitmaps
+BITMAP_BYTES = 8192  # 65536 bits
+
+
+def encode_number(number_str: str) -> int:
+    """Pack a 1-4 digit number string into [0, NUMBER_CODES)"""
+    if not 1 <= len(number_str) <= 4 or not number_str.isdigit():
+        raise ValueError(f"Invalid plate number: {number_str!r}")
+    return NUMBER_OFFSETS[len(number_str)] + int(number_str)
+
+
+def encode_letters(letters: str) -> int:
+    """Pack 0-4 valid plate letters into [0, LETTER_CODES)"""
+    if len(letters) > 4:
+        raise ValueError(f"Too many plate letters: {letters!r}")
+    code = 0
+    for char in letters:
+        index = _LETTER_INDEX.get(char)
+        if index is None:
+            raise ValueError(f"Invalid plate letter: {char!r}")
+        code = code * LETTER_BASE + index
+    return LETTER_OFFSETS[len(letters)] + code
+
+
+def encode_plate(number_str: str, letters: str = '') -> int:
+    """Pack number and letters into a single 32-bit key"""
+    return encode_number(number_str) * LETTER_CODES + encode_letters(letters)
+
+
+def parse_plate(plate: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Split a generated plate string into (namespace, number, letters)
+
+    Returns None if the plate does not follow a known layout.
+    """
+    parts = plate.split(' (')[0].split(' - ')[0].split()
+    if len(parts) >= 3 and parts[0] in ('RI', 'CD', 'CC'):
+        return f"{parts[0]} {parts[1]}", parts[2], ''
+    if len(parts) == 3:
+        return parts[0], parts[1], parts[2]
+    return None
+
+
+class PlateAllocator:
+    """Roaring-style record of issued plates for one shard of the number space"""
+
+    def __init__(self, shard_index: int = 0, num_shards: int = 1):
+        """
+        Args:
+            shard_index: Residue class of plate numbers this allocator issues
+            num_shards: Total number of shards sharing the number space
+        """
+        if not 0 <= shard_index < num_shards:
+            raise ValueError(f"Invalid shard {shard_index} of {num_shards}")
+        self.shard_index = shard_index
+        self.num_shards = num_shards
+        self.namespaces: Dict[str, int] = {}
+        self.containers: Dict[int, object] = {}  # (namespace << 16 | high) -> array or bytearray
+        self.count = 0
+
+    @classmethod
+    def partition(cls, num_shards: int) -> List['PlateAllocator']:
+        """Create one allocator per shard with disjoint number spaces"""
+        return [cls(i, num_shards) for i in range(num_shards)]
+
+    def owns_number(self, number: int) -> bool:
+        """Check if a plate number belongs to this shard"""
+        return number % self.num_shards == self.shard_index
+
+    def shard_number(self, number: int, upper: int) -> Optional[int]:
+        """
+        Move a drawn number into this shard's residue class
+
+        Returns a number in [1, upper] owned by this shard, or None if the
+        range has none (the caller should draw again).
+        """
+        if self.num_shards == 1:
+            return number
+        number += (self.shard_index - number) % self.num_shards
+        if number > upper:
+            number -= self.num_shards
+        return number if number >= 1 else None
+
+    def _slot(self, namespace: str, key: int, create: bool = False):
+        ns = self.namespaces.get(namespace)
+        if ns is None:
+            if not create:
+                return None, None
+            ns = self.namespaces[namespace] = len(self.namespaces)
+        return (ns << 16) | (key >> 16), key & 0xFFFF
+
+    def contains(self, namespace: str, number_str: str, letters: str = '') -> bool:
+        """Check if a plate has been issued"""
+        slot, low = self._slot(namespace, encode_plate(number_str, letters))
+        container = self.containers.get(slot)
+        if container is None:
+            return False
+        if isinstance(container, bytearray):
+            return bool(container[low >> 3] & (1 << (low & 7)))
+        i = bisect_left(container, low)
+        return i < len(container) and container[i] == low
+
+    def allocate(self, namespace: str, number_str: str, letters: str = '') -> bool:
+        """
+        Reserve a plate
+
+        Returns True if the plate was free and is now issued, False if it was
+        already taken.
+        """
+        slot, low = self._slot(namespace, encode_plate(number_str, letters), create=True)
+        container = self.containers.get(slot)
+        if container is None:
+            container = self.containers[slot] = array('H')
+
+        if isinstance(container, bytearray):
+            byte, bit = low >> 3, 1 << (low & 7)
+            if container[byte] & bit:
+                return False
+            container[byte] |= bit
+        else:
+            i = bisect_left(container, low)
+            if i < len(container) and container[i] == low:
+                return False
+            container.insert(i, low)
+            if len(container) > ARRAY_LIMIT:
+                self.containers[slot] = self._to_bitmap(container)
+        self.count += 1
+        return True
+
+    @staticmethod
+    def _to_bitmap(values: array) -> bytearray:
+        bitmap = bytearray(BITMAP_BYTES)
+        for low in values:
+            bitmap[low >> 3] |= 1 << (low & 7)
+        return bitmap
+
+    def memory_bytes(self) -> int:
+        """Approximate container payload size"""
+        return sum(
+            len(c) if isinstance(c, bytearray) else len(c) * c.itemsize
+            for c in self.containers.values()
+        )
+
+    def clear(self):
+        """Forget every issued plate"""
+        self.namespaces.clear()
+        self.containers.clear()
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
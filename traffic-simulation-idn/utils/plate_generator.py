@@ -14,10 +14,13 @@ Format Reference:
 """
 
 import random
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 from enum import Enum
 
+from config import Config
+from .plate_allocator import PlateAllocator, parse_plate
+
 
 class PlateType(Enum):
     """Official Indonesian license plate types"""
@@ -157,10 +160,56 @@ class PlateCharacterValidator:
 class PlatGenerator:
     """Main plate generator with full specification support"""
     
-    def __init__(self):
-        self.generated_plates: Set[str] = set()
+    # Draws per plate before giving up on finding a free one (unique mode)
+    MAX_DRAWS = 1000
+    
+    def __init__(self, rng=None, allocator: Optional[PlateAllocator] = None, unique: bool = False):
+        """
+        Args:
+            rng: random.Random-compatible stream (default: the global random module);
+                 give each worker/shard its own stream, e.g. RNGContext.random
+            allocator: Record of issued plates (default: a single-shard PlateAllocator);
+                 pass one of PlateAllocator.partition(n) per parallel generator
+            unique: Redraw until the allocator confirms the plate is not yet issued
+        """
+        self.rng = rng or random
+        self.allocator = allocator if allocator is not None else PlateAllocator()
+        self.unique = unique
         self.validator = PlateCharacterValidator()
     
+    def _draw_number(self) -> Optional[str]:
+        """Draw a 1-4 digit number string in this generator's shard (None = redraw)"""
+        num_digits = self.rng.randint(1, 4)
+        upper = (10 ** num_digits) - 1
+        number = self.allocator.shard_number(self.rng.randint(1, upper), upper)
+        return None if number is None else f"{number:0{num_digits}d}"
+    
+    def _draw_letters(self) -> str:
+        """Draw 1-3 valid letters"""
+        letter_count = self.rng.randint(1, 3)
+        return ''.join(self.rng.choices(self.validator.VALID_LETTERS, k=letter_count))
+    
+    def _reserve(self, namespace: str, prefix: str = '', letters: bool = True) -> Tuple[str, str]:
+        """
+        Draw number (and letters) for a plate and record it in the allocator
+        
+        Args:
+            namespace: Region code, "RI <agency>", "CD/CC <country>" or "KB"
+            prefix: Fixed letters before the drawn ones (truck code letter)
+            letters: Whether the plate has a letter suffix
+        
+        Returns:
+            (number_str, letters) - in unique mode always a plate not issued before
+        """
+        for _ in range(self.MAX_DRAWS):
+            number_str = self._draw_number()
+            if number_str is None:
+                continue
+            suffix = self._draw_letters() if letters else ''
+            if self.allocator.allocate(namespace, number_str, prefix + suffix) or not self.unique:
+                return number_str, suffix
+        raise RuntimeError(f"No free plate left in '{namespace}' after {self.MAX_DRAWS} draws")
+    
     def generate_private_plate(self, region_code: Optional[str] = None) -> Dict:
         """
         Generate private vehicle plate (black plate)
@@ -168,23 +217,16 @@ class PlatGenerator:
         Example: B 1234 ABC, F 567 XY
         """
         if region_code is None:
-            region_code = random.choice(list(self.validator.REGION_CODES.keys()))
+            region_code = self.rng.choice(list(self.validator.REGION_CODES.keys()))
         elif not self.validator.is_valid_region(region_code):
             raise ValueError(f"Invalid region code: {region_code}")
         
         region_name = self.validator.REGION_CODES[region_code][0]
         
-        # Generate 1-4 digit number
-        num_digits = random.randint(1, 4)
-        number = random.randint(1, (10 ** num_digits) - 1)
-        number_str = f"{number:0{num_digits}d}"
-        
-        # Generate 1-3 letters
-        letter_count = random.randint(1, 3)
-        letters = ''.join(random.choices(self.validator.VALID_LETTERS, k=letter_count))
+        # Generate 1-4 digit number and 1-3 letters
+        number_str, letters = self._reserve(region_code)
         
         plate = f"{region_code} {number_str} {letters}"
-        self.generated_plates.add(plate)
         
         return {
             'plate': plate,
@@ -204,23 +246,16 @@ class PlatGenerator:
         Example: B 5678 XY (NIAGA)
         """
         if region_code is None:
-            region_code = random.choice(list(self.validator.REGION_CODES.keys()))
+            region_code = self.rng.choice(list(self.validator.REGION_CODES.keys()))
         elif not self.validator.is_valid_region(region_code):
             raise ValueError(f"Invalid region code: {region_code}")
         
         region_name = self.validator.REGION_CODES[region_code][0]
         
-        # Generate 1-4 digit number
-        num_digits = random.randint(1, 4)
-        number = random.randint(1, (10 ** num_digits) - 1)
-        number_str = f"{number:0{num_digits}d}"
-        
-        # Generate 1-3 letters
-        letter_count = random.randint(1, 3)
-        letters = ''.join(random.choices(self.validator.VALID_LETTERS, k=letter_count))
+        # Generate 1-4 digit number and 1-3 letters
+        number_str, letters = self._reserve(region_code)
         
         plate = f"{region_code} {number_str} {letters} (NIAGA)"
-        self.generated_plates.add(plate)
         
         return {
             'plate': plate,
@@ -251,23 +286,17 @@ class PlatGenerator:
         - ZP 3456 DEF (TRUK-24T) - RUTE: LN
         """
         if region_code is None:
-            region_code = random.choice(list(self.validator.REGION_CODES.keys()))
+            region_code = self.rng.choice(list(self.validator.REGION_CODES.keys()))
         elif not self.validator.is_valid_region(region_code):
             raise ValueError(f"Invalid region code: {region_code}")
         
         region_name = self.validator.REGION_CODES[region_code][0]
         
-        # Generate 1-4 digit number
-        num_digits = random.randint(1, 4)
-        number = random.randint(1, (10 ** num_digits) - 1)
-        number_str = f"{number:0{num_digits}d}"
-        
         # Get truck code letter
         truck_code_letter = truck_type.value[1]
         
-        # Generate 1-3 letters after truck code
-        letter_count = random.randint(1, 3)
-        letters = ''.join(random.choices(self.validator.VALID_LETTERS, k=letter_count))
+        # Generate 1-4 digit number and 1-3 letters after truck code
+        number_str, letters = self._reserve(region_code, prefix=truck_code_letter)
         
         # Build plate with truck code
         plate = f"{region_code} {number_str} {truck_code_letter}{letters}"
@@ -280,15 +309,13 @@ class PlatGenerator:
         
         # Add route if specified
         if route is None:
-            route = random.choice(list(TourRoute))
+            route = self.rng.choice(list(TourRoute))
         route_code, route_name = route.value
         
         # Add route info for heavy trucks
         if truck_class in [TruckClass.MEDIUM, TruckClass.HEAVY]:
             plate += f" - RUTE: {route_code}"
         
-        self.generated_plates.add(plate)
-        
         return {
             'plate': plate,
             'type': PlateType.TRUCK.value,
@@ -322,12 +349,9 @@ class PlatGenerator:
         agency_code, agency_name, agency_short = agency.value
         
         # Generate 1-4 digit number
-        num_digits = random.randint(1, 4)
-        number = random.randint(1, (10 ** num_digits) - 1)
-        number_str = f"{number:0{num_digits}d}"
+        number_str, _ = self._reserve(f"RI {agency_code}", letters=False)
         
         plate = f"RI {agency_code} {number_str}"
-        self.generated_plates.add(plate)
         
         return {
             'plate': plate,
@@ -363,12 +387,9 @@ class PlatGenerator:
             diplomatic_type_name = "Corps Diplomatic"
         
         # Generate 1-4 digit number
-        num_digits = random.randint(1, 4)
-        number = random.randint(1, (10 ** num_digits) - 1)
-        number_str = f"{number:0{num_digits}d}"
+        number_str, _ = self._reserve(f"{diplomatic_type} {country_code}", letters=False)
         
         plate = f"{diplomatic_type} {country_code} {number_str}"
-        self.generated_plates.add(plate)
         
         return {
             'plate': plate,
@@ -392,27 +413,20 @@ class PlatGenerator:
         Example: B 1234 X (SEMENTARA) - EXP: 30/06/2024
         """
         if region_code is None:
-            region_code = random.choice(list(self.validator.REGION_CODES.keys()))
+            region_code = self.rng.choice(list(self.validator.REGION_CODES.keys()))
         elif not self.validator.is_valid_region(region_code):
             raise ValueError(f"Invalid region code: {region_code}")
         
         region_name = self.validator.REGION_CODES[region_code][0]
         
-        # Generate 1-4 digit number
-        num_digits = random.randint(1, 4)
-        number = random.randint(1, (10 ** num_digits) - 1)
-        number_str = f"{number:0{num_digits}d}"
-        
-        # Generate 1-3 letters
-        letter_count = random.randint(1, 3)
-        letters = ''.join(random.choices(self.validator.VALID_LETTERS, k=letter_count))
+        # Generate 1-4 digit number and 1-3 letters
+        number_str, letters = self._reserve(region_code)
         
         # Calculate expiry date
         expiry_date = datetime.now() + timedelta(days=valid_days)
         expiry_str = expiry_date.strftime("%d/%m/%Y")
         
         plate = f"{region_code} {number_str} {letters} (SEMENTARA) - EXP: {expiry_str}"
-        self.generated_plates.add(plate)
         
         return {
             'plate': plate,
@@ -433,21 +447,14 @@ class PlatGenerator:
         Format: KB [1-4 digits] [1-3 letters] (UJI COBA) - EXP: DD/MM/YYYY
         Example: KB 1234 AB (UJI COBA) - EXP: 31/12/2024
         """
-        # Generate 1-4 digit number
-        num_digits = random.randint(1, 4)
-        number = random.randint(1, (10 ** num_digits) - 1)
-        number_str = f"{number:0{num_digits}d}"
-        
-        # Generate 1-3 letters
-        letter_count = random.randint(1, 3)
-        letters = ''.join(random.choices(self.validator.VALID_LETTERS, k=letter_count))
+        # Generate 1-4 digit number and 1-3 letters
+        number_str, letters = self._reserve('KB')
         
         # Calculate expiry date
         expiry_date = datetime.now() + timedelta(days=valid_days)
         expiry_str = expiry_date.strftime("%d/%m/%Y")
         
         plate = f"KB {number_str} {letters} (UJI COBA) - EXP: {expiry_str}"
-        self.generated_plates.add(plate)
         
         return {
             'plate': plate,
@@ -465,22 +472,22 @@ class PlatGenerator:
         Generate a random plate of any type
         """
         if plate_type is None:
-            plate_type = random.choice(list(PlateType))
+            plate_type = self.rng.choice(list(PlateType))
         
         if plate_type == PlateType.PRIVATE:
             return self.generate_private_plate()
         elif plate_type == PlateType.COMMERCIAL:
             return self.generate_commercial_plate()
         elif plate_type == PlateType.TRUCK:
-            truck_type = random.choice(list(TruckSubType))
-            truck_class = random.choice(list(TruckClass))
+            truck_type = self.rng.choice(list(TruckSubType))
+            truck_class = self.rng.choice(list(TruckClass))
             return self.generate_truck_plate(truck_type, truck_class)
         elif plate_type == PlateType.GOVERNMENT:
-            agency = random.choice(list(GovernmentAgency))
+            agency = self.rng.choice(list(GovernmentAgency))
             return self.generate_government_plate(agency)
         elif plate_type == PlateType.DIPLOMATIC:
-            country = random.choice(list(DiplomaticCountry))
-            is_consular = random.random() < 0.3
+            country = self.rng.choice(list(DiplomaticCountry))
+            is_consular = self.rng.random() < 0.3
             return self.generate_diplomatic_plate(country, is_consular)
         elif plate_type == PlateType.TEMPORARY:
             return self.generate_temporary_plate()
@@ -530,16 +537,22 @@ class PlatGenerator:
         }
     
     def get_generated_plates_count(self) -> int:
-        """Get count of generated plates in session"""
-        return len(self.generated_plates)
+        """Get count of distinct plates issued in session"""
+        return len(self.allocator)
     
     def is_plate_unique(self, plate: str) -> bool:
-        """Check if plate hasn't been generated before"""
-        return plate not in self.generated_plates
+        """Check if plate hasn't been generated before (class/route suffixes are ignored)"""
+        parts = parse_plate(plate)
+        if parts is None:
+            return True
+        try:
+            return not self.allocator.contains(*parts)
+        except ValueError:
+            return True
     
     def clear_session(self):
         """Clear all generated plates"""
-        self.generated_plates.clear()
+        self.allocator.clear()
 
 
 # Global generator instance
@@ -550,5 +563,5 @@ def get_plate_generator() -> PlatGenerator:
     """Get or create global plate generator instance"""
     global _plate_generator
     if _plate_generator is None:
-        _plate_generator = PlatGenerator()
+        _plate_generator = PlatGenerator(unique=Config.UNIQUE_PLATES)
     return _plate_generator
@@ -0,0 +1,165 @@
+"""
+Ranked region-name matching
+Plate sub-regions ("Kota Banda Aceh", "Aceh Selatan", "Jakarta Selatan")
+and base.csv names ("KOTA BANDA ACEH", "KAB. ACEH SELATAN", "KOTA ADM.
+JAKARTA SELATAN") rarely agree verbatim. RegionNameMatcher normalizes both
+sides (case, punctuation, KOTA/KAB./ADM. prefixes), finds candidates through
+a token inverted index (trigram index when no token is shared) and ranks
+them by trigram Dice similarity, so the best match wins instead of the first
+entry that happens to contain a word.
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from utils.region_snapshot import load_snapshot
+
+# Leading administrative prefixes: (pattern, kind)
+_PREFIXES = [
+    (re.compile(r'^KOTA ADM\.? '), 'KOTA'),
+    (re.compile(r'^KAB\.? ADM\.? '), 'KAB'),
+    (re.compile(r'^KABUPATEN '), 'KAB'),
+    (re.compile(r'^KAB\.? '), 'KAB'),
+    (re.compile(r'^KOTA '), 'KOTA'),
+    (re.compile(r'^ADM\.? '), None),
+]
+_NON_WORD = re.compile(r'[^0-9A-Z ]+')
+
+# Candidates scored when falling back to the trigram index
+MAX_TRIGRAM_CANDIDATES = 50
+
+
+class RegionMatch(NamedTuple):
+    code: str
+    name: str
+    score: float
+
+
+def normalize_region_name(name: str) -> Tuple[str, Optional[str]]:
+    """
+    Normalize a region name for matching
+
+    Returns:
+        (normalized name, kind) where kind is 'KOTA', 'KAB' or None
+    """
+    text = ' '.join(name.upper().split())
+    kind = None
+    for pattern, prefix_kind in _PREFIXES:
+        stripped = pattern.sub('', text, count=1)
+        if stripped != text:
+            text, kind = stripped, prefix_kind
+            break
+    return ' '.join(_NON_WORD.sub(' ', text).split()), kind
+
+
+def trigrams(text: str) -> frozenset:
+    """Character trigrams of a padded name"""
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class RegionNameMatcher:
+    """Best-match lookup of region names among one set of (code, name) entries"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        """
+        Args:
+            entries: (code, name) pairs; ties are broken by this order
+        """
+        self.codes: List[str] = []
+        self.names: List[str] = []
+        self._kinds: List[Optional[str]] = []
+        self._grams: List[frozenset] = []
+        self._tokens: Dict[str, List[int]] = {}
+        self._gram_index: Dict[str, List[int]] = {}
+
+        for code, name in entries:
+            position = len(self.codes)
+            normalized, kind = normalize_region_name(name)
+            grams = trigrams(normalized)
+            self.codes.append(code)
+            self.names.append(name)
+            self._kinds.append(kind)
+            self._grams.append(grams)
+            for token in set(normalized.split()):
+                self._tokens.setdefault(token, []).append(position)
+            for gram in grams:
+                self._gram_index.setdefault(gram, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _candidates(self, normalized: str, grams: frozenset, prefix: Optional[str] = None) -> Iterable[int]:
+        """Entries (under prefix) sharing a token with the query, else the ones sharing most trigrams"""
+        def allowed(positions):
+            if not prefix:
+                return positions
+            return [p for p in positions if self.codes[p].startswith(prefix)]
+
+        candidates = set()
+        for token in normalized.split():
+            candidates.update(allowed(self._tokens.get(token, ())))
+        if candidates:
+            return candidates
+
+        counts: Dict[int, int] = {}
+        for gram in grams:
+            for position in allowed(self._gram_index.get(gram, ())):
+                counts[position] = counts.get(position, 0) + 1
+        return sorted(counts, key=counts.get, reverse=True)[:MAX_TRIGRAM_CANDIDATES]
+
+    def top(self, name: str, k: int = 5, prefix: Optional[str] = None,
+            min_score: float = 0.0) -> List[RegionMatch]:
+        """
+        The k best-scoring entries for a name
+
+        Args:
+            name: Region name in any casing, with or without KOTA/KAB. prefix
+            k: Number of matches
+            prefix: Only consider codes starting with this (e.g. '32.73.')
+            min_score: Drop matches below this Dice similarity (0..1)
+        """
+        normalized, kind = normalize_region_name(name)
+        if not normalized:
+            return []
+        grams = trigrams(normalized)
+
+        ranked = []
+        for position in self._candidates(normalized, grams, prefix):
+            other = self._grams[position]
+            score = 2 * len(grams & other) / (len(grams) + len(other))
+            if score >= min_score:
+                # Same KOTA/KAB kind breaks ties, then entry order
+                ranked.append((-score, kind is None or self._kinds[position] != kind, position))
+        ranked.sort()
+        return [RegionMatch(self.codes[p], self.names[p], -score) for score, _, p in ranked[:k]]
+
+    def best(self, name: str, prefix: Optional[str] = None,
+             min_score: float = 0.5) -> Optional[RegionMatch]:
+        """Best match for a name, or None if nothing scores at least min_score"""
+        matches = self.top(name, 1, prefix, min_score)
+        return matches[0] if matches else None
+
+    def best_many(self, names: Sequence[str], prefix: Optional[str] = None,
+                  min_score: float = 0.5) -> List[Optional[RegionMatch]]:
+        """best() for many names at once (each distinct name is ranked once)"""
+        resolved = {name: self.best(name, prefix, min_score) for name in set(names)}
+        return [resolved[name] for name in names]
+
+
+# Process-wide matchers over the base.csv snapshot, by administrative level
+_MATCHERS: Dict[int, RegionNameMatcher] = {}
+
+
+def get_region_matcher(level: int) -> Optional[RegionNameMatcher]:
+    """
+    Matcher over one base.csv level (0 = province, 1 = kabupaten/kota, 2 = kecamatan)
+
+    Returns None if base.csv is not available.
+    """
+    if level not in _MATCHERS:
+        snapshot = load_snapshot()
+        if snapshot is None:
+            return None
+        _MATCHERS[level] = RegionNameMatcher(snapshot.entries(level=level))
+    return _MATCHERS[level]
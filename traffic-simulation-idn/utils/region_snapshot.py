@@ -0,0 +1,225 @@
+"""
+Compiled binary snapshot of base.csv
+base.csv (~91k administrative regions) used to be parsed independently by
+IndonesianRegions, VehicleOwner and the validation scripts. It is now
+compiled once into a flat binary file next to the other caches and every
+consumer memory-maps the same snapshot:
+
+- codes          fixed-width region codes in base.csv order
+- levels         0 = province, 1 = kabupaten/kota, 2 = kecamatan, 3 = desa
+- parents        index of the parent region (-1 for provinces)
+- child_offsets  children[child_offsets[i]:child_offsets[i + 1]] are i's children
+- sorted_codes   codes in sorted order, sorted_index maps them back (binary search)
+- names          string table (UTF-8 names joined by newlines)
+
+The header records the source's mtime, size and SHA-256, and the snapshot is
+recompiled when base.csv changes (same rules as db_cache).
+"""
+
+import csv
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from config import Config
+from utils.db_cache import cache_path_for, file_hash
+from utils.logger import logger
+
+MAGIC = b'RGNSNAP1'
+SNAPSHOT_VERSION = 1
+ALIGNMENT = 8
+
+BASE_CSV = os.path.join(Config.BASE_DIR, 'base.csv')
+
+
+def _read_rows(source: Path) -> Tuple[List[str], List[str]]:
+    """(codes, names) of base.csv in file order"""
+    codes, names = [], []
+    with open(source, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip():
+                continue
+            codes.append(row[0].strip())
+            names.append(row[1].strip().replace('\n', ' ') if len(row) > 1 else '')
+    return codes, names
+
+
+def compile_snapshot(source, target) -> None:
+    """Compile base.csv into a snapshot file (written atomically)"""
+    source, target = Path(source), Path(target)
+    stat = source.stat()
+    source_hash = file_hash(source)
+    codes, names = _read_rows(source)
+
+    width = max((len(code) for code in codes), default=1)
+    code_array = np.array(codes, dtype=f'S{width}')
+    position = {code: i for i, code in enumerate(codes)}
+    parents = np.array([position.get(code.rsplit('.', 1)[0], -1) if '.' in code else -1
+                        for code in codes], dtype=np.int32)
+
+    # Children grouped by parent (CSR), each group in base.csv order
+    order = np.argsort(parents, kind='stable')
+    order = order[parents[order] >= 0]
+    child_offsets = np.zeros(len(codes) + 1, dtype=np.int32)
+    np.cumsum(np.bincount(parents[order], minlength=len(codes)), out=child_offsets[1:])
+    sorted_index = np.argsort(code_array, kind='stable').astype(np.int32)
+
+    arrays = {
+        'codes': code_array,
+        'levels': np.array([code.count('.') for code in codes], dtype=np.uint8),
+        'parents': parents,
+        'child_offsets': child_offsets,
+        'children': order.astype(np.int32),
+        'sorted_codes': code_array[sorted_index],
+        'sorted_index': sorted_index,
+        'names': np.frombuffer('\n'.join(names).encode('utf-8'), dtype=np.uint8),
+    }
+
+    layout, offset = {}, 0
+    for key, array in arrays.items():
+        layout[key] = [array.dtype.str, len(array), offset]
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    header = json.dumps({
+        'version': SNAPSHOT_VERSION,
+        'count': len(codes),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': source_hash,
+        'arrays': layout,
+    }).encode('utf-8')
+    header += b' ' * (-(len(MAGIC) + 4 + len(header)) % ALIGNMENT)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with open(tmp_file, 'wb') as f:
+        f.write(MAGIC + struct.pack('<I', len(header)) + header)
+        for array in arrays.values():
+            data = array.tobytes()
+            f.write(data + b'\0' * (-len(data) % ALIGNMENT))
+    os.replace(tmp_file, target)
+
+
+class RegionSnapshot:
+    """Read-only, memory-mapped view of a compiled base.csv"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a region snapshot: {path}")
+        (header_size,) = struct.unpack_from('<I', self._mmap, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(self._mmap[start:start + header_size])
+        if self.header.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version in {path}")
+
+        data_start = start + header_size
+        for key, (dtype, count, offset) in self.header['arrays'].items():
+            array = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=data_start + offset)
+            setattr(self, f'_{key}', array)
+        self._code_list = None
+        self._name_list = None
+
+    def __len__(self) -> int:
+        return self.header['count']
+
+    @property
+    def codes(self) -> List[str]:
+        """Region codes in base.csv order (decoded once)"""
+        if self._code_list is None:
+            self._code_list = self._codes.astype(str).tolist()
+        return self._code_list
+
+    @property
+    def names(self) -> List[str]:
+        """Region names in base.csv order (decoded once)"""
+        if self._name_list is None:
+            self._name_list = self._names.tobytes().decode('utf-8').split('\n') if len(self) else []
+        return self._name_list
+
+    @property
+    def levels(self) -> np.ndarray:
+        return self._levels
+
+    @property
+    def parents(self) -> np.ndarray:
+        return self._parents
+
+    def find(self, code: str) -> Optional[int]:
+        """Index of a region code (binary search), None if unknown"""
+        key = code.encode('ascii', 'ignore')
+        i = int(np.searchsorted(self._sorted_codes, key))
+        if i < len(self) and self._sorted_codes[i] == key:
+            return int(self._sorted_index[i])
+        return None
+
+    def children(self, index: int) -> np.ndarray:
+        """Indices of the direct children of a region, in base.csv order"""
+        return self._children[self._child_offsets[index]:self._child_offsets[index + 1]]
+
+    def entries(self, level: Optional[int] = None) -> Iterator[Tuple[str, str]]:
+        """(code, name) pairs in base.csv order, optionally of one level only"""
+        if level is None:
+            return zip(self.codes, self.names)
+        codes, names = self.codes, self.names
+        return ((codes[i], names[i]) for i in np.flatnonzero(self._levels == level).tolist())
+
+    def is_current(self, source) -> bool:
+        """True if the snapshot was compiled from the source's current contents"""
+        stat = Path(source).stat()
+        if (self.header['mtime_ns'], self.header['size']) == (stat.st_mtime_ns, stat.st_size):
+            return True
+        return self.header['sha256'] == file_hash(Path(source))
+
+
+# Process-wide snapshots by source path
+_SNAPSHOTS: Dict[str, RegionSnapshot] = {}
+
+
+def load_snapshot(source=None, cache_dir: Optional[str] = None) -> Optional[RegionSnapshot]:
+    """
+    Memory-map the snapshot of base.csv, compiling it first if missing or stale
+
+    Args:
+        source: CSV file (default: base.csv in the project root)
+        cache_dir: Snapshot directory (default: Config.CACHE_DIR)
+
+    Returns:
+        Shared RegionSnapshot, or None if the source does not exist
+    """
+    source = Path(source or BASE_CSV)
+    key = f"{source.resolve()}|{cache_dir}"
+    if key in _SNAPSHOTS:
+        return _SNAPSHOTS[key]
+    if not source.exists():
+        return None
+
+    target = cache_path_for(source, 'regions', cache_dir, suffix='.snapshot')
+    snapshot = None
+    try:
+        snapshot = RegionSnapshot(target)
+        if not snapshot.is_current(source):
+            snapshot = None
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable snapshot {target}: {e}")
+
+    if snapshot is None:
+        try:
+            compile_snapshot(source, target)
+        except OSError as e:
+            # Read-only cache directory: fall back to a private temporary snapshot
+            logger.warning(f"Could not write snapshot {target}: {e}")
+            target = Path(tempfile.mkdtemp(prefix='regions-')) / target.name
+            compile_snapshot(source, target)
+        snapshot = RegionSnapshot(target)
+    _SNAPSHOTS[key] = snapshot
+    return snapshot
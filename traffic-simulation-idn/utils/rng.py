@@ -0,0 +1,53 @@
+"""
+Seedable random number streams for data generation
+An RNGContext wraps one numpy SeedSequence and exposes two independent
+generators drawn from it: `random` (a random.Random, same API as the random
+module, used by the per-vehicle generators) and `numpy` (a numpy Generator,
+used by the bulk generators). Workers and shards get their own child
+contexts via spawn(), so parallel runs are reproducible from a single seed
+and never share RNG state.
+
+Every generator that accepts an `rng` argument falls back to the global
+random module when it is None, which keeps the default behaviour unchanged.
+"""
+
+import random
+from typing import List, Optional
+
+import numpy as np
+
+
+class RNGContext:
+    """Independent, reproducible RNG stream for one worker or shard"""
+
+    def __init__(self, seed: Optional[int] = None,
+                 seed_sequence: Optional[np.random.SeedSequence] = None):
+        """
+        Args:
+            seed: Root seed (None = fresh OS entropy, see `entropy` to reproduce)
+            seed_sequence: Use this SeedSequence instead of building one from seed
+        """
+        self.seed_sequence = seed_sequence or np.random.SeedSequence(seed)
+        # Dedicated children for the two generators; spawn() hands out the next ones
+        numpy_seq, python_seq = self.seed_sequence.spawn(2)
+        self.numpy = np.random.Generator(np.random.PCG64(numpy_seq))
+        self.random = random.Random(int.from_bytes(python_seq.generate_state(4).tobytes(), 'little'))
+        self._plate_generator = None
+
+    @property
+    def entropy(self) -> int:
+        """Root entropy; RNGContext(entropy) reproduces the same streams"""
+        return self.seed_sequence.entropy
+
+    def spawn(self, n: int) -> List['RNGContext']:
+        """Create n child contexts with statistically independent streams"""
+        return [RNGContext(seed_sequence=child) for child in self.seed_sequence.spawn(n)]
+
+    @property
+    def plate_generator(self):
+        """PlatGenerator bound to this context's stream (created on first use)"""
+        if self._plate_generator is None:
+            from config import Config
+            from utils.plate_generator import PlatGenerator
+            self._plate_generator = PlatGenerator(rng=self.random, unique=Config.UNIQUE_PLATES)
+        return self._plate_generator
@@ -0,0 +1,77 @@
+"""
+Alias-method samplers for categorical draws
+An AliasSampler is built once from a list of items and weights (Vose's
+alias method, O(k) setup) and then draws in O(1) per sample, either singly
+from a random.Random-compatible stream or in vectorized blocks from a NumPy
+Generator.
+"""
+
+import random
+from typing import Generic, List, Sequence, TypeVar
+
+import numpy as np
+
+T = TypeVar('T')
+
+
+class AliasSampler(Generic[T]):
+    """Precompiled O(1) sampler over a fixed categorical distribution"""
+
+    def __init__(self, items: Sequence[T], weights: Sequence[float] = None):
+        """
+        Args:
+            items: Outcomes to draw from
+            weights: Relative weights (default: uniform); need not sum to 1
+        """
+        if not items:
+            raise ValueError("AliasSampler needs at least one item")
+        if weights is None:
+            weights = [1.0] * len(items)
+        if len(weights) != len(items):
+            raise ValueError("items and weights must have the same length")
+        total = float(sum(weights))
+        if total <= 0 or any(w < 0 for w in weights):
+            raise ValueError("weights must be non-negative with a positive sum")
+
+        self.items: List[T] = list(items)
+        n = len(items)
+        scaled = [w * n / total for w in weights]
+        prob = [0.0] * n
+        alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in large + small:  # Leftovers are full columns (up to rounding)
+            prob[i] = 1.0
+
+        self.prob = np.array(prob)
+        self.alias = np.array(alias)
+        self._prob = prob
+        self._alias = alias
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def sample_index(self, rng=None) -> int:
+        """Draw one index using a single uniform from rng (default: random module)"""
+        u = (rng or random).random() * len(self._prob)
+        i = min(int(u), len(self._prob) - 1)
+        return i if u - i < self._prob[i] else self._alias[i]
+
+    def sample(self, rng=None) -> T:
+        """Draw one item"""
+        return self.items[self.sample_index(rng)]
+
+    def sample_indices(self, n: int, rng: np.random.Generator = None) -> np.ndarray:
+        """Draw n indices at once from a NumPy Generator (default: fresh generator)"""
+        rng = rng if rng is not None else np.random.default_rng()
+        u = rng.random(n) * len(self._prob)
+        i = np.minimum(u.astype(np.intp), len(self._prob) - 1)
+        return np.where(u - i < self.prob[i], i, self.alias[i])
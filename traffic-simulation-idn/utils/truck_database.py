@@ -53,8 +53,9 @@ class TruckDatabase:
             {"manufacturer": "Volvo", "model": "FH Series 6", "cabin": "Globetrotter XL", "category": "Barang (K)", "engine": "420-780 hp", "year": 2024},
         ]
     
-    def get_random_truck(self) -> Dict:
-        """Get a random truck model"""
+    def get_random_truck(self, rng=None) -> Dict:
+        """Get a random truck model (rng: optional random.Random-compatible stream)"""
+        rng = rng or random
         if not self.trucks:
             return {
                 'make': 'Unknown',
@@ -64,7 +65,7 @@ class TruckDatabase:
                 'engine': 'Unknown'
             }
         
-        truck = random.choice(self.trucks)
+        truck = rng.choice(self.trucks)
         return {
             'make': truck['manufacturer'],
             'model': truck['model'],
@@ -3,8 +3,7 @@ Comprehensive validation of ALL plate codes and sub-regions against base.csv
 Ensures every plate-region combination generates NIKs with correct administrative codes
 """
 from utils.indonesian_plates import IndonesianPlateManager, OwnerDatabase, VehicleOwner
-import csv
-from pathlib import Path
+from utils.region_snapshot import load_snapshot
 
 # Clear caches for fresh test
 OwnerDatabase.owners = {}
@@ -13,13 +12,8 @@ VehicleOwner._ADMIN_CODES_CACHE = None
 # Load base.csv data for reference
 base_csv_data = {}
 try:
-    with open('base.csv', 'r', encoding='utf-8') as f:
-        for line in f:
-            parts = line.strip().split(',', 1)
-            if len(parts) >= 2:
-                code = parts[0]
-                name = parts[1]
-                base_csv_data[name.upper()] = code
+    for code, name in load_snapshot().entries():
+        base_csv_data[name.upper()] = code
 except Exception as e:
     print(f"Error loading base.csv: {e}")
 